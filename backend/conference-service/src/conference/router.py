@@ -4,6 +4,7 @@ from uuid import uuid4
 from datetime import time, date, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from src.database import get_db
@@ -92,7 +93,8 @@ def count_conferences(db: Session = Depends(get_db)):
 @router.get("/")
 def get_conferences(db: Session = Depends(get_db)):
     conferences = db.query(Conference).all()
-    return [
+    # Trả thẳng ORJSONResponse: orjson tự encode datetime, bỏ qua lượt jsonable_encoder
+    return ORJSONResponse([
         {
             "id": c.id,
             "name": c.name,
@@ -103,7 +105,7 @@ def get_conferences(db: Session = Depends(get_db)):
             "status": get_conference_status(c),
         }
         for c in conferences
-    ]
+    ])
 
 # =========================
 # CREATE CONFERENCE
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Form, UploadFile, File, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 from src.database import get_db
@@ -115,22 +116,24 @@ def create_topic(
 # ========================
 @router.get("/")
 def get_topics(db: Session = Depends(get_db)):
-    topics = db.query(Topic).all()
-    result = []
-
-    for topic in topics:
-        track = db.query(Track).filter(Track.id == topic.track_id).first()
+    # Một query (LEFT JOIN tracks) thay vì query track cho từng topic
+    rows = (
+        db.query(Topic, Track.conference_id)
+        .outerjoin(Track, Track.id == Topic.track_id)
+        .all()
+    )
 
-        result.append({
+    return ORJSONResponse([
+        {
             "id": topic.id,
             "name": topic.name,
             "description": topic.description,
             "picture": topic.picture,
             "track_id": topic.track_id,
-            "conference_id": track.conference_id if track else None
-        })
-
-    return result
+            "conference_id": conference_id
+        }
+        for topic, conference_id in rows
+    ])
 
 
 # ========================
@@ -162,7 +165,7 @@ def get_topics_by_track(track_id: int, db: Session = Depends(get_db)):
     topics = db.query(Topic).filter(Topic.track_id == track_id).all()
     track = db.query(Track).filter(Track.id == track_id).first()
 
-    return [
+    return ORJSONResponse([
         {
             "id": t.id,
             "name": t.name,
@@ -172,7 +175,7 @@ def get_topics_by_track(track_id: int, db: Session = Depends(get_db)):
             "conference_id": track.conference_id if track else None
         }
         for t in topics
-    ]
+    ])
 
 
 # ========================
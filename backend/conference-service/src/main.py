@@ -1,4 +1,6 @@
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from src.database import Base, engine
 from pathlib import Path
@@ -12,7 +14,10 @@ from fastapi.staticfiles import StaticFiles
 BASE_DIR = Path(__file__).resolve().parent  # .../src
 STATIC_DIR = BASE_DIR / "static"
 
-app = FastAPI(title="UTH Conference Conference Service")
+app = FastAPI(title="UTH Conference Conference Service", default_response_class=ORJSONResponse)
+
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 origins = [
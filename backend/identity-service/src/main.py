@@ -1,9 +1,12 @@
 import os
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 import firebase_admin
 from firebase_admin import credentials
 
 from src.database import engine, SessionLocal
+from src.migrations import run_migrations
 from src import models
 from src.routers import auth, users
 from src.auth import get_password_hash
@@ -21,11 +24,15 @@ except Exception as e:
     print(f"!!! WARNING: Could not initialize Firebase: {e}")
 # -----------------------------------
 
-app = FastAPI(title="UTH Conference Identity Service")
+app = FastAPI(title="UTH Conference Identity Service", default_response_class=ORJSONResponse)
+
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.include_router(auth.router)
 app.include_router(users.router)
 
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 def init_roles_and_admin():
     db = SessionLocal()
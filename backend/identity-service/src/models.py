@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Table, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Table, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlalchemy import DateTime
@@ -65,4 +65,9 @@ class AuditLog(Base):
     target = Column(String(255), nullable=True)   
     status = Column(String(50), default="SUCCESS") 
     timestamp = Column(DateTime, default=datetime.utcnow) 
-    user = relationship("User", backref="activities")
\ No newline at end of file
+    user = relationship("User", backref="activities")
+
+    # Hoạt động gần đây: ORDER BY timestamp DESC LIMIT n
+    __table_args__ = (
+        Index("ix_audit_logs_timestamp", "timestamp"),
+    )
@@ -1,5 +1,7 @@
 import os
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .database import engine, Base
 
@@ -16,9 +18,13 @@ app = FastAPI(
     description="AI Microservice using Google Gemini",
     version="1.0.0",
     # 👇 QUAN TRỌNG: Cấu hình root_path để Swagger UI hoạt động đúng sau Nginx
-    root_path="/intelligent" 
+    root_path="/intelligent",
+    default_response_class=ORJSONResponse,
 )
 
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -28,6 +28,9 @@ class Settings(BaseSettings):
     FRONTEND_URL: str = "http://localhost:3000"
 
     PROJECT_NAME: str = "Notification Service"
+
+    # Redis cho Idempotency-Key (để trống -> không chống trùng request)
+    REDIS_URL: str = ""
     
     # Cấu hình bảo mật (nếu cần xác thực service gọi sang)
     SECRET_KEY: str = "SECRET_KEY_NOTIFICATION_SERVICE"
@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session
 from src import models, schemas
 from src.models import ReviewerInvitation
 from sqlalchemy import or_
-from typing import Optional
+from typing import List, Optional
 def create_notification_log(db: Session, msg_data: schemas.NotificationRequest, sender_id: int = 0):
     new_msg = models.Message(
         sender_id=sender_id,
@@ -21,6 +21,27 @@ def create_notification_log(db: Session, msg_data: schemas.NotificationRequest,
     return new_msg
 
 
+def create_notification_logs(db: Session, items: List[schemas.NotificationRequest], sender_id: int = 0):
+    """Lưu nhiều thông báo trong một transaction (dùng cho gửi hàng loạt)."""
+    msgs = [
+        models.Message(
+            sender_id=sender_id,
+            receiver_id=m.receiver_id,
+            receiver_email=m.receiver_email,
+            receiver_name=m.receiver_name,
+            paper_id=m.paper_id,
+            paper_title=m.paper_title,
+            subject=m.subject,
+            body=m.body,
+            is_read=False,
+        )
+        for m in items
+    ]
+    db.add_all(msgs)
+    db.commit()
+    return msgs
+
+
 def create_email_log_entry(db: Session, email: str, subject: str):
     log_entry = models.EmailLog(
         recipient_email=email,
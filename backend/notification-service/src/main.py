@@ -2,12 +2,18 @@ import os
 import firebase_admin
 from firebase_admin import credentials
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 # Import các module nội bộ
 from src import models
+from src.config import settings
 from src.database import engine
+from src.migrations import run_migrations
 from src.routers import notifications, prefs, fcm
+from src.utils.idempotency import IdempotencyMiddleware
+from src.security.jwt import decode_access_token
 
 # Load biến môi trường từ .env
 load_dotenv()
@@ -15,9 +21,23 @@ load_dotenv()
 app = FastAPI(
     title="UTH Conference Notification Service",
     description="Microservice chuyên xử lý thông báo và email",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
+# Idempotency-Key cho tạo thông báo (client retry không gửi email/push trùng).
+# Thêm trước GZip -> nằm trong: response lưu để phát lại là bản chưa nén.
+app.add_middleware(
+    IdempotencyMiddleware,
+    redis_url=settings.REDIS_URL,
+    routes=[("POST", "/api/notifications")],
+    namespace="notification-service",
+    decode_token=decode_access_token,
+)
+
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # --- KHỞI TẠO FIREBASE ADMIN SDK ---
 def init_firebase():
     try:
@@ -50,6 +70,7 @@ init_firebase()
 
 # Tạo các bảng trong DB
 models.Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # Đăng ký các Router
 app.include_router(notifications.router)
@@ -0,0 +1,64 @@
+# backend/notification-service/src/migrations.py
+"""
+Migration có đánh số phiên bản cho notification-service.
+
+create_all chỉ tạo bảng còn thiếu, không thêm index/cột vào bảng đã có.
+Mỗi migration chạy đúng một lần; phiên bản đã áp dụng được ghi trong bảng
+schema_migrations. Thêm thay đổi schema mới = thêm một phần tử vào MIGRATIONS
+(không sửa migration đã phát hành).
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select
+from sqlalchemy.engine import Connection, Engine
+
+from src import models
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _ensure_indexes(conn: Connection, table: Table, names: List[str]) -> None:
+    """Tạo các index (khai báo trong __table_args__ của model) nếu DB chưa có."""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(conn)
+
+
+def _0001_query_indexes(conn: Connection) -> None:
+    _ensure_indexes(conn, models.Message.__table__, [
+        "ix_messages_receiver_created",
+        "ix_messages_receiver_email_created",
+    ])
+    _ensure_indexes(conn, models.ReviewerInvitation.__table__, ["ix_reviewer_invitations_token"])
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Indexes for inbox listing and invitation lookup by token", _0001_query_indexes),
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    _meta.create_all(bind=engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=version, description=description, applied_at=datetime.utcnow()
+                )
+            )
+        print(f"[Migrations] Applied {version}: {description}")
@@ -1,5 +1,5 @@
 # backend/notification-service/src/models.py
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.sql import func # [MỚI] Import để dùng server time
 from datetime import datetime
 import enum
@@ -30,6 +30,13 @@ class Message(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Hộp thư: WHERE receiver_id = ? OR receiver_email = ? ORDER BY created_at DESC
+    # -> mỗi nhánh OR dùng một index (index merge union), không quét bảng
+    __table_args__ = (
+        Index("ix_messages_receiver_created", "receiver_id", "created_at"),
+        Index("ix_messages_receiver_email_created", "receiver_email", "created_at"),
+    )
+
     
 class EmailLog(Base):
     __tablename__ = "email_logs"
@@ -62,6 +69,10 @@ class ReviewerInvitation(Base):
     status = Column(Enum(InvitationStatus), default=InvitationStatus.PENDING)
     token = Column(String(255), nullable=False)
 
+    __table_args__ = (
+        Index("ix_reviewer_invitations_token", "token"),
+    )
+
 class NotificationPrefs(Base):
     __tablename__ = "notification_prefs"
     id = Column(Integer, primary_key=True)
@@ -20,6 +20,27 @@ router = APIRouter(
 
 INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
 
+# Số thông báo tối đa trong một lần gửi hàng loạt
+MAX_BATCH_SIZE = 1000
+
+
+def _notification_html(receiver_name: Optional[str], subject: str, body: str) -> str:
+    safe_name = receiver_name or "bạn"
+    return f"""
+    <div style="font-family: Arial, sans-serif; padding: 20px; border: 1px solid #ddd;">
+        <h3 style="color: #2c3e50;">Xin chào {safe_name},</h3>
+        <p>Bạn có một thông báo mới từ hệ thống UTH Conference:</p>
+        <div style="background-color: #f9f9f9; padding: 15px; margin: 10px 0;">
+            <strong>{subject}</strong><br>
+            <p>{body}</p>
+        </div>
+        <p>Vui lòng truy cập hệ thống để xem chi tiết.</p>
+        <hr>
+        <p style="font-size: 12px; color: #777;">Thông báo tự động từ Notification Service.</p>
+    </div>
+    """
+
+
 # =========================================================
 # 1. API Gửi thông báo (Internal & External)
 # =========================================================
@@ -46,20 +67,7 @@ def send_notification(
     saved_msg = crud.create_notification_log(db=db, msg_data=req, sender_id=sender_id)
 
     # 2. Gửi Email (nếu có địa chỉ email)
-    safe_name = req.receiver_name or "bạn"
-    html_body = f"""
-    <div style="font-family: Arial, sans-serif; padding: 20px; border: 1px solid #ddd;">
-        <h3 style="color: #2c3e50;">Xin chào {safe_name},</h3>
-        <p>Bạn có một thông báo mới từ hệ thống UTH Conference:</p>
-        <div style="background-color: #f9f9f9; padding: 15px; margin: 10px 0;">
-            <strong>{req.subject}</strong><br>
-            <p>{req.body}</p>
-        </div>
-        <p>Vui lòng truy cập hệ thống để xem chi tiết.</p>
-        <hr>
-        <p style="font-size: 12px; color: #777;">Thông báo tự động từ Notification Service.</p>
-    </div>
-    """
+    html_body = _notification_html(req.receiver_name, req.subject, req.body)
 
     if getattr(req, "receiver_email", None):
         background_tasks.add_task(
@@ -76,6 +84,37 @@ def send_notification(
     }
 
 
+@router.post("/batch", status_code=status.HTTP_201_CREATED)
+def send_notifications_batch(
+    items: List[schemas.NotificationRequest],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(database.get_db),
+    x_internal_key: Optional[str] = Header(default=None, alias="X-Internal-Key"),
+):
+    """Gửi nhiều thông báo trong một request (vd. phân công hàng loạt): một commit cho cả lô."""
+    if not INTERNAL_KEY or x_internal_key != INTERNAL_KEY:
+        raise HTTPException(status_code=401, detail="Invalid internal key")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Too many notifications (max {MAX_BATCH_SIZE})")
+
+    for req in items:
+        if req.receiver_email:
+            req.receiver_email = req.receiver_email.lower().strip()
+
+    saved = crud.create_notification_logs(db=db, items=items, sender_id=0)
+
+    for req in items:
+        if req.receiver_email:
+            background_tasks.add_task(
+                email_utils.send_email_async,
+                recipient_email=req.receiver_email,
+                subject=req.subject,
+                html_content=_notification_html(req.receiver_name, req.subject, req.body),
+            )
+
+    return {"status": "queued", "count": len(saved), "message_ids": [m.id for m in saved]}
+
+
 # =========================================================
 # 2. Xử lý Lời mời Phản biện (Reviewer Invitation)
 # =========================================================
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     CONFERENCE_SERVICE_URL: str   = "http://localhost:8002"
     INTELLIGENT_SERVICE_URL: str  = "http://localhost:8004"
     IDENTITY_SERVICE_URL: str     = "http://localhost:8005"
+    REDIS_URL: str                = "redis://localhost:6379/0"
 
     PROJECT_NAME: str = "Review Service"
 
@@ -1,11 +1,34 @@
 from sqlalchemy.orm import Session
 from datetime import datetime
-from sqlalchemy import or_
+from typing import List, Optional
+from sqlalchemy import or_, func, insert
 from src import models, schemas
+from src.services.review_stats import refresh_paper_stats, paper_id_of_review
 
 # -------- Assignments --------
+def known_paper_conferences(db: Session, paper_ids) -> dict[int, int]:
+    """conference_id đã biết cục bộ: paper_projection, thiếu thì paper_review_stats."""
+    paper_ids = list(set(paper_ids))
+    if not paper_ids:
+        return {}
+    P, S = models.PaperProjection, models.PaperReviewStats
+    found = dict(
+        db.query(S.paper_id, S.conference_id)
+        .filter(S.paper_id.in_(paper_ids), S.conference_id.isnot(None))
+        .all()
+    )
+    found.update(
+        db.query(P.paper_id, P.conference_id)
+        .filter(P.paper_id.in_(paper_ids), P.conference_id.isnot(None))
+        .all()
+    )
+    return found
+
 def create_assignment(db: Session, data: schemas.AssignmentCreate) -> models.Assignment:
-    obj = models.Assignment(**data.model_dump())
+    obj = models.Assignment(
+        **data.model_dump(),
+        conference_id=known_paper_conferences(db, [data.paper_id]).get(data.paper_id),
+    )
     db.add(obj); db.commit(); db.refresh(obj)
     return obj
 
@@ -29,12 +52,182 @@ def update_assignment(db: Session, assignment_id: int, data: schemas.AssignmentU
     db.commit(); db.refresh(obj)
     return obj
 
+# Trạng thái assignment còn tính vào tải của reviewer / số reviewer của paper
+ACTIVE_ASSIGNMENT_STATUSES = (
+    models.AssignmentStatus.INVITED,
+    models.AssignmentStatus.ACCEPTED,
+    models.AssignmentStatus.COMPLETED,
+)
+
+def load_assignment_context(db: Session, paper_ids: list[int], reviewer_ids: list[int]) -> dict:
+    """Gom dữ liệu cho bộ phân công tự động bằng vài query theo tập (không query từng cặp)."""
+    A, C, B = models.Assignment, models.ConflictOfInterest, models.Bid
+
+    bids = [
+        (p, r, getattr(t, "value", t))
+        for p, r, t in db.query(B.paper_id, B.reviewer_id, B.bid_type)
+        .filter(B.paper_id.in_(paper_ids), B.reviewer_id.in_(reviewer_ids))
+        .all()
+    ]
+    open_coi = set(
+        db.query(C.paper_id, C.reviewer_id)
+        .filter(
+            C.paper_id.in_(paper_ids),
+            C.reviewer_id.in_(reviewer_ids),
+            C.status == models.ConflictStatus.OPEN,
+        )
+        .all()
+    )
+    existing = db.query(A.paper_id, A.reviewer_id, A.status).filter(A.paper_id.in_(paper_ids)).all()
+    reviewer_load = dict(
+        db.query(A.reviewer_id, func.count(A.id))
+        .filter(A.reviewer_id.in_(reviewer_ids), A.status.in_(ACTIVE_ASSIGNMENT_STATUSES))
+        .group_by(A.reviewer_id)
+        .all()
+    )
+
+    paper_load: dict[int, int] = {}
+    for p, _, st in existing:
+        if st in ACTIVE_ASSIGNMENT_STATUSES:
+            paper_load[p] = paper_load.get(p, 0) + 1
+
+    return {
+        "bids": bids,
+        "open_coi": open_coi,
+        # Cặp đã từng phân công (kể cả đã Declined) không đề xuất lại
+        "existing_pairs": {(p, r) for p, r, _ in existing},
+        "paper_load": paper_load,
+        "reviewer_load": reviewer_load,
+    }
+
+def bulk_insert_assignments(db: Session, rows: list[dict]) -> int:
+    """
+    Chèn nhiều assignment bằng một câu INSERT nhiều dòng, một commit.
+    rows: dict gồm paper_id, reviewer_id và tuỳ chọn is_manual, due_date.
+    """
+    if not rows:
+        return 0
+    now = datetime.utcnow()
+    conferences = known_paper_conferences(db, [row["paper_id"] for row in rows])
+    db.execute(
+        insert(models.Assignment),
+        [
+            {
+                "paper_id": row["paper_id"],
+                "conference_id": conferences.get(row["paper_id"]),
+                "reviewer_id": row["reviewer_id"],
+                "status": models.AssignmentStatus.INVITED,
+                "is_manual": row.get("is_manual", False),
+                "due_date": row.get("due_date"),
+                "created_at": now,
+            }
+            for row in rows
+        ],
+    )
+    db.commit()
+    return len(rows)
+
+def bulk_create_assignments(db: Session, items: list[schemas.AssignmentCreate]) -> dict:
+    """
+    Tạo hàng loạt assignment: 2 query theo tập (COI mở + assignment hiện có của các paper
+    trong lô), lọc cặp xung đột/trùng trong bộ nhớ, rồi một INSERT nhiều dòng.
+    Cặp đã tồn tại (hoặc lặp trong lô) được bỏ qua -> gọi lại cùng payload là idempotent.
+    """
+    A, C = models.Assignment, models.ConflictOfInterest
+    paper_ids = list({it.paper_id for it in items})
+
+    open_coi = set(
+        db.query(C.paper_id, C.reviewer_id)
+        .filter(C.paper_id.in_(paper_ids), C.status == models.ConflictStatus.OPEN)
+        .all()
+    )
+    existing = set(db.query(A.paper_id, A.reviewer_id).filter(A.paper_id.in_(paper_ids)).all())
+
+    to_insert, duplicates, conflicts, seen = [], [], [], set()
+    for it in items:
+        pair = (it.paper_id, it.reviewer_id)
+        if pair in open_coi:
+            conflicts.append(pair)
+        elif pair in existing or pair in seen:
+            duplicates.append(pair)
+        else:
+            seen.add(pair)
+            to_insert.append(it.model_dump())
+
+    bulk_insert_assignments(db, to_insert)
+
+    created = []
+    if seen:
+        created = [
+            a for a in db.query(A)
+            .filter(A.paper_id.in_({p for p, _ in seen}), A.reviewer_id.in_({r for _, r in seen}))
+            .order_by(A.id)
+            .all()
+            if (a.paper_id, a.reviewer_id) in seen
+        ]
+    return {"created": created, "duplicates": duplicates, "conflicts": conflicts}
+
+# -------- Bids --------
+def upsert_bids(db: Session, reviewer_id: int, bids: dict[int, str]) -> dict:
+    """
+    Ghi nhiều bid của một reviewer bằng một câu INSERT ... ON DUPLICATE KEY UPDATE
+    (ON CONFLICT với SQLite/PostgreSQL) trên unique_bid_reviewer_paper. Trả về bid map mới.
+    """
+    B = models.Bid
+    if bids:
+        now = datetime.utcnow()
+        rows = [
+            {
+                "reviewer_id": reviewer_id,
+                "paper_id": paper_id,
+                "bid_type": models.BidType(bid_type),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for paper_id, bid_type in bids.items()
+        ]
+        dialect = db.get_bind().dialect.name
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            stmt = dialect_insert(B).values(rows)
+            stmt = stmt.on_duplicate_key_update(
+                bid_type=stmt.inserted.bid_type, updated_at=stmt.inserted.updated_at
+            )
+        else:
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            stmt = dialect_insert(B).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[B.reviewer_id, B.paper_id],
+                set_={"bid_type": stmt.excluded.bid_type, "updated_at": stmt.excluded.updated_at},
+            )
+        db.execute(stmt)
+        db.commit()
+
+    return {
+        paper_id: getattr(bid_type, "value", bid_type)
+        for paper_id, bid_type in db.query(B.paper_id, B.bid_type).filter(B.reviewer_id == reviewer_id).all()
+    }
+
 # -------- Reviews --------
 def create_review(db: Session, data: schemas.ReviewCreate) -> models.Review:
     obj = models.Review(**data.model_dump())
-    db.add(obj); db.commit(); db.refresh(obj)
+    db.add(obj)
+    if not obj.is_draft:
+        db.flush()
+        _refresh_stats_for_review(db, obj.id)
+    db.commit(); db.refresh(obj)
     return obj
 
+def _refresh_stats_for_review(db: Session, review_id: int) -> None:
+    # Cập nhật read model paper_review_stats trong cùng transaction với thay đổi review
+    db.flush()
+    paper_id = paper_id_of_review(db, review_id)
+    if paper_id is not None:
+        refresh_paper_stats(db, paper_id)
+
 def get_review(db: Session, review_id: int):
     return db.query(models.Review).filter(models.Review.id == review_id).first()
 
@@ -56,12 +249,15 @@ def update_review(db: Session, review_id: int, data: schemas.ReviewUpdate):
 
     for k, v in payload.items():
         setattr(obj, k, v)
+    _refresh_stats_for_review(db, obj.id)
     db.commit(); db.refresh(obj)
     return obj
 
 def add_review_criteria(db: Session, review_id: int, data: schemas.ReviewCriteriaCreate) -> models.ReviewCriteria:
     obj = models.ReviewCriteria(review_id=review_id, **data.model_dump())
-    db.add(obj); db.commit(); db.refresh(obj)
+    db.add(obj)
+    _refresh_stats_for_review(db, review_id)
+    db.commit(); db.refresh(obj)
     return obj
 
 # ✅ NEW: criteria helpers for PATCH
@@ -78,6 +274,7 @@ def update_review_criteria(db: Session, criteria_id: int, data: schemas.ReviewCr
         return None
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(obj, k, v)
+    _refresh_stats_for_review(db, obj.review_id)
     db.commit(); db.refresh(obj)
     return obj
 
@@ -160,13 +357,24 @@ def create_discussion(db: Session, data: schemas.DiscussionCreate, sender_id: in
     db.refresh(obj)
     return obj
 
-def list_discussions(db: Session, paper_id: int):
-    return (
-        db.query(models.ReviewDiscussion)
-        .filter(models.ReviewDiscussion.paper_id == paper_id)
-        .order_by(models.ReviewDiscussion.sent_at.asc())
-        .all()
-    )
+def list_discussions(db: Session, paper_id: int, after_id: Optional[int] = None, limit: Optional[int] = None):
+    """Không có after_id/limit: cả thread như cũ. Có: phân trang keyset theo id (id > after_id)."""
+    D = models.ReviewDiscussion
+    q = db.query(D).filter(D.paper_id == paper_id)
+    if after_id is None and limit is None:
+        return q.order_by(D.sent_at.asc()).all()
+    if after_id is not None:
+        q = q.filter(D.id > after_id)
+    q = q.order_by(D.id.asc())
+    if limit is not None:
+        q = q.limit(limit)
+    return q.all()
+
+def list_discussion_senders(db: Session, paper_id: int) -> List[int]:
+    D = models.ReviewDiscussion
+    return [
+        sid for (sid,) in db.query(D.sender_id).filter(D.paper_id == paper_id, D.sender_id.isnot(None)).distinct().all()
+    ]
 
 # =========================================================
 # ✅ NEW: REBUTTALS & EVALUATIONS CRUD
@@ -1,9 +1,49 @@
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from src.config import settings
 from src.database import Base, engine
-from src.routers import assignments, reviews, coi, discussions, papers,bids,extensions,rebuttals
+from src.migrations import run_migrations
+from src.services.access_index import access_index
+from src.services.draft_store import draft_store
+from src.services.deadlines import deadline_sweeper
+from src.services.paper_projection import paper_projection_consumer
+from src.services.paper_conferences import conference_backfill
+from src.utils.idempotency import IdempotencyMiddleware
+from src.security.jwt import decode_access_token
+from src.routers import assignments, reviews, coi, discussions, papers,bids,extensions,rebuttals,decisions,me
 
-app = FastAPI(title="UTH Conference Review Service")
+app = FastAPI(title="UTH Conference Review Service", default_response_class=ORJSONResponse)
+
+class SelectiveGZipMiddleware:
+    """GZip cho API JSON; bỏ qua file tải về (đã nén sẵn, cần Range/sendfile nguyên vẹn) và SSE (phải flush từng event)."""
+
+    EXCLUDED_SUFFIXES = ("/download", "/stream")
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].rstrip("/").endswith(self.EXCLUDED_SUFFIXES):
+            await self.app(scope, receive, send)
+        else:
+            await self.gzip(scope, receive, send)
+
+
+# Idempotency-Key cho tạo assignment / review (client retry không tạo bản ghi, thông báo trùng).
+# Thêm trước GZip -> nằm trong: response lưu để phát lại là bản chưa nén.
+app.add_middleware(
+    IdempotencyMiddleware,
+    redis_url=settings.REDIS_URL,
+    routes=[("POST", "/assignments"), ("POST", "/reviews")],
+    namespace="review-service",
+    decode_token=decode_access_token,
+)
+
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024)
 
 origins = [
     "http://localhost:3000",     
@@ -21,6 +61,12 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    access_index.start_listener()
+    draft_store.start_flusher()
+    deadline_sweeper.start()
+    paper_projection_consumer.start()
+    conference_backfill.start()
 
 @app.get("/")
 def root():
@@ -33,4 +79,6 @@ app.include_router(discussions.router)
 app.include_router(papers.router)
 app.include_router(bids.router)
 app.include_router(extensions.router)
-app.include_router(rebuttals.router)
\ No newline at end of file
+app.include_router(rebuttals.router)
+app.include_router(decisions.router)
+app.include_router(me.router)
\ No newline at end of file
@@ -0,0 +1,94 @@
+# backend/review-service/src/migrations.py
+"""
+Migration có đánh số phiên bản cho review-service.
+
+create_all chỉ tạo bảng còn thiếu, không thêm index/cột vào bảng đã có.
+Mỗi migration chạy đúng một lần; phiên bản đã áp dụng được ghi trong bảng
+schema_migrations. Thêm thay đổi schema mới = thêm một phần tử vào MIGRATIONS
+(không sửa migration đã phát hành).
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from src import models
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _ensure_indexes(conn: Connection, table: Table, names: List[str]) -> None:
+    """Tạo các index (khai báo trong __table_args__ của model) nếu DB chưa có."""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(conn)
+
+
+def _0001_query_indexes(conn: Connection) -> None:
+    _ensure_indexes(conn, models.Assignment.__table__, [
+        "ix_assignments_paper_reviewer_status",
+        "ix_assignments_reviewer_status",
+    ])
+    _ensure_indexes(conn, models.ConflictOfInterest.__table__, ["ix_coi_reviewer_paper_status"])
+    _ensure_indexes(conn, models.ReviewDiscussion.__table__, ["ix_review_discussions_paper_sent"])
+
+
+def _0002_backfill_paper_review_stats(conn: Connection) -> None:
+    # Bảng mới do create_all tạo; chỉ cần dựng dữ liệu từ các review đã có
+    from src.services.review_stats import rebuild_all
+
+    session = Session(bind=conn)
+    count = rebuild_all(session)
+    session.flush()
+    print(f"[Migrations] paper_review_stats: rebuilt {count} papers")
+
+
+def _0003_assignment_deadlines(conn: Connection) -> None:
+    columns = {c["name"] for c in inspect(conn).get_columns("assignments")}
+    if "conference_id" not in columns:
+        conn.execute(text("ALTER TABLE assignments ADD COLUMN conference_id INTEGER NULL"))
+    _ensure_indexes(conn, models.Assignment.__table__, [
+        "ix_assignments_status_due",
+        "ix_assignments_conf_status_due",
+    ])
+    # Hội nghị đã biết từ read model thống kê; phần còn lại được hỏi submission-service khi cần
+    conn.execute(text(
+        "UPDATE assignments SET conference_id = ("
+        " SELECT s.conference_id FROM paper_review_stats s WHERE s.paper_id = assignments.paper_id"
+        ") WHERE conference_id IS NULL"
+    ))
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Composite indexes for assignment state, COI and discussion lookups", _0001_query_indexes),
+    (2, "Backfill paper_review_stats read model", _0002_backfill_paper_review_stats),
+    (3, "Assignment conference_id and due-date indexes", _0003_assignment_deadlines),
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    _meta.create_all(bind=engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=version, description=description, applied_at=datetime.utcnow()
+                )
+            )
+        print(f"[Migrations] Applied {version}: {description}")
@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     DateTime,
     Boolean,
@@ -13,6 +14,7 @@ from sqlalchemy import (
     Text,
     Enum,
     ForeignKey,
+    Index,
     UniqueConstraint
 )
 from sqlalchemy.orm import relationship
@@ -71,6 +73,9 @@ class Assignment(Base):
     due_date = Column(DateTime, nullable=True)
     response_date = Column(DateTime, nullable=True)
 
+    # Lấy từ submission-service (paper_review_stats hoặc hỏi trực tiếp) khi cần lọc theo hội nghị
+    conference_id = Column(Integer, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     reviews = relationship(
@@ -79,6 +84,42 @@ class Assignment(Base):
         cascade="all, delete-orphan",
     )
 
+    # Kiểm tra trạng thái assignment theo (paper, reviewer) và danh sách việc của reviewer;
+    # truy vấn hạn chót (quá hạn / sắp đến hạn) theo trạng thái và theo hội nghị
+    __table_args__ = (
+        Index("ix_assignments_paper_reviewer_status", "paper_id", "reviewer_id", "status"),
+        Index("ix_assignments_reviewer_status", "reviewer_id", "status"),
+        Index("ix_assignments_status_due", "status", "due_date"),
+        Index("ix_assignments_conf_status_due", "conference_id", "status", "due_date"),
+    )
+
+
+class AssignmentReminder(Base):
+    """
+    Job nhắc hạn đã được sinh cho một assignment. Unique theo (assignment, loại, due_date):
+    mỗi mốc hạn chỉ nhắc một lần, gia hạn (due_date mới) sinh job mới.
+    """
+    __tablename__ = "assignment_reminders"
+
+    id = Column(Integer, primary_key=True, index=True)
+    assignment_id = Column(
+        Integer,
+        ForeignKey("assignments.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    reviewer_id = Column(Integer, nullable=False)
+    paper_id = Column(Integer, nullable=False)
+    kind = Column(String(20), nullable=False)  # DUE_SOON | OVERDUE
+    due_date = Column(DateTime, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("assignment_id", "kind", "due_date", name="uq_assignment_reminder"),
+        Index("ix_assignment_reminders_pending", "sent_at", "id"),
+    )
+
 
 # =========================================================
 # REVIEWS
@@ -174,6 +215,11 @@ class ConflictOfInterest(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # has_open_coi(reviewer_id, paper_id, status=Open)
+    __table_args__ = (
+        Index("ix_coi_reviewer_paper_status", "reviewer_id", "paper_id", "status"),
+    )
+
 
 # =========================================================
 # REVIEW DISCUSSIONS
@@ -193,6 +239,10 @@ class ReviewDiscussion(Base):
 
     parent_id = Column(Integer, nullable=True)
 
+    __table_args__ = (
+        Index("ix_review_discussions_paper_sent", "paper_id", "sent_at"),
+    )
+
 
 # =========================================================
 # BIDS (Nguyện vọng chấm bài)
@@ -257,6 +307,76 @@ class ReviewEvaluation(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+# =========================================================
+# PAPER REVIEW STATS (Read model tổng hợp điểm theo bài)
+# =========================================================
+
+class PaperReviewStats(Base):
+    __tablename__ = "paper_review_stats"
+
+    paper_id = Column(Integer, primary_key=True)
+    # Lấy từ submission-service lần đầu bài được xếp hạng theo hội nghị
+    conference_id = Column(Integer, nullable=True)
+
+    review_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)
+
+    mean_score = Column(Float, nullable=True)
+    score_variance = Column(Float, nullable=True)
+    min_score = Column(Float, nullable=True)
+    max_score = Column(Float, nullable=True)
+    # Trung bình final_score có trọng số confidence_score
+    weighted_score = Column(Float, nullable=True)
+    mean_confidence = Column(Float, nullable=True)
+
+    # {criteria_name: {count, mean, variance, min, max, weighted_mean}} (JSON)
+    criteria_stats = Column(Text, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # GET /papers/stats?conference_id=&sort=...
+    __table_args__ = (
+        Index("ix_paper_review_stats_conf_mean", "conference_id", "mean_score"),
+        Index("ix_paper_review_stats_conf_weighted", "conference_id", "weighted_score"),
+    )
+
+
+# =========================================================
+# PAPER PROJECTION (Bản sao bài báo từ paper events của submission-service)
+# =========================================================
+
+class PaperProjection(Base):
+    """
+    Ảnh chụp mới nhất của bài, cập nhật từ Redis Stream paper-events (services/paper_projection.py).
+    (event_ms, event_seq) = id của event đã áp dụng: event cũ hơn đến sau bị bỏ qua.
+    Dòng nạp trực tiếp từ submission-service (khi chưa nhận được event) có (0, 0).
+    """
+    __tablename__ = "paper_projection"
+
+    paper_id = Column(Integer, primary_key=True)
+    conference_id = Column(Integer, nullable=True)
+    track_id = Column(Integer, nullable=True)
+    submitter_id = Column(Integer, nullable=True)
+    title = Column(String(255), nullable=True)
+    status = Column(String(30), nullable=True)
+    is_blind_mode = Column(Boolean, nullable=True)
+    submitted_at = Column(DateTime, nullable=True)
+
+    latest_version_id = Column(Integer, nullable=True)
+    latest_version_number = Column(Integer, nullable=True)
+    latest_file_url = Column(String(500), nullable=True)
+    latest_version_created_at = Column(DateTime, nullable=True)
+
+    event_ms = Column(BigInteger, nullable=False, default=0)
+    event_seq = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_paper_projection_conf_status", "conference_id", "status"),
+        Index("ix_paper_projection_submitter", "submitter_id"),
+    )
+
+
 # =========================================================
 # Pydantic Schemas (Auxiliary)
 # =========================================================
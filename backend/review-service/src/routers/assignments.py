@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Response
 from sqlalchemy.orm import Session
 
 # Import các module nội bộ
@@ -13,10 +13,19 @@ from src.models import AssignmentStatus
 from src.security.deps import get_current_payload, require_roles
 
 # 👇 IMPORT HÀM GỬI THÔNG BÁO VỪA TẠO
-from src.services.notifier import send_notification_to_user
+from src.services.notifier import send_notification_to_user, send_notifications_batch
+from src.services.assignment_solver import SolverInput, solve
+from src.services.locks import LockBusy, LockUnavailable, redis_lock
+from src.services.access_index import access_index
+from src.services import deadlines
+from src.services.workspace import workspace_cache
 
 router = APIRouter(prefix="/assignments", tags=["Assignments"])
 
+# Tải của reviewer tính trên mọi hội nghị -> một khoá chung cho các lượt auto-assign có ghi
+AUTO_ASSIGN_LOCK_KEY = "review-service:auto-assign:lock"
+AUTO_ASSIGN_LOCK_TTL_MS = 300000
+
 def _enum_value(x) -> str:
     """Helper để lấy value từ Enum hoặc String"""
     return getattr(x, "value", str(x))
@@ -50,10 +59,136 @@ def create_assignment(
             title=noti_title,
             body=noti_body
         )
+        workspace_cache.invalidate(assignment.reviewer_id)
 
     return assignment
 
 
+def _invitation_notifications(per_reviewer: dict[int, int]) -> list[dict]:
+    # Một thông báo cho mỗi reviewer thay vì một thông báo cho mỗi bài
+    return [
+        {
+            "user_id": reviewer_id,
+            "title": "📝 Lời mời phản biện mới",
+            "body": f"Bạn nhận được {count} lời mời phản biện mới. Vui lòng kiểm tra hệ thống.",
+        }
+        for reviewer_id, count in per_reviewer.items()
+    ]
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.AssignmentBulkResult,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def bulk_create_assignments(
+    data: schemas.AssignmentBulkCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Tạo nhiều assignment trong một request. Cặp có COI đang mở bị từ chối,
+    cặp đã tồn tại được bỏ qua (gửi lại cùng lô không tạo trùng).
+    """
+    result = crud.bulk_create_assignments(db, data.items)
+
+    per_reviewer: dict[int, int] = {}
+    for a in result["created"]:
+        per_reviewer[a.reviewer_id] = per_reviewer.get(a.reviewer_id, 0) + 1
+    if per_reviewer:
+        background_tasks.add_task(send_notifications_batch, _invitation_notifications(per_reviewer))
+        workspace_cache.invalidate_many(per_reviewer)
+
+    return schemas.AssignmentBulkResult(
+        created=result["created"],
+        skipped_duplicates=[schemas.AssignmentPair(paper_id=p, reviewer_id=r) for p, r in result["duplicates"]],
+        rejected_coi=[schemas.AssignmentPair(paper_id=p, reviewer_id=r) for p, r in result["conflicts"]],
+    )
+
+
+@router.post(
+    "/auto",
+    response_model=schemas.AutoAssignResult,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def auto_assign(
+    data: schemas.AutoAssignRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    Đề xuất (dry_run=true) hoặc tạo phân công tự động cho một tập paper/reviewer.
+    COI đang mở, bid CONFLICT/NO và cặp đã phân công là ràng buộc cứng.
+    Lượt có ghi giữ khoá Redis từ lúc đọc tải hiện tại đến khi chèn xong: hai lượt song song
+    không thể cùng dựa trên một tải cũ mà phân công vượt giới hạn.
+    """
+    if data.dry_run:
+        return _auto_assign(data, background_tasks, db)
+    try:
+        with redis_lock(AUTO_ASSIGN_LOCK_KEY, AUTO_ASSIGN_LOCK_TTL_MS):
+            return _auto_assign(data, background_tasks, db)
+    except LockBusy:
+        raise HTTPException(409, "Another auto-assign run is in progress; retry when it finishes")
+    except LockUnavailable as e:
+        raise HTTPException(503, f"Cannot acquire auto-assign lock: {e}")
+
+
+def _auto_assign(data: schemas.AutoAssignRequest, background_tasks: BackgroundTasks, db: Session):
+    paper_ids = list(dict.fromkeys(data.paper_ids))
+    reviewer_ids = list(dict.fromkeys(data.reviewer_ids))
+    ctx = crud.load_assignment_context(db, paper_ids, reviewer_ids)
+
+    forbidden = ctx["open_coi"] | ctx["existing_pairs"]
+    forbidden |= {(p, r) for p, r, t in ctx["bids"] if t in ("CONFLICT", "NO")}
+
+    # Paper đã đủ / reviewer đã vượt giới hạn: 0 chứ không âm (ràng buộc âm làm LP vô nghiệm)
+    try:
+        result = solve(SolverInput(
+            paper_ids=paper_ids,
+            reviewer_ids=reviewer_ids,
+            need={p: max(0, data.reviewers_per_paper - ctx["paper_load"].get(p, 0)) for p in paper_ids},
+            capacity={r: max(0, data.max_load_per_reviewer - ctx["reviewer_load"].get(r, 0)) for r in reviewer_ids},
+            bids=ctx["bids"],
+            forbidden=forbidden,
+            paper_topics=data.paper_topics,
+            reviewer_topics=data.reviewer_topics,
+            similarity=[(s.paper_id, s.reviewer_id, s.score) for s in data.similarity],
+            topic_weight=data.topic_weight,
+            similarity_weight=data.similarity_weight,
+        ))
+    except RuntimeError as e:
+        raise HTTPException(422, str(e))
+
+    new_per_reviewer: dict[int, int] = {}
+    for _, r, _ in result.pairs:
+        new_per_reviewer[r] = new_per_reviewer.get(r, 0) + 1
+
+    created = 0
+    if not data.dry_run and result.pairs:
+        created = crud.bulk_insert_assignments(
+            db,
+            [{"paper_id": p, "reviewer_id": r, "due_date": data.due_date} for p, r, _ in result.pairs],
+        )
+        background_tasks.add_task(send_notifications_batch, _invitation_notifications(new_per_reviewer))
+        workspace_cache.invalidate_many(new_per_reviewer)
+
+    return schemas.AutoAssignResult(
+        dry_run=data.dry_run,
+        proposed=[
+            schemas.ProposedAssignment(paper_id=p, reviewer_id=r, score=score)
+            for p, r, score in result.pairs
+        ],
+        unfilled=[schemas.UnfilledPaper(paper_id=p, missing=m) for p, m in result.unfilled.items()],
+        reviewer_load={
+            r: ctx["reviewer_load"].get(r, 0) + n for r, n in new_per_reviewer.items()
+        },
+        total_score=round(sum(score for _, _, score in result.pairs), 4),
+        candidate_edges=result.candidate_edges,
+        solve_ms=result.solve_ms,
+        created=created,
+    )
+
+
 @router.get(
     "/",
     response_model=list[schemas.AssignmentOut],
@@ -78,6 +213,65 @@ def list_assignments(
     return crud.list_assignments(db, reviewer_id=reviewer_id, paper_id=paper_id)
 
 
+@router.get(
+    "/deadlines",
+    response_model=list[schemas.AssignmentDeadlineOut],
+    dependencies=[Depends(require_roles(["REVIEWER", "CHAIR", "ADMIN"]))],
+)
+def list_deadlines(
+    response: Response,
+    state: str = Query(default="due_soon", pattern="^(overdue|due_soon)$"),
+    within_hours: float = Query(default=48, gt=0, le=24 * 90),
+    conference_id: Optional[int] = Query(default=None),
+    reviewer_id: Optional[int] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """
+    Assignment chưa hoàn thành (Invited/Accepted) đã quá hạn hoặc sắp đến hạn trong within_hours giờ,
+    sắp theo due_date. Phân trang bằng cursor (header X-Next-Cursor).
+    """
+    roles = set(payload.get("roles") or [])
+    user_id = payload.get("user_id")
+
+    # Reviewer chỉ xem hạn của mình
+    if "REVIEWER" in roles and "ADMIN" not in roles and "CHAIR" not in roles:
+        reviewer_id = user_id
+
+    after = None
+    if cursor:
+        try:
+            after = deadlines.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(400, "Invalid cursor")
+
+    now = datetime.utcnow()
+    kind = deadlines.OVERDUE if state == "overdue" else deadlines.DUE_SOON
+    due_after, due_before = deadlines.window(kind, now, within_hours)
+    rows = deadlines.due_query(
+        db, due_after, due_before,
+        conference_id=conference_id, reviewer_id=reviewer_id, cursor=after,
+    ).limit(limit).all()
+
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = deadlines.encode_cursor(rows[-1].due_date, rows[-1].id)
+
+    return [
+        {
+            "id": a.id,
+            "reviewer_id": a.reviewer_id,
+            "paper_id": a.paper_id,
+            "conference_id": a.conference_id,
+            "status": _enum_value(a.status),
+            "due_date": a.due_date,
+            "hours_left": round((a.due_date - now).total_seconds() / 3600, 2),
+        }
+        for a in rows
+    ]
+
+
 @router.get(
     "/{assignment_id}",
     response_model=schemas.AssignmentOut,
@@ -150,7 +344,7 @@ def update_assignment(
     # Business rules
     if incoming_status == AssignmentStatus.ACCEPTED.value:
         # Check Conflict of Interest (COI)
-        if crud.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
+        if access_index.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
             raise HTTPException(400, "COI declared: cannot accept this assignment")
 
         # Only Invited -> Accepted
@@ -171,7 +365,8 @@ def update_assignment(
     
     if not updated:
         raise HTTPException(404, "Assignment not found")
-        
+    workspace_cache.invalidate(updated.reviewer_id)
+
     return updated
 
 
@@ -195,7 +390,7 @@ def accept_assignment(
     if "ADMIN" not in roles and ass.reviewer_id != user_id:
         raise HTTPException(403, "Not your assignment")
 
-    if crud.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
+    if access_index.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
         raise HTTPException(400, "COI declared: cannot accept this assignment")
 
     cur = _enum_value(ass.status)
@@ -206,6 +401,7 @@ def accept_assignment(
     ass.response_date = datetime.utcnow()
     db.commit()
     db.refresh(ass)
+    workspace_cache.invalidate(ass.reviewer_id)
     return ass
 
 
@@ -233,4 +429,5 @@ def decline_assignment(
     ass.response_date = datetime.utcnow()
     db.commit()
     db.refresh(ass)
+    workspace_cache.invalidate(ass.reviewer_id)
     return ass
\ No newline at end of file
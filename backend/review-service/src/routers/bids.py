@@ -1,91 +1,95 @@
-import os
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import bisect
+import hashlib
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 
 from src.database import get_db
 from src.models import Bid, BidType
-from src.schemas import BidCreate, BidResponse
+from src import crud
+from src.schemas import BidCreate, BidResponse, BidBulkUpdate, BidMapResponse
 from src.security.deps import get_current_user
 from src.config import settings
+from src.services.bidding_snapshot import bidding_snapshots
 
 router = APIRouter(
     prefix="/bids",
     tags=["bids"]
 )
 
-# Lấy URL của Submission Service từ biến môi trường (hoặc default)
-SUBMISSION_URL = os.getenv("SUBMISSION_SERVICE_URL", "http://submission-service:8000").rstrip("/")
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 200
 
 
 @router.get("/open-papers")
 async def get_papers_for_bidding(
-    request: Request,
+    conference_id: Optional[int] = Query(default=None),
+    cursor: Optional[int] = Query(default=None, description="id bài cuối của trang trước"),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
     Lấy danh sách các bài báo đang mở để Reviewer chọn (Bidding).
 
-    Luồng đúng:
-    - Reviewer gọi review-service /bids/open-papers kèm Bearer token
-    - review-service forward Authorization header sang submission-service
-    - submission-service trả danh sách bài open-for-bidding (đã filter status phù hợp)
-    - review-service map thêm current_bid của reviewer
+    - Danh sách bài lấy từ snapshot dùng chung theo hội nghị (services/bidding_snapshot.py),
+      không gọi submission-service ở mỗi lần tải trang.
+    - Bid của reviewer chỉ query cho các bài trong trang (index unique reviewer_id + paper_id).
+    - Có limit: phân trang theo id, cursor trang sau nằm ở header X-Next-Cursor.
+    - ETag = phiên bản snapshot + trang + bid của reviewer; If-None-Match khớp -> 304.
     """
     reviewer_id = current_user["id"]
 
-    # 1) Forward Authorization header (Bearer token) sang submission-service
-    auth_header = request.headers.get("authorization")  # giữ nguyên "Bearer <token>"
-    if not auth_header:
-        # Trường hợp này thường do frontend không gửi token hoặc gateway/nginx làm mất header
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing Authorization header")
-
-    papers: List[Dict[str, Any]] = []
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                f"{SUBMISSION_URL}/submissions/open-for-bidding",
-                headers={"Authorization": auth_header},
-            )
-
-        if resp.status_code != 200:
-            # Log rõ ràng để debug (403/401 là phổ biến nếu endpoint chưa mở role)
-            print(
-                f"[Review Service] Submission open-for-bidding failed: "
-                f"{resp.status_code} - {resp.text}"
-            )
-            # Trả rỗng để UI không crash, nhưng bạn vẫn nhìn thấy log
-            return []
-
-        papers = resp.json() or []
-
+        snap = await bidding_snapshots.get(conference_id)
     except Exception as e:
-        print(f"[Review Service] Error calling submission service: {e}")
+        print(f"[Review Service] Error loading bidding snapshot: {e}")
+        # Trả rỗng để UI không crash, nhưng vẫn nhìn thấy log
         return []
 
-    # 2) Lấy các Bid cũ của reviewer này để map vào
-    my_bids = db.query(Bid).filter(Bid.reviewer_id == reviewer_id).all()
-    bid_map = {b.paper_id: b.bid_type for b in my_bids}
-
-    # 3) Ghép thông tin: Paper + trạng thái Bid hiện tại của Reviewer
-    # Lưu ý: submission-service đã filter "open-for-bidding", nên về lý thuyết không cần lọc status nữa.
-    results = []
-    for p in papers:
-        paper_id = p.get("id")
-        if not paper_id:
+    # 1) Cắt trang trên snapshot (bỏ bài của chính reviewer)
+    start = bisect.bisect_right(snap.ids, cursor) if cursor is not None else 0
+    page: List[Dict[str, Any]] = []
+    next_cursor = None
+    for p in snap.papers[start:]:
+        if p.get("submitter_id") == reviewer_id:
             continue
-
-        p["current_bid"] = bid_map.get(paper_id, None)
-
+        if limit is not None and len(page) == limit:
+            next_cursor = page[-1]["id"]
+            break
+        page.append(p)
+
+    # 2) Bid hiện tại của reviewer cho các bài trong trang
+    page_ids = [p["id"] for p in page]
+    bid_map = {}
+    if page_ids:
+        bid_map = {
+            paper_id: getattr(bid_type, "value", bid_type)
+            for paper_id, bid_type in db.query(Bid.paper_id, Bid.bid_type)
+            .filter(Bid.reviewer_id == reviewer_id, Bid.paper_id.in_(page_ids))
+            .all()
+        }
+
+    etag_src = f"{snap.version}|{reviewer_id}|{cursor}|{limit}|{sorted(bid_map.items())}"
+    etag = f'W/"{hashlib.sha1(etag_src.encode()).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # 3) Ghép thông tin: Paper + trạng thái Bid hiện tại của Reviewer (không lộ submitter_id)
+    results = []
+    for p in page:
+        item = {k: v for k, v in p.items() if k not in ("submitter_id", "conference_id")}
+        item["current_bid"] = bid_map.get(p["id"])
         # Nếu UI cần ai_summary mà backend chưa có
-        if "ai_summary" not in p:
-            p["ai_summary"] = "AI generated summary placeholder..."
-
-        results.append(p)
+        item.setdefault("ai_summary", "AI generated summary placeholder...")
+        results.append(item)
 
-    return results
+    return ORJSONResponse(content=results, headers=headers)
 
 
 @router.post("/", response_model=BidResponse)
@@ -123,3 +127,20 @@ def submit_bid(
     db.commit()
     db.refresh(new_bid)
     return new_bid
+
+
+@router.put("/bulk", response_model=BidMapResponse)
+def submit_bids_bulk(
+    data: BidBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    Reviewer gửi toàn bộ các bid đã thay đổi trong một request (một câu upsert, một commit).
+    Trả về bid map hiện tại của reviewer: {paper_id: bid_type}.
+    """
+    reviewer_id = current_user["id"]
+    # Cùng paper xuất hiện nhiều lần trong lô: lấy giá trị cuối
+    changes = {b.paper_id: b.bid_type.value for b in data.bids}
+    bid_map = crud.upsert_bids(db, reviewer_id, changes)
+    return BidMapResponse(updated=len(changes), bids=bid_map)
@@ -11,6 +11,8 @@ from src.deps import get_db
 from src import crud, schemas, models
 from src.models import AssignmentStatus, ConflictStatus
 from src.security.deps import get_current_payload, require_roles
+from src.services.access_index import access_index
+from src.services.workspace import workspace_cache
 
 router = APIRouter(prefix="/coi", tags=["COI"])
 
@@ -112,6 +114,8 @@ def create_coi(
 
     db.commit()
     db.refresh(coi)
+    access_index.coi_changed(coi.paper_id, coi.reviewer_id, is_open=True)
+    workspace_cache.invalidate(coi.reviewer_id)
     return coi
 
 
@@ -200,4 +204,6 @@ def update_or_resolve_coi(
 
     db.commit()
     db.refresh(obj)
+    access_index.coi_changed(obj.paper_id, obj.reviewer_id, is_open=_enum_value(obj.status) == "Open")
+    workspace_cache.invalidate(obj.reviewer_id)
     return obj
@@ -0,0 +1,75 @@
+# backend/review-service/src/routers/decisions.py
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from src.deps import get_db
+from src import schemas
+from src.security.deps import require_roles
+from src.services import decision_engine
+from src.services.notifier import send_notifications_batch
+
+router = APIRouter(prefix="/decisions", tags=["Decisions"])
+
+
+@router.post(
+    "/batch",
+    response_model=schemas.DecisionBatchOut,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+async def batch_decisions(
+    data: schemas.DecisionRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
+    """
+    [CHAIR/ADMIN] Tính accept/reject cho cả hội nghị theo policy (ngưỡng điểm / top-K mỗi track /
+    danh sách override). confirm=false: chỉ xem trước phân bố. confirm=true: ghi toàn bộ quyết định
+    sang submission-service bằng một request và gửi thông báo cho tác giả bằng một job.
+    """
+    policy = data.policy
+    try:
+        decision_engine.validate_policy(policy)
+    except decision_engine.PolicyError as e:
+        raise HTTPException(400, str(e))
+
+    try:
+        candidates = await decision_engine.fetch_candidates(data.conference_id)
+    except Exception as e:
+        raise HTTPException(502, f"Cannot load papers from submission-service: {e}")
+
+    scores = await run_in_threadpool(
+        decision_engine.load_scores, db, data.conference_id, [c["id"] for c in candidates], policy.score_field
+    )
+    result = decision_engine.compute_decisions(candidates, scores, policy)
+
+    out = {
+        "conference_id": data.conference_id,
+        "confirmed": data.confirm,
+        "distribution": result["distribution"],
+        "tracks": result["tracks"],
+        "decisions": result["decisions"],
+    }
+    if not data.confirm:
+        return out
+
+    items = decision_engine.changed_items(result["decisions"], policy)
+    decided = sum(1 for d in result["decisions"] if d["decision"] is not None)
+    out["unchanged"] = decided - len(items)
+    if not items:
+        return out
+
+    try:
+        applied = await decision_engine.push_decisions(data.conference_id, items)
+    except Exception as e:
+        raise HTTPException(502, f"Cannot apply decisions in submission-service: {e}")
+
+    out["applied"] = len(applied.get("updated") or [])
+    out["skipped"] = applied.get("skipped") or []
+
+    if data.notify:
+        notifications = decision_engine.decision_notifications(applied.get("updated") or [])
+        if notifications:
+            background_tasks.add_task(send_notifications_batch, notifications)
+        out["notifications_queued"] = len(notifications)
+    return out
@@ -1,44 +1,39 @@
 from __future__ import annotations
 
-import os
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks  # <--- Import BackgroundTasks
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Query, Request, Response  # <--- Import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from src.database import SessionLocal
 from src.deps import get_db
 from src import crud, schemas
 from src.models import Assignment, AssignmentStatus # <--- Import để query danh sách Reviewer
 from src.security.deps import get_current_payload, require_roles
 from src.utils.notification_client import send_notification # <--- Import client thông báo
+from src.services import discussion_stream, paper_projection
 
 router = APIRouter(prefix="/discussions", tags=["Review Discussions"])
 
-SUBMISSION_SERVICE_URL = os.getenv("SUBMISSION_SERVICE_URL", "http://submission-service:8000").rstrip("/")
-INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
+STREAM_HEARTBEAT_SECONDS = 15.0
+STREAM_POLL_SECONDS = 2.0   # chỉ dùng khi không subscribe được Redis
+SENT_IDS_WINDOW = 1000
+MAX_PAGE_SIZE = 200
 
-async def _get_paper_author_id(paper_id: int) -> int:
+async def _get_paper_author_id(db: Session, paper_id: int) -> int:
     """
-    Hàm này KHÔNG ảnh hưởng logic cũ.
-    Chỉ dùng để xác định ai là Author của bài báo.
+    Chỉ dùng để xác định ai là Author (người nộp) của bài báo.
+    Đọc từ bản sao paper_projection; bài chưa có bản sao được nạp một lần từ submission-service.
     """
-    if not SUBMISSION_SERVICE_URL:
+    paper = await paper_projection.ensure(db, paper_id)
+    if paper is None or paper.submitter_id is None:
         return -1
-
-    url = f"{SUBMISSION_SERVICE_URL}/api/submissions/{paper_id}"
-    headers = {}
-    if INTERNAL_KEY:
-        headers["X-Internal-Key"] = INTERNAL_KEY
-
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            r = await client.get(url, headers=headers)
-            if r.status_code == 200:
-                data = r.json()
-                return int(data.get("created_by") or data.get("user_id") or data.get("author_id") or -1)
-    except Exception:
-        pass
-    
-    return -1
+    return paper.submitter_id
 
 
 @router.post(
@@ -64,7 +59,7 @@ async def create_discussion(
             is_reviewer_assigned = True
 
     is_author_owner = False
-    paper_author_id = await _get_paper_author_id(data.paper_id)
+    paper_author_id = await _get_paper_author_id(db, data.paper_id)
     
     if "AUTHOR" in roles:
         if user_id == paper_author_id:
@@ -74,6 +69,7 @@ async def create_discussion(
         raise HTTPException(403, "Permission denied: Not assigned reviewer or paper author")
 
     new_msg = crud.create_discussion(db, data, sender_id=user_id)
+    await discussion_stream.publish(new_msg)
 
     sender_role = "UNKNOWN"
     if is_author_owner:
@@ -122,23 +118,13 @@ async def create_discussion(
     }
 
 
-@router.get(
-    "/paper/{paper_id}",
-    response_model=list[schemas.DiscussionViewOut],
-    dependencies=[Depends(require_roles(["AUTHOR", "REVIEWER", "CHAIR", "ADMIN"]))],
-)
-
-async def list_discussions(
-    paper_id: int,
-    db: Session = Depends(get_db),
-    payload=Depends(get_current_payload),
-):
+async def _viewer_context(db: Session, paper_id: int, payload: dict) -> dict:
     roles = set(payload.get("roles") or [])
     user_id = payload.get("user_id")
     if not user_id:
         raise HTTPException(401, "Token missing user_id")
 
-    paper_author_id = await _get_paper_author_id(paper_id)
+    paper_author_id = await _get_paper_author_id(db, paper_id)
 
     is_viewer_reviewer = False
     is_viewer_author = False
@@ -155,54 +141,190 @@ async def list_discussions(
     if not is_viewer_reviewer and not is_viewer_author and not is_admin_chair:
         raise HTTPException(403, "Not assigned to this paper")
 
-    # --- LẤY DỮ LIỆU ---
-    raw_msgs = crud.list_discussions(db, paper_id)
-    reviewer_ids = sorted({
-        m.sender_id for m in raw_msgs
-        if m.sender_id is not None and m.sender_id != paper_author_id
-    })
-    reviewer_alias_map = {rid: f"R{idx+1}" for idx, rid in enumerate(reviewer_ids)}
-
-    results = []
-    for m in raw_msgs:
-        is_me = (m.sender_id == user_id)
-        is_author_msg = (m.sender_id == paper_author_id)
-        if is_author_msg:
-            sender_role = "AUTHOR"
+    return {"user_id": user_id, "paper_author_id": paper_author_id, "is_admin_chair": is_admin_chair}
+
+
+def _reviewer_alias_map(db: Session, paper_id: int, paper_author_id: int) -> dict:
+    # Alias tính trên mọi người gửi của thread (không chỉ trang đang đọc) để R1/R2 ổn định giữa các trang
+    reviewer_ids = sorted(
+        sid for sid in crud.list_discussion_senders(db, paper_id) if sid != paper_author_id
+    )
+    return {rid: f"R{idx+1}" for idx, rid in enumerate(reviewer_ids)}
+
+
+def _view_message(m: dict, ctx: dict, reviewer_alias_map: dict) -> dict:
+    is_me = (m["sender_id"] == ctx["user_id"])
+    is_author_msg = (m["sender_id"] == ctx["paper_author_id"])
+    if is_author_msg:
+        sender_role = "AUTHOR"
+    else:
+        sender_role = "REVIEWER"
+
+    sender_id_out = None
+    sender_name = "Ẩn danh"
+
+    if ctx["is_admin_chair"]:
+        sender_id_out = m["sender_id"]
+        if sender_role == "AUTHOR":
+            sender_name = "Tác giả"
         else:
-            sender_role = "REVIEWER"
-
-        sender_id_out = None
-        sender_name = "Ẩn danh"
-
-        if is_admin_chair:
-            sender_id_out = m.sender_id
-            if sender_role == "AUTHOR":
-                sender_name = "Tác giả"
-            else:
-                alias = reviewer_alias_map.get(m.sender_id, "R?")
-                sender_name = f"Reviewer ({alias})"
+            alias = reviewer_alias_map.get(m["sender_id"], "R?")
+            sender_name = f"Reviewer ({alias})"
+    else:
+        if sender_role == "AUTHOR":
+            sender_name = "Tác giả"
         else:
-            if sender_role == "AUTHOR":
-                sender_name = "Tác giả"
-            else:
-                alias = reviewer_alias_map.get(m.sender_id, "R?")
-                sender_name = f"Reviewer Ẩn danh ({alias})"
-
-        if is_me:
-            sender_name = "Tôi"
-
-        results.append({
-            "id": m.id,
-            "paper_id": m.paper_id,
-            "sender_id": sender_id_out,    
-            "content": m.content,
-            "sent_at": m.sent_at,
-            "parent_id": m.parent_id,
-
-            "sender_role": sender_role,
-            "sender_name": sender_name,
-            "is_me": is_me,
-        })
-
-    return results
\ No newline at end of file
+            alias = reviewer_alias_map.get(m["sender_id"], "R?")
+            sender_name = f"Reviewer Ẩn danh ({alias})"
+
+    if is_me:
+        sender_name = "Tôi"
+
+    return {
+        "id": m["id"],
+        "paper_id": m["paper_id"],
+        "sender_id": sender_id_out,
+        "content": m["content"],
+        "sent_at": m["sent_at"],
+        "parent_id": m["parent_id"],
+
+        "sender_role": sender_role,
+        "sender_name": sender_name,
+        "is_me": is_me,
+    }
+
+
+@router.get(
+    "/paper/{paper_id}",
+    response_model=list[schemas.DiscussionViewOut],
+    dependencies=[Depends(require_roles(["AUTHOR", "REVIEWER", "CHAIR", "ADMIN"]))],
+)
+
+async def list_discussions(
+    paper_id: int,
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    ctx = await _viewer_context(db, paper_id, payload)
+
+    # --- LẤY DỮ LIỆU ---
+    raw_msgs = crud.list_discussions(db, paper_id, after_id=after_id, limit=limit)
+    reviewer_alias_map = _reviewer_alias_map(db, paper_id, ctx["paper_author_id"])
+
+    if limit is not None and len(raw_msgs) == limit:
+        response.headers["X-Next-Cursor"] = str(raw_msgs[-1].id)
+
+    return [
+        _view_message(discussion_stream.message_payload(m), ctx, reviewer_alias_map)
+        for m in raw_msgs
+    ]
+
+
+def _load_after(paper_id: int, after_id: int) -> list:
+    # Session ngắn cho mỗi lần đọc: stream có thể mở hàng giờ, không giữ connection của pool
+    db = SessionLocal()
+    try:
+        msgs = crud.list_discussions(db, paper_id, after_id=after_id, limit=MAX_PAGE_SIZE)
+        return [discussion_stream.message_payload(m) for m in msgs]
+    finally:
+        db.close()
+
+
+def _load_alias_map(paper_id: int, paper_author_id: int) -> dict:
+    db = SessionLocal()
+    try:
+        return _reviewer_alias_map(db, paper_id, paper_author_id)
+    finally:
+        db.close()
+
+
+@router.get(
+    "/paper/{paper_id}/stream",
+    dependencies=[Depends(require_roles(["AUTHOR", "REVIEWER", "CHAIR", "ADMIN"]))],
+)
+async def stream_discussions(
+    paper_id: int,
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    after_id: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """
+    Server-Sent Events: mỗi tin nhắn mới là một event (id = id tin nhắn, data = DiscussionViewOut).
+    Kết nối lại: EventSource tự gửi Last-Event-ID -> đọc bù các tin có id lớn hơn.
+    """
+    ctx = await _viewer_context(db, paper_id, payload)
+    try:
+        last_id = int(last_event_id) if last_event_id else (after_id or 0)
+    except ValueError:
+        last_id = after_id or 0
+    # Trả connection về pool ngay, phần stream dùng session ngắn riêng
+    db.close()
+
+    async def events():
+        cursor = last_id
+        alias_map = await run_in_threadpool(_load_alias_map, paper_id, ctx["paper_author_id"])
+
+        async def render(m: dict) -> str:
+            nonlocal alias_map
+            if m["sender_id"] != ctx["paper_author_id"] and m["sender_id"] not in alias_map:
+                alias_map = await run_in_threadpool(_load_alias_map, paper_id, ctx["paper_author_id"])
+            view = _view_message(m, ctx, alias_map)
+            return discussion_stream.sse_event(m["id"], view)
+
+        # Id đã gửi gần đây: đọc lại từ id nhỏ hơn cursor (tin commit muộn) không gửi trùng
+        sent_ids: "OrderedDict[int, None]" = OrderedDict()
+
+        async def drain(after: int):
+            nonlocal cursor
+            while True:
+                backlog = await run_in_threadpool(_load_after, paper_id, after)
+                for m in backlog:
+                    after = m["id"]
+                    if m["id"] in sent_ids:
+                        continue
+                    sent_ids[m["id"]] = None
+                    if len(sent_ids) > SENT_IDS_WINDOW:
+                        sent_ids.popitem(last=False)
+                    cursor = max(cursor, m["id"])
+                    yield await render(m)
+                if len(backlog) < MAX_PAGE_SIZE:
+                    return
+
+        # Subscribe TRƯỚC khi đọc bù: tin đến trong lúc đọc bù không bị lọt.
+        # Message pub/sub chỉ là tín hiệu đánh thức: nội dung luôn đọc lại từ DB theo thứ tự id,
+        # vì publish (sau commit, nhiều worker/replica) có thể đến không theo thứ tự id.
+        async with discussion_stream.Subscription(paper_id) as sub:
+            yield "retry: 3000\n\n"
+            async for event in drain(cursor):
+                yield event
+
+            last_sent = time.monotonic()
+            while not await request.is_disconnected():
+                if sub.active:
+                    m = await sub.next(timeout=1.0)
+                    woke = m is not None
+                    # Tin có id nhỏ hơn cursor (commit muộn hơn tin lớn hơn) vẫn được đọc lại
+                    after = min(cursor, m["id"] - 1) if woke and m.get("id") else cursor
+                else:
+                    await asyncio.sleep(STREAM_POLL_SECONDS)
+                    woke, after = True, cursor
+                if woke:
+                    async for event in drain(after):
+                        yield event
+                        last_sent = time.monotonic()
+
+                if time.monotonic() - last_sent >= STREAM_HEARTBEAT_SECONDS:
+                    # Comment SSE: giữ kết nối qua proxy/load balancer, client bỏ qua
+                    yield ": ping\n\n"
+                    last_sent = time.monotonic()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
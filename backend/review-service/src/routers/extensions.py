@@ -5,6 +5,7 @@ from pydantic import BaseModel
 
 from src.deps import get_db
 from src.security.deps import get_current_payload, require_roles
+from src.services.workspace import workspace_cache
 # Import các model của bạn (giả sử bạn đã map model ExtensionRequest vào code)
 from src import models 
 
@@ -68,6 +69,7 @@ def resolve_extension(
     if req.status != "PENDING":
         raise HTTPException(400, "Request already resolved")
 
+    ass = None
     if action.status == "APPROVED":
         req.status = "APPROVED"
         # LOGIC TỰ ĐỘNG TĂNG DEADLINE
@@ -82,4 +84,6 @@ def resolve_extension(
         raise HTTPException(400, "Invalid status")
 
     db.commit()
+    if ass is not None:
+        workspace_cache.invalidate(ass.reviewer_id)
     return req
\ No newline at end of file
@@ -0,0 +1,39 @@
+# backend/review-service/src/routers/me.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from src.deps import get_db
+from src import schemas
+from src.security.deps import get_current_payload, require_roles
+from src.services.workspace import build_workspace, workspace_cache
+
+router = APIRouter(prefix="/me", tags=["Me"])
+
+
+@router.get(
+    "/workspace",
+    response_model=schemas.WorkspaceOut,
+    dependencies=[Depends(require_roles(["REVIEWER", "CHAIR", "ADMIN"]))],
+)
+async def get_workspace(
+    request: Request,
+    refresh: bool = Query(default=False),
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """
+    Dashboard của reviewer trong một request: assignment, tên/track bài, trạng thái review
+    (kể cả autosave chưa lưu), COI đang mở và hạn chót. refresh=true: bỏ qua cache.
+    """
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(401, "Token missing user_id")
+
+    if not refresh:
+        cached = workspace_cache.get(user_id)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    data = await build_workspace(db, user_id, request.headers.get("authorization"))
+    workspace_cache.put(user_id, data)
+    return data
@@ -1,14 +1,21 @@
 # backend/review-service/src/routers/papers.py
 import os
+from typing import Optional
+
 import httpx
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from src.deps import get_db
-from src import crud
+from src import models, schemas
+from src.services.review_stats import SORTABLE_FIELDS
+from src.services import calibration, paper_projection
+from src.services.download_cache import paper_file_cache, parse_range, version_key
 from src.config import SUBMISSION_SERVICE_URL
 from src.security.deps import get_current_payload, require_roles
+from src.services.access_index import access_index
 
 router = APIRouter(prefix="/papers", tags=["Papers (helper)"])
 
@@ -37,48 +44,29 @@ def _build_internal_headers() -> dict:
     return headers
 
 
-async def _preflight_file_exists(client: httpx.AsyncClient, url: str) -> dict:
-    try:
-        r = await client.head(url, follow_redirects=True)
-        if r.status_code == 200:
-            return dict(r.headers)
-        if r.status_code == 404:
-            raise HTTPException(status_code=404, detail="File not found on storage server")
-    except HTTPException:
-        raise
-    except Exception:
-        # Fallback to GET range if HEAD fails
-        pass
-
-    try:
-        r = await client.get(url, follow_redirects=True, headers={"Range": "bytes=0-0"})
-        if r.status_code in (200, 206):
-            return dict(r.headers)
-        if r.status_code == 404:
-            raise HTTPException(status_code=404, detail="File not found on storage server")
-        raise HTTPException(status_code=502, detail=f"Storage server error: {r.status_code}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=502, detail=f"Storage connection failed: {str(e)}")
-
-
-async def _process_download(paper_id: int):
+async def _latest_version(paper_id: int) -> dict:
     """
-    Logic chung để tải file từ Submission Service dựa trên paper_id
+    Metadata version mới nhất của paper: bản sao paper_projection (cập nhật theo paper events),
+    nếu chưa có thì hỏi submission-service (nhớ ngắn hạn trong paper_file_cache).
     """
+    local = await paper_projection.load_latest_version(paper_id)
+    if local:
+        return local
+
+    cached = paper_file_cache.get_latest_version(paper_id)
+    if cached:
+        return cached
+
     sub_url = (SUBMISSION_SERVICE_URL or "").rstrip("/")
     if not sub_url:
         raise HTTPException(status_code=500, detail="SUBMISSION_SERVICE_URL is missing")
 
-    timeout_meta = httpx.Timeout(10.0, read=20.0)
-    timeout_file = httpx.Timeout(10.0, read=180.0)
-    internal_headers = _build_internal_headers()
-
-    # 1. Lấy metadata
     try:
-        async with httpx.AsyncClient(timeout=timeout_meta, headers=internal_headers) as client:
-            r = await client.get(f"{sub_url}/submissions/{paper_id}", follow_redirects=True)
+        r = await paper_file_cache.client().get(
+            f"{sub_url}/submissions/{paper_id}",
+            headers=_build_internal_headers(),
+            timeout=httpx.Timeout(10.0, read=20.0),
+        )
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Failed to connect to Submission Service: {str(e)}")
 
@@ -87,37 +75,143 @@ async def _process_download(paper_id: int):
     if r.status_code != 200:
         raise HTTPException(status_code=502, detail=f"Submission Service error: {r.status_code}")
 
-    data = r.json()
-    versions = data.get("versions") or []
+    versions = r.json().get("versions") or []
     if not versions:
         raise HTTPException(status_code=404, detail="No PDF version found for this paper")
 
     latest = max(versions, key=lambda v: v.get("version_number", 0))
+    paper_file_cache.remember_latest_version(paper_id, latest)
+    return latest
+
+
+async def _process_download(paper_id: int, request: Request):
+    """
+    Logic chung để tải file từ Submission Service dựa trên paper_id.
+    File được cache trên đĩa (services/download_cache.py): lần tải lặp lại phục vụ thẳng từ
+    đĩa, hỗ trợ ETag (If-None-Match -> 304) và Range (206).
+    """
+    latest = await _latest_version(paper_id)
     relative_path = _clean_relative_path(latest.get("file_url") or "")
-    
     if not relative_path:
         raise HTTPException(status_code=404, detail="File path missing in metadata")
 
-    download_url = f"{sub_url}/uploads/{relative_path}"
+    download_url = f"{(SUBMISSION_SERVICE_URL or '').rstrip('/')}/uploads/{relative_path}"
+    version_number = latest.get("version_number")
+
+    try:
+        cached, fh = await paper_file_cache.open_file(
+            version_key(paper_id, latest), version_number, download_url
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found on storage server")
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Storage connection failed: {str(e)}")
+
+    filename = f"Paper_{paper_id}_v{version_number}.pdf"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": cached.etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=0, must-revalidate",
+    }
+
+    if request.headers.get("if-none-match") == cached.etag:
+        fh.close()
+        return Response(status_code=304, headers=headers)
 
-    # 2. Preflight check
-    async with httpx.AsyncClient(timeout=timeout_meta) as client:
-        headers_hint = await _preflight_file_exists(client, download_url)
+    # Đọc qua handle đã mở: cache xoá file (evict) giữa chừng không làm hỏng response
+    def iter_file(start: int, end: int):
+        with fh:
+            fh.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = fh.read(min(256 * 1024, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
 
-    # 3. Stream file
-    async def iterfile():
-        async with httpx.AsyncClient(timeout=timeout_file) as client:
-            async with client.stream("GET", download_url, follow_redirects=True) as resp:
-                if resp.status_code != 200:
-                    return
-                async for chunk in resp.aiter_bytes():
-                    yield chunk
+    if_range = request.headers.get("if-range")
+    byte_range = parse_range(request.headers.get("range"), cached.size)
+    if byte_range and (if_range is None or if_range == cached.etag):
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{cached.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(iter_file(start, end), status_code=206, media_type="application/pdf", headers=headers)
+
+    headers["Content-Length"] = str(cached.size)
+    return StreamingResponse(iter_file(0, cached.size - 1), media_type="application/pdf", headers=headers)
+
+
+@router.get(
+    "/stats",
+    response_model=list[schemas.PaperReviewStatsOut],
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_paper_stats(
+    conference_id: Optional[int] = Query(default=None),
+    sort: str = Query(default="mean_score"),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+    min_reviews: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=5000),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    [CHAIR/ADMIN] Bảng xếp hạng bài theo điểm review (đọc từ read model paper_review_stats).
+    Route sync (threadpool): query tới 5000 dòng không chạy trên event loop. conference_id của
+    stats được gắn lúc tính stats / bởi ConferenceBackfill, không hỏi submission-service ở đây.
+    """
+    if sort not in SORTABLE_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort. Allowed: {list(SORTABLE_FIELDS)}")
+
+    S = models.PaperReviewStats
+    col = getattr(S, sort)
+    q = db.query(S)
+    if conference_id is not None:
+        q = q.filter(S.conference_id == conference_id)
+    if min_reviews:
+        q = q.filter(S.review_count >= min_reviews)
+
+    # Bài chưa có điểm luôn nằm cuối
+    q = q.order_by(col.is_(None), col.desc() if order == "desc" else col.asc(), S.paper_id)
+    return q.offset(offset).limit(limit).all()
+
+
+@router.get(
+    "/calibration",
+    response_model=schemas.CalibrationOut,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+async def get_score_calibration(
+    conference_id: int = Query(...),
+    rank_by: str = Query(default="least_squares"),
+    db: Session = Depends(get_db),
+):
+    """
+    [CHAIR/ADMIN] Xếp hạng bài sau khi hiệu chỉnh độ khắt khe/dễ dãi của reviewer
+    (z-score hoặc bias/scale bình phương tối thiểu) và các chỉ số đồng thuận.
+    """
+    key = {"least_squares": "ls_quality", "zscore": "zscore_mean", "raw": "raw_mean"}.get(rank_by)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Invalid rank_by. Allowed: {list(calibration.RANK_METHODS)}")
 
-    filename = f"Paper_{paper_id}_v{latest.get('version_number')}.pdf"
-    out_headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    media_type = headers_hint.get("content-type") or "application/pdf"
+    report, cached = await run_in_threadpool(calibration.get_calibration, db, conference_id)
 
-    return StreamingResponse(iterfile(), media_type=media_type, headers=out_headers)
+    ordered = sorted(
+        report["papers"],
+        key=lambda p: (p[key] is None, -(p[key] or 0.0), p["paper_id"]),
+    )
+    return schemas.CalibrationOut(
+        conference_id=conference_id,
+        rank_by=rank_by,
+        review_count=report["review_count"],
+        cached=cached,
+        compute_ms=report["compute_ms"],
+        agreement=report["agreement"],
+        papers=[schemas.CalibratedPaper(rank=i + 1, **p) for i, p in enumerate(ordered)],
+        reviewers=report["reviewers"],
+    )
 
 
 @router.get(
@@ -126,25 +220,27 @@ async def _process_download(paper_id: int):
 )
 async def download_paper_via_assignment(
     assignment_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     payload=Depends(get_current_payload),
 ):
     """
     [REVIEWER] Download bài báo thông qua Assignment.
     """
-    ass = crud.get_assignment(db, assignment_id)
-    if not ass:
+    owner = access_index.assignment_owner(db, assignment_id)
+    if not owner:
         raise HTTPException(status_code=404, detail="Assignment not found")
+    reviewer_id, paper_id = owner
 
     roles = set(payload.get("roles") or [])
     user_id = payload.get("user_id")
 
     # Reviewer chỉ được tải assignment của chính mình
     if "REVIEWER" in roles and "ADMIN" not in roles and "CHAIR" not in roles:
-        if ass.reviewer_id != user_id:
+        if reviewer_id != user_id:
             raise HTTPException(status_code=403, detail="Not your assignment")
             
-    return await _process_download(ass.paper_id)
+    return await _process_download(paper_id, request)
 
 
 @router.get(
@@ -153,9 +249,10 @@ async def download_paper_via_assignment(
 )
 async def download_paper_direct(
     paper_id: int,
+    request: Request,
 ):
     """
     [CHAIR/ADMIN] Download bài báo trực tiếp bằng Paper ID.
     Dùng cho màn hình phân công (Split View) hoặc quản lý bài báo.
     """
-    return await _process_download(paper_id)
\ No newline at end of file
+    return await _process_download(paper_id, request)
\ No newline at end of file
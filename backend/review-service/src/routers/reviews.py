@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 from datetime import datetime
 from typing import Optional
 
@@ -11,14 +12,52 @@ from src import crud, schemas
 from src.models import AssignmentStatus
 from src.security.deps import get_current_payload, require_roles
 from src.utils.notification_client import send_notification  # Import client thông báo
+from src.services.access_index import access_index
+from src.services.review_stats import is_submitted, refresh_paper_stats
+from src.services.draft_store import Claim, DraftConflict, DraftUnavailable, apply_claims, draft_store
+from src.services.workspace import workspace_cache
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
 
+logger = logging.getLogger(__name__)
+
 
 def _enum_value(x) -> str:
     return getattr(x, "value", str(x))
 
 
+def _apply_pending_draft(db: Session, review_id: int) -> Optional[Claim]:
+    """Đưa bản nháp autosave đang chờ vào session hiện tại; caller commit rồi gọi _finish_draft."""
+    claim = draft_store.claim(review_id, force=True)
+    if claim is not None:
+        apply_claims(db, [claim])
+    return claim
+
+
+def _finish_draft(claim: Optional[Claim], committed: bool) -> None:
+    if claim is not None:
+        draft_store.release(claim, flushed=committed)
+
+
+def _invalidate_workspace(db: Session, assignment_id: int) -> None:
+    owner = access_index.assignment_owner(db, assignment_id)
+    if owner is not None:
+        workspace_cache.invalidate(owner[0])
+
+
+def _draft_out(review_id: int, draft: Optional[dict]) -> dict:
+    if not draft:
+        return {"review_id": review_id, "version": 0, "flushed_version": 0, "pending": False}
+    return {
+        "review_id": review_id,
+        "version": draft["version"],
+        "flushed_version": draft["flushed_version"],
+        "pending": draft["pending"],
+        "review": draft["fields"],
+        "criterias": draft["criterias"],
+    }
+
+
 @router.post(
     "/",
     response_model=schemas.ReviewOut,
@@ -46,10 +85,12 @@ def create_review(
         raise HTTPException(400, "Assignment must be Accepted before creating a review")
 
     # COI block
-    if crud.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
+    if access_index.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
         raise HTTPException(400, "COI detected: cannot create review for this paper")
 
-    return crud.create_review(db, data)
+    review = crud.create_review(db, data)
+    workspace_cache.invalidate(ass.reviewer_id)
+    return review
 
 
 @router.get(
@@ -69,8 +110,8 @@ def list_reviews(
     if "REVIEWER" in roles and "ADMIN" not in roles and "CHAIR" not in roles:
         if assignment_id is None:
             raise HTTPException(400, "assignment_id is required for reviewer")
-        ass = crud.get_assignment(db, assignment_id)
-        if not ass or ass.reviewer_id != user_id:
+        owner = access_index.assignment_owner(db, assignment_id)
+        if not owner or owner[0] != user_id:
             raise HTTPException(403, "Not your assignment")
 
     return crud.list_reviews(db, assignment_id=assignment_id)
@@ -94,8 +135,8 @@ def get_review(
     user_id = payload.get("user_id")
 
     if "REVIEWER" in roles and "ADMIN" not in roles and "CHAIR" not in roles:
-        ass = crud.get_assignment(db, obj.assignment_id)
-        if not ass or ass.reviewer_id != user_id:
+        owner = access_index.assignment_owner(db, obj.assignment_id)
+        if not owner or owner[0] != user_id:
             raise HTTPException(403, "Not your review")
 
     return obj
@@ -136,9 +177,19 @@ def update_review(
                 ass.status = AssignmentStatus.ACCEPTED
                 db.add(ass)
 
-    updated = crud.update_review(db, review_id, data)
+    # Bản nháp autosave chưa flush được ghi trước, PATCH này (mới hơn) ghi đè lên
+    claim = _apply_pending_draft(db, review_id)
+    try:
+        updated = crud.update_review(db, review_id, data)
+    except Exception:
+        _finish_draft(claim, committed=False)
+        raise
+    _finish_draft(claim, committed=True)
     if not updated:
         raise HTTPException(404, "Review not found")
+    if updated.submitted_at is not None:
+        draft_store.discard(review_id)
+    _invalidate_workspace(db, updated.assignment_id)
     return updated
 
 
@@ -161,15 +212,17 @@ def add_criteria(
     user_id = payload.get("user_id")
 
     if "ADMIN" not in roles:
-        ass = crud.get_assignment(db, rev.assignment_id)
-        if not ass or ass.reviewer_id != user_id:
+        owner = access_index.assignment_owner(db, rev.assignment_id)
+        if not owner or owner[0] != user_id:
             raise HTTPException(403, "Not your review")
 
         # block after submit
         if hasattr(rev, "submitted_at") and getattr(rev, "submitted_at") is not None:
             raise HTTPException(400, "Review already submitted; cannot add criteria")
 
-    return crud.add_review_criteria(db, review_id, data)
+    criteria = crud.add_review_criteria(db, review_id, data)
+    _invalidate_workspace(db, rev.assignment_id)
+    return criteria
 
 
 @router.post(
@@ -199,9 +252,12 @@ def submit_review(
     if _enum_value(ass.status) != "Accepted":
         raise HTTPException(400, "Assignment must be Accepted before submitting review")
 
-    if crud.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
+    if access_index.has_open_coi(db, reviewer_id=ass.reviewer_id, paper_id=ass.paper_id):
         raise HTTPException(400, "COI detected: cannot submit review")
 
+    # Nội dung autosave cuối cùng được nộp cùng transaction
+    claim = _apply_pending_draft(db, review_id)
+
     # mark submitted
     if hasattr(rev, "is_draft"):
         setattr(rev, "is_draft", False)
@@ -209,8 +265,17 @@ def submit_review(
         setattr(rev, "submitted_at", datetime.utcnow())
 
     ass.status = AssignmentStatus.COMPLETED
+    try:
+        refresh_paper_stats(db, ass.paper_id)
+        db.commit()
+    except Exception:
+        db.rollback()
+        _finish_draft(claim, committed=False)
+        raise
+    _finish_draft(claim, committed=True)
+    draft_store.discard(review_id)
+    workspace_cache.invalidate(ass.reviewer_id)
 
-    db.commit()
     db.refresh(rev)
     return rev
 
@@ -239,20 +304,157 @@ def update_criteria(
     user_id = payload.get("user_id")
 
     if "ADMIN" not in roles:
-        ass = crud.get_assignment(db, rev.assignment_id)
-        if not ass or ass.reviewer_id != user_id:
+        owner = access_index.assignment_owner(db, rev.assignment_id)
+        if not owner or owner[0] != user_id:
             raise HTTPException(403, "Not your review")
 
         # block after submit
         if rev.submitted_at is not None:
             raise HTTPException(400, "Review already submitted; cannot edit criteria")
 
-    updated = crud.update_review_criteria(db, criteria_id, data)
+    claim = _apply_pending_draft(db, review_id)
+    try:
+        updated = crud.update_review_criteria(db, criteria_id, data)
+    except Exception:
+        _finish_draft(claim, committed=False)
+        raise
+    _finish_draft(claim, committed=True)
     if not updated:
         raise HTTPException(404, "Criteria not found")
+    _invalidate_workspace(db, rev.assignment_id)
     return updated
 
 
+# =========================================================
+# AUTOSAVE BẢN NHÁP (Redis, ghi gộp xuống DB)
+# =========================================================
+
+def _authorize_draft(db: Session, review_id: int, roles: set, user_id: int) -> int:
+    """Kiểm tra quyền trên DB (lần autosave đầu / Redis lỗi). Trả về reviewer_id của review."""
+    rev = crud.get_review(db, review_id)
+    if not rev:
+        raise HTTPException(404, "Review not found")
+    owner = access_index.assignment_owner(db, rev.assignment_id)
+    if not owner:
+        raise HTTPException(400, "Assignment not found")
+    if "ADMIN" not in roles and owner[0] != user_id:
+        raise HTTPException(403, "Not your review")
+    if is_submitted(rev):
+        raise HTTPException(400, "Review already submitted; cannot autosave")
+    return owner[0]
+
+
+@router.patch(
+    "/{review_id}/draft",
+    response_model=schemas.ReviewDraftOut,
+    dependencies=[Depends(require_roles(["REVIEWER", "ADMIN"]))],
+)
+def autosave_draft(
+    review_id: int,
+    data: schemas.ReviewDraftPatch,
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """
+    Autosave: merge patch vào bản nháp trên Redis (không mở transaction MySQL).
+    Bản nháp được ghi xuống DB sau DRAFT_DEBOUNCE giây không sửa (tối đa DRAFT_MAX_DELAY),
+    khi lưu tường minh, khi PATCH trực tiếp hoặc khi submit.
+    base_version (tuỳ chọn): chỉ ghi nếu bản nháp đang ở version này, ngược lại 409.
+    """
+    roles = set(payload.get("roles") or [])
+    user_id = payload.get("user_id")
+
+    fields = data.review.model_dump(exclude_unset=True) if data.review else {}
+    criterias = {cid: c.model_dump(exclude_unset=True) for cid, c in data.criterias.items()}
+
+    try:
+        owner = draft_store.owner(review_id)
+        if owner is None or ("ADMIN" not in roles and owner != user_id):
+            owner = _authorize_draft(db, review_id, roles, user_id)
+            draft_store.remember_owner(review_id, owner)
+        draft_store.patch(review_id, fields, criterias, base_version=data.base_version)
+        draft = draft_store.get(review_id)
+    except DraftConflict as e:
+        raise HTTPException(409, f"Draft version conflict: current version is {e.current_version}")
+    except DraftUnavailable as e:
+        # Redis không dùng được: ghi thẳng xuống DB như PATCH thường
+        logger.warning(f"[Review Service] Draft store unavailable, writing through: {e}")
+        owner = _authorize_draft(db, review_id, roles, user_id)
+        apply_claims(db, [Claim(review_id=review_id, version=0, fields=fields, criterias=criterias)])
+        db.commit()
+        workspace_cache.invalidate(owner)
+        return _draft_out(review_id, None)
+
+    # Trạng thái autosave (pending) hiển thị trên workspace
+    workspace_cache.invalidate(owner)
+    return _draft_out(review_id, draft)
+
+
+@router.get(
+    "/{review_id}/draft",
+    response_model=schemas.ReviewDraftOut,
+    dependencies=[Depends(require_roles(["REVIEWER", "ADMIN"]))],
+)
+def get_draft(
+    review_id: int,
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """Bản nháp chưa flush (phủ lên dữ liệu của GET /reviews/{id}). version=0: không có bản nháp."""
+    roles = set(payload.get("roles") or [])
+    user_id = payload.get("user_id")
+
+    if "ADMIN" not in roles:
+        owner = None
+        try:
+            owner = draft_store.owner(review_id)
+        except DraftUnavailable:
+            pass
+        if owner != user_id:
+            rev = crud.get_review(db, review_id)
+            if not rev:
+                raise HTTPException(404, "Review not found")
+            ass_owner = access_index.assignment_owner(db, rev.assignment_id)
+            if not ass_owner or ass_owner[0] != user_id:
+                raise HTTPException(403, "Not your review")
+
+    try:
+        return _draft_out(review_id, draft_store.get(review_id))
+    except DraftUnavailable:
+        return _draft_out(review_id, None)
+
+
+@router.post(
+    "/{review_id}/draft/flush",
+    response_model=schemas.ReviewDraftOut,
+    dependencies=[Depends(require_roles(["REVIEWER", "ADMIN"]))],
+)
+def flush_draft(
+    review_id: int,
+    db: Session = Depends(get_db),
+    payload=Depends(get_current_payload),
+):
+    """Lưu tường minh: ghi ngay bản nháp đang chờ xuống DB."""
+    roles = set(payload.get("roles") or [])
+    user_id = payload.get("user_id")
+    owner = _authorize_draft(db, review_id, roles, user_id)
+
+    claim = _apply_pending_draft(db, review_id)
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        _finish_draft(claim, committed=False)
+        raise
+    _finish_draft(claim, committed=True)
+    workspace_cache.invalidate(owner)
+
+    try:
+        return _draft_out(review_id, draft_store.get(review_id))
+    except DraftUnavailable:
+        return _draft_out(review_id, None)
+
+
 # =========================================================
 # ✅ NEW: REVIEW EVALUATIONS (Chair chấm điểm Reviewer)
 # =========================================================
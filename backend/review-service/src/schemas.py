@@ -1,5 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+import json
+
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -29,6 +31,69 @@ class AssignmentOut(BaseModel):
     class Config:
         from_attributes = True
 
+class AssignmentDeadlineOut(BaseModel):
+    id: int
+    reviewer_id: int
+    paper_id: int
+    conference_id: Optional[int] = None
+    status: str
+    due_date: datetime
+    hours_left: float  # âm = đã quá hạn
+
+    class Config:
+        from_attributes = True
+
+class AssignmentBulkCreate(BaseModel):
+    items: List[AssignmentCreate] = Field(min_length=1, max_length=5000)
+
+class AssignmentPair(BaseModel):
+    paper_id: int
+    reviewer_id: int
+
+class AssignmentBulkResult(BaseModel):
+    created: List[AssignmentOut]
+    skipped_duplicates: List[AssignmentPair]
+    rejected_coi: List[AssignmentPair]
+
+class AffinityScore(BaseModel):
+    paper_id: int
+    reviewer_id: int
+    score: float = Field(ge=0, le=1)
+
+class AutoAssignRequest(BaseModel):
+    paper_ids: List[int] = Field(min_length=1)
+    reviewer_ids: List[int] = Field(min_length=1)
+    reviewers_per_paper: int = Field(default=3, ge=1, le=20)
+    max_load_per_reviewer: int = Field(default=5, ge=1)
+    # Topic của paper / chuyên môn của reviewer (id topic bên conference-service)
+    paper_topics: Dict[int, List[int]] = {}
+    reviewer_topics: Dict[int, List[int]] = {}
+    # Điểm tương đồng tuỳ chọn (vd. từ intelligent-service), 0..1
+    similarity: List[AffinityScore] = []
+    topic_weight: float = Field(default=1.0, ge=0)
+    similarity_weight: float = Field(default=1.0, ge=0)
+    due_date: Optional[datetime] = None
+    dry_run: bool = True
+
+class ProposedAssignment(BaseModel):
+    paper_id: int
+    reviewer_id: int
+    score: float
+
+class UnfilledPaper(BaseModel):
+    paper_id: int
+    missing: int
+
+class AutoAssignResult(BaseModel):
+    dry_run: bool
+    proposed: List[ProposedAssignment]
+    unfilled: List[UnfilledPaper]
+    reviewer_load: Dict[int, int]
+    total_score: float
+    candidate_edges: int
+    solve_ms: int
+    created: int = 0
+
 # ---------- Reviews ----------
 class ReviewCreate(BaseModel):
     assignment_id: int
@@ -86,6 +151,28 @@ class ReviewOut(BaseModel):
     class Config:
         from_attributes = True
 
+# ---------- Review draft autosave ----------
+class ReviewDraftFields(BaseModel):
+    final_score: Optional[float] = None
+    confidence_score: Optional[int] = Field(default=None, ge=1, le=5)
+    content_author: Optional[str] = None
+    content_pc: Optional[str] = None
+    is_anonymous: Optional[bool] = None
+
+class ReviewDraftPatch(BaseModel):
+    # Chỉ các trường gửi lên mới được merge (exclude_unset); null = xoá giá trị
+    review: Optional[ReviewDraftFields] = None
+    criterias: Dict[int, ReviewCriteriaUpdate] = Field(default_factory=dict)
+    base_version: Optional[int] = Field(default=None, ge=0)
+
+class ReviewDraftOut(BaseModel):
+    review_id: int
+    version: int
+    flushed_version: int
+    pending: bool
+    review: Dict[str, Any] = {}
+    criterias: Dict[int, Dict[str, Any]] = {}
+
 # ---------- COI ----------
 class COICreate(BaseModel):
     paper_id: int
@@ -153,6 +240,13 @@ class BidCreate(BaseModel):
     paper_id: int
     bid_type: BidType
 
+class BidBulkUpdate(BaseModel):
+    bids: List[BidCreate] = Field(min_length=1, max_length=1000)
+
+class BidMapResponse(BaseModel):
+    updated: int
+    bids: Dict[int, BidType]
+
 class BidResponse(BaseModel):
     id: int
     reviewer_id: int
@@ -200,4 +294,160 @@ class EvaluationOut(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# ---------- Paper review stats ----------
+class CriterionStatsOut(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    variance: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    weighted_mean: Optional[float] = None
+
+class PaperReviewStatsOut(BaseModel):
+    paper_id: int
+    conference_id: Optional[int] = None
+    review_count: int
+    scored_count: int
+    mean_score: Optional[float] = None
+    score_variance: Optional[float] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    weighted_score: Optional[float] = None
+    mean_confidence: Optional[float] = None
+    criteria: Dict[str, CriterionStatsOut] = Field(default={}, validation_alias="criteria_stats")
+    updated_at: Optional[datetime] = None
+
+    @field_validator("criteria", mode="before")
+    @classmethod
+    def _parse_criteria(cls, v):
+        if isinstance(v, str):
+            return json.loads(v or "{}")
+        return v or {}
+
+    class Config:
+        from_attributes = True
+
+
+# ---------- Score calibration ----------
+class CalibratedPaper(BaseModel):
+    rank: int
+    paper_id: int
+    review_count: int
+    raw_mean: Optional[float] = None
+    zscore_mean: Optional[float] = None
+    ls_quality: Optional[float] = None
+    score_std: Optional[float] = None
+
+class ReviewerCalibration(BaseModel):
+    reviewer_id: int
+    review_count: int
+    mean: Optional[float] = None
+    std: Optional[float] = None
+    bias: Optional[float] = None
+    scale: Optional[float] = None
+    consensus_corr: Optional[float] = None
+
+class AgreementMetrics(BaseModel):
+    krippendorff_alpha: Optional[float] = None
+    mean_paper_std: Optional[float] = None
+    papers_with_multiple_reviews: int = 0
+
+class CalibrationOut(BaseModel):
+    conference_id: int
+    rank_by: str
+    review_count: int
+    cached: bool
+    compute_ms: int
+    agreement: AgreementMetrics
+    papers: List[CalibratedPaper]
+    reviewers: List[ReviewerCalibration]
+
+
+# ---------- Batch decisions ----------
+class DecisionPolicy(BaseModel):
+    # threshold: score >= threshold -> accept; top_k_per_track: K bài điểm cao nhất mỗi track
+    mode: str = Field(default="threshold", pattern="^(threshold|top_k_per_track)$")
+    score_field: str = "weighted_score"
+    threshold: Optional[float] = None
+    top_k: Optional[int] = Field(default=None, ge=0)
+    min_reviews: int = Field(default=1, ge=0)
+    # paper_id -> "ACCEPTED" | "REJECTED"; áp dụng sau cùng, kể cả bài thiếu review
+    overrides: Dict[int, str] = Field(default_factory=dict)
+    accept_note: Optional[str] = None
+    reject_note: Optional[str] = None
+
+class DecisionRequest(BaseModel):
+    conference_id: int
+    policy: DecisionPolicy
+    confirm: bool = False   # False = chỉ xem trước
+    notify: bool = True
+
+class PaperDecisionOut(BaseModel):
+    paper_id: int
+    track_id: int
+    title: str
+    current_status: str
+    score: Optional[float] = None
+    review_count: int = 0
+    decision: Optional[str] = None   # None = chưa quyết (thiếu review/điểm)
+    reason: str
+
+class TrackDecisionSummary(BaseModel):
+    track_id: int
+    total: int
+    accepted: int
+    rejected: int
+    undecided: int
+    cutoff_score: Optional[float] = None  # điểm thấp nhất được accept
+
+class DecisionSkipped(BaseModel):
+    paper_id: int
+    reason: str
+
+class DecisionBatchOut(BaseModel):
+    conference_id: int
+    confirmed: bool
+    distribution: Dict[str, int]
+    tracks: List[TrackDecisionSummary]
+    decisions: List[PaperDecisionOut]
+    applied: int = 0
+    unchanged: int = 0
+    skipped: List[DecisionSkipped] = []
+    notifications_queued: int = 0
+
+
+# ---------- Reviewer workspace ----------
+class WorkspaceItem(BaseModel):
+    assignment_id: int
+    paper_id: int
+    paper_title: Optional[str] = None
+    track_id: Optional[int] = None
+    conference_id: Optional[int] = None
+    paper_status: Optional[str] = None
+    assignment_status: str
+    due_date: Optional[datetime] = None
+    overdue: bool = False
+    due_soon: bool = False
+    has_open_coi: bool = False
+    review_id: Optional[int] = None
+    review_state: str = "none"   # none | draft | submitted
+    draft_pending: bool = False  # còn autosave chưa ghi xuống DB
+    final_score: Optional[float] = None
+
+class WorkspaceCounts(BaseModel):
+    total: int = 0
+    invited: int = 0
+    accepted: int = 0
+    completed: int = 0
+    overdue: int = 0
+    due_soon: int = 0
+    coi: int = 0
+
+class WorkspaceOut(BaseModel):
+    reviewer_id: int
+    generated_at: datetime
+    cached: bool = False
+    counts: WorkspaceCounts
+    items: List[WorkspaceItem]
@@ -0,0 +1,151 @@
+# backend/review-service/src/services/access_index.py
+"""
+Chỉ mục trong bộ nhớ (mỗi process) cho các kiểm tra quyền lặp lại trên mọi thao tác reviewer:
+
+- COI đang mở: paper_id -> set(reviewer_id), nạp lười theo paper (một query/paper),
+  cập nhật write-through khi tạo/sửa COI và đồng bộ giữa các replica qua Redis pub/sub.
+  Mỗi paper có TTL để tự làm mới nếu lỡ mất message (Redis chết, replica mới khởi động...).
+- Chủ sở hữu assignment: assignment_id -> (reviewer_id, paper_id). Hai giá trị này không
+  đổi sau khi tạo nên cache LRU không cần invalidate.
+
+Trạng thái assignment (Invited/Accepted/...) KHÔNG được cache: vẫn đọc từ DB khi cần.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from src import models
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "review-service:coi"
+COI_TTL_SECONDS = int(os.getenv("COI_INDEX_TTL", "300"))
+OWNER_CACHE_SIZE = int(os.getenv("ASSIGNMENT_OWNER_CACHE_SIZE", "100000"))
+
+
+class AccessIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._coi: Dict[int, Tuple[float, Set[int]]] = {}
+        self._owners: "OrderedDict[int, Tuple[int, int]]" = OrderedDict()
+        self._instance_id = uuid.uuid4().hex
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    # ---------------- COI ----------------
+    def _open_coi_reviewers(self, db: Session, paper_id: int) -> Set[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._coi.get(paper_id)
+            if entry and now - entry[0] < COI_TTL_SECONDS:
+                return entry[1]
+
+        C = models.ConflictOfInterest
+        reviewers = {
+            r for (r,) in db.query(C.reviewer_id)
+            .filter(C.paper_id == paper_id, C.status == models.ConflictStatus.OPEN)
+            .all()
+        }
+        with self._lock:
+            self._coi[paper_id] = (now, reviewers)
+        return reviewers
+
+    def has_open_coi(self, db: Session, reviewer_id: int, paper_id: int) -> bool:
+        return reviewer_id in self._open_coi_reviewers(db, paper_id)
+
+    def _apply_coi(self, paper_id: int, reviewer_id: int, is_open: bool) -> None:
+        with self._lock:
+            entry = self._coi.get(paper_id)
+            if entry is None:
+                return  # paper chưa được nạp: lần đọc sau sẽ query DB
+            if is_open:
+                entry[1].add(reviewer_id)
+            else:
+                entry[1].discard(reviewer_id)
+
+    def coi_changed(self, paper_id: int, reviewer_id: int, is_open: bool) -> None:
+        """Gọi SAU khi commit COI: cập nhật local và báo cho các replica khác."""
+        self._apply_coi(paper_id, reviewer_id, is_open)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.publish(CHANNEL, json.dumps({
+                "src": self._instance_id,
+                "paper_id": paper_id,
+                "reviewer_id": reviewer_id,
+                "open": is_open,
+            }))
+        except Exception as e:
+            # Replica khác sẽ tự làm mới khi hết TTL
+            logger.warning(f"[AccessIndex] Publish failed: {e}")
+
+    # ---------------- Assignment ownership ----------------
+    def assignment_owner(self, db: Session, assignment_id: int) -> Optional[Tuple[int, int]]:
+        """(reviewer_id, paper_id) của assignment, None nếu không tồn tại."""
+        with self._lock:
+            owner = self._owners.get(assignment_id)
+            if owner is not None:
+                self._owners.move_to_end(assignment_id)
+                return owner
+
+        A = models.Assignment
+        row = db.query(A.reviewer_id, A.paper_id).filter(A.id == assignment_id).first()
+        if row is None:
+            return None
+        self.remember_assignment(assignment_id, row[0], row[1])
+        return (row[0], row[1])
+
+    def remember_assignment(self, assignment_id: int, reviewer_id: int, paper_id: int) -> None:
+        with self._lock:
+            self._owners[assignment_id] = (reviewer_id, paper_id)
+            self._owners.move_to_end(assignment_id)
+            while len(self._owners) > OWNER_CACHE_SIZE:
+                self._owners.popitem(last=False)
+
+    # ---------------- Redis pub/sub ----------------
+    def _get_redis(self):
+        if not settings.REDIS_URL:
+            return None
+        if self._redis is None:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            except Exception as e:
+                logger.warning(f"[AccessIndex] Redis unavailable: {e}")
+                return None
+        return self._redis
+
+    def start_listener(self) -> None:
+        if self._listener is not None or self._get_redis() is None:
+            return
+        self._listener = threading.Thread(target=self._listen, name="coi-index-listener", daemon=True)
+        self._listener.start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                # Có thể đã lỡ message trong lúc mất kết nối -> bỏ toàn bộ COI đã nạp
+                with self._lock:
+                    self._coi.clear()
+                for message in pubsub.listen():
+                    data = json.loads(message["data"])
+                    if data.get("src") == self._instance_id:
+                        continue
+                    self._apply_coi(int(data["paper_id"]), int(data["reviewer_id"]), bool(data["open"]))
+            except Exception as e:
+                logger.warning(f"[AccessIndex] Listener error, reconnecting in 5s: {e}")
+                time.sleep(5)
+
+
+access_index = AccessIndex()
@@ -0,0 +1,186 @@
+# backend/review-service/src/services/assignment_solver.py
+"""
+Phân công reviewer tự động.
+
+Bài toán: chọn các cặp (paper, reviewer) sao cho
+- mỗi paper nhận tối đa `need[p]` reviewer (thường là reviewers_per_paper trừ số đã có),
+- mỗi reviewer nhận tối đa `capacity[r]` bài,
+- không dùng cặp bị cấm (COI đang mở, bid CONFLICT/NO, cặp đã được phân công),
+- tổng độ phù hợp (affinity) lớn nhất.
+
+Đây là bài toán luồng chi phí nhỏ nhất trên đồ thị hai phía (transportation problem).
+Ma trận ràng buộc là totally unimodular nên nghiệm LP tại đỉnh luôn nguyên -> giải bằng
+HiGHS (scipy.optimize.linprog) trên ma trận thưa, chỉ với các cạnh ứng viên, thay vì
+mở rộng ra ma trận vuông cho thuật toán Hungarian.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+# Điểm thưởng cho mỗi cạnh được chọn: lớn hơn hẳn affinity tối đa (~3) để solver
+# ưu tiên phủ đủ reviewer cho các bài rồi mới tối ưu độ phù hợp
+COVERAGE_BONUS = 10.0
+
+BID_WEIGHTS = {"YES": 1.0, "MAYBE": 0.5}
+
+# Bài toán nhỏ: mọi cặp không bị cấm đều là ứng viên (affinity 0 nếu không có tín hiệu)
+DENSE_PAIR_LIMIT = 250_000
+
+
+@dataclass
+class SolverInput:
+    paper_ids: Sequence[int]
+    reviewer_ids: Sequence[int]
+    need: Dict[int, int]                      # paper_id -> số reviewer còn thiếu
+    capacity: Dict[int, int]                  # reviewer_id -> số bài còn nhận được
+    bids: Iterable[Tuple[int, int, str]] = ()  # (paper_id, reviewer_id, bid_type)
+    forbidden: Iterable[Tuple[int, int]] = ()  # (paper_id, reviewer_id)
+    paper_topics: Dict[int, List[int]] = field(default_factory=dict)
+    reviewer_topics: Dict[int, List[int]] = field(default_factory=dict)
+    similarity: Iterable[Tuple[int, int, float]] = ()  # (paper_id, reviewer_id, score 0..1)
+    topic_weight: float = 1.0
+    similarity_weight: float = 1.0
+    max_candidates_per_paper: int = 50
+
+
+@dataclass
+class SolverResult:
+    pairs: List[Tuple[int, int, float]]       # (paper_id, reviewer_id, affinity)
+    unfilled: Dict[int, int]                  # paper_id -> số reviewer còn thiếu sau khi giải
+    candidate_edges: int
+    solve_ms: int
+
+
+def _affinity_matrix(inp: SolverInput, p_index: Dict[int, int], r_index: Dict[int, int]) -> sparse.csr_matrix:
+    """Cộng dồn bid + topic overlap (Jaccard) + similarity thành ma trận thưa P x R."""
+    shape = (len(p_index), len(r_index))
+    rows, cols, vals = [], [], []
+
+    for paper_id, reviewer_id, bid_type in inp.bids:
+        w = BID_WEIGHTS.get(bid_type)
+        if w and paper_id in p_index and reviewer_id in r_index:
+            rows.append(p_index[paper_id]); cols.append(r_index[reviewer_id]); vals.append(w)
+
+    for paper_id, reviewer_id, score in inp.similarity:
+        if score and paper_id in p_index and reviewer_id in r_index:
+            rows.append(p_index[paper_id]); cols.append(r_index[reviewer_id])
+            vals.append(inp.similarity_weight * min(max(float(score), 0.0), 1.0))
+
+    affinity = sparse.coo_matrix((vals, (rows, cols)), shape=shape, dtype=np.float64).tocsr()
+
+    if inp.topic_weight and inp.paper_topics and inp.reviewer_topics:
+        affinity = affinity + inp.topic_weight * _topic_jaccard(inp, p_index, r_index)
+
+    return affinity.tocsr()
+
+
+def _incidence(owner_topics: Dict[int, List[int]], index: Dict[int, int], t_index: Dict[int, int]) -> sparse.csr_matrix:
+    rows, cols = [], []
+    for owner_id, topics in owner_topics.items():
+        if owner_id not in index:
+            continue
+        for t in set(topics or []):
+            rows.append(index[owner_id]); cols.append(t_index[t])
+    data = np.ones(len(rows), dtype=np.float64)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(index), len(t_index)))
+
+
+def _topic_jaccard(inp: SolverInput, p_index: Dict[int, int], r_index: Dict[int, int]) -> sparse.csr_matrix:
+    all_topics = {t for ts in inp.paper_topics.values() for t in (ts or [])}
+    all_topics |= {t for ts in inp.reviewer_topics.values() for t in (ts or [])}
+    t_index = {t: i for i, t in enumerate(sorted(all_topics))}
+
+    pt = _incidence(inp.paper_topics, p_index, t_index)
+    rt = _incidence(inp.reviewer_topics, r_index, t_index)
+
+    # Giao = tích thưa; hợp = |P| + |R| - giao, chỉ tính trên các ô khác 0
+    inter = (pt @ rt.T).tocoo()
+    p_size = np.asarray(pt.sum(axis=1)).ravel()
+    r_size = np.asarray(rt.sum(axis=1)).ravel()
+    union = p_size[inter.row] + r_size[inter.col] - inter.data
+    return sparse.csr_matrix((inter.data / union, (inter.row, inter.col)), shape=inter.shape)
+
+
+def solve(inp: SolverInput) -> SolverResult:
+    started = time.perf_counter()
+
+    paper_ids = [p for p in dict.fromkeys(inp.paper_ids) if inp.need.get(p, 0) > 0]
+    reviewer_ids = [r for r in dict.fromkeys(inp.reviewer_ids) if inp.capacity.get(r, 0) > 0]
+    P, R = len(paper_ids), len(reviewer_ids)
+    if P == 0 or R == 0:
+        return SolverResult([], {p: inp.need.get(p, 0) for p in paper_ids}, 0, 0)
+
+    p_index = {p: i for i, p in enumerate(paper_ids)}
+    r_index = {r: i for i, r in enumerate(reviewer_ids)}
+    need = np.array([inp.need[p] for p in paper_ids], dtype=np.float64)
+    cap = np.array([inp.capacity[r] for r in reviewer_ids], dtype=np.float64)
+
+    affinity = _affinity_matrix(inp, p_index, r_index).tocoo()
+    rows = affinity.row.astype(np.int64)
+    keys = rows * R + affinity.col
+    scores = affinity.data
+
+    forbidden = np.array(
+        [p_index[p] * R + r_index[r] for p, r in inp.forbidden if p in p_index and r in r_index],
+        dtype=np.int64,
+    )
+    allowed = ~np.isin(keys, forbidden)
+    rows, keys, scores = rows[allowed], keys[allowed], scores[allowed]
+
+    # Mỗi paper chỉ giữ top-K ứng viên theo affinity -> số cạnh ~ P*K thay vì P*R
+    if inp.max_candidates_per_paper and keys.size:
+        order = np.lexsort((-scores, rows))
+        rows, keys, scores = rows[order], keys[order], scores[order]
+        first = np.searchsorted(rows, rows, side="left")
+        keep = (np.arange(rows.size) - first) < inp.max_candidates_per_paper
+        rows, keys, scores = rows[keep], keys[keep], scores[keep]
+
+    # Bài thiếu ứng viên có affinity > 0: thêm cạnh affinity 0 tới mọi reviewer còn lại
+    # để vẫn phủ đủ (chỉ với các bài này, ma trận vẫn thưa)
+    if P * R <= DENSE_PAIR_LIMIT:
+        short = np.arange(P)
+    else:
+        short = np.flatnonzero(np.bincount(rows, minlength=P) < need)
+    if short.size:
+        fill = (short[:, None].astype(np.int64) * R + np.arange(R, dtype=np.int64)[None, :]).ravel()
+        fill = fill[~np.isin(fill, keys) & ~np.isin(fill, forbidden)]
+        keys = np.concatenate([keys, fill])
+        scores = np.concatenate([scores, np.zeros(fill.size)])
+
+    rows, cols = keys // R, keys % R
+    n = keys.size
+    if n == 0:
+        return SolverResult([], {p: inp.need[p] for p in paper_ids}, 0, int((time.perf_counter() - started) * 1000))
+
+    # Ràng buộc: P dòng cho paper (<= need), R dòng cho reviewer (<= capacity)
+    edge_idx = np.arange(n)
+    a_ub = sparse.csr_matrix(
+        (np.ones(2 * n), (np.concatenate([rows, P + cols]), np.concatenate([edge_idx, edge_idx]))),
+        shape=(P + R, n),
+    )
+    b_ub = np.concatenate([need, cap])
+
+    res = linprog(
+        c=-(COVERAGE_BONUS + scores),
+        A_ub=a_ub,
+        b_ub=b_ub,
+        bounds=(0, 1),
+        method="highs-ds",  # simplex -> nghiệm đỉnh (nguyên)
+    )
+    if res.status != 0 or res.x is None:
+        raise RuntimeError(f"Assignment solver failed: {res.message}")
+
+    chosen = np.flatnonzero(res.x > 0.5)
+    pairs = [
+        (paper_ids[rows[i]], reviewer_ids[cols[i]], round(float(scores[i]), 4))
+        for i in chosen
+    ]
+
+    got = np.bincount(rows[chosen], minlength=P)
+    unfilled = {paper_ids[i]: int(need[i] - got[i]) for i in np.flatnonzero(got < need)}
+
+    return SolverResult(pairs, unfilled, int(n), int((time.perf_counter() - started) * 1000))
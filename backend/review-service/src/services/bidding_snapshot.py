@@ -0,0 +1,91 @@
+# backend/review-service/src/services/bidding_snapshot.py
+"""
+Snapshot danh sách bài mở bidding theo hội nghị, dùng chung cho mọi reviewer trong process.
+
+- Sau BIDDING_SNAPSHOT_TTL giây snapshot được revalidate bằng GET có If-None-Match tới
+  submission-service; không đổi -> 304, không tải/parse lại danh sách.
+- Mỗi hội nghị có một lock: nhiều reviewer cùng lúc chỉ gây một lần gọi sang submission-service.
+- submission-service lỗi: tiếp tục phục vụ snapshot cũ (nếu có).
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.config import SUBMISSION_SERVICE_URL
+
+SNAPSHOT_TTL_SECONDS = float(os.getenv("BIDDING_SNAPSHOT_TTL", "30"))
+INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
+
+
+@dataclass
+class Snapshot:
+    papers: List[dict] = field(default_factory=list)   # sắp theo id tăng dần
+    ids: List[int] = field(default_factory=list)        # để bisect khi phân trang
+    version: str = ""                                   # ETag của submission-service
+    checked_at: float = 0.0
+
+
+class BiddingSnapshotStore:
+    def __init__(self):
+        self._snapshots: Dict[int, Snapshot] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    def invalidate(self, conference_id: Optional[int] = None) -> None:
+        key = conference_id or 0
+        if key in self._snapshots:
+            self._snapshots[key].checked_at = 0.0
+
+    async def get(self, conference_id: Optional[int]) -> Snapshot:
+        key = conference_id or 0
+        snap = self._snapshots.get(key)
+        if snap and time.monotonic() - snap.checked_at < SNAPSHOT_TTL_SECONDS:
+            return snap
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            snap = self._snapshots.get(key)
+            if snap and time.monotonic() - snap.checked_at < SNAPSHOT_TTL_SECONDS:
+                return snap  # request khác vừa làm mới xong
+            try:
+                snap = await self._refresh(conference_id, snap)
+            except Exception as e:
+                if snap is None:
+                    raise
+                print(f"[Review Service] Bidding snapshot refresh failed, serving stale: {e}")
+                snap.checked_at = time.monotonic()
+            self._snapshots[key] = snap
+            return snap
+
+    async def _refresh(self, conference_id: Optional[int], current: Optional[Snapshot]) -> Snapshot:
+        headers = {"X-Internal-Key": INTERNAL_KEY}
+        if current and current.version:
+            headers["If-None-Match"] = current.version
+        params = {"conference_id": conference_id} if conference_id else None
+
+        async with httpx.AsyncClient(timeout=15.0) as client:
+            resp = await client.get(
+                f"{SUBMISSION_SERVICE_URL.rstrip('/')}/submissions/internal/open-for-bidding",
+                params=params,
+                headers=headers,
+            )
+
+        if resp.status_code == 304 and current is not None:
+            current.checked_at = time.monotonic()
+            return current
+        if resp.status_code != 200:
+            raise RuntimeError(f"open-for-bidding snapshot failed: {resp.status_code} - {resp.text}")
+
+        papers = sorted(resp.json() or [], key=lambda p: p["id"])
+        return Snapshot(
+            papers=papers,
+            ids=[p["id"] for p in papers],
+            version=resp.headers.get("etag", ""),
+            checked_at=time.monotonic(),
+        )
+
+
+bidding_snapshots = BiddingSnapshotStore()
@@ -0,0 +1,260 @@
+# backend/review-service/src/services/calibration.py
+"""
+Hiệu chỉnh điểm reviewer (reviewer khắt khe / dễ dãi) cho một hội nghị.
+
+Điểm của một review = trung bình có trọng số các ReviewCriteria.grade (weight mặc định 1),
+nếu review không có tiêu chí thì dùng final_score. Dữ liệu giữ ở dạng thưa
+(reviewer_idx, paper_idx, score) và mọi phép gom nhóm dùng np.bincount -> không có
+vòng lặp Python theo review.
+
+- z-score: chuẩn hoá theo trung bình/độ lệch chuẩn của từng reviewer rồi đưa về thang điểm chung.
+- least squares: mô hình s[r,p] = bias[r] + scale[r] * q[p], giải xen kẽ (ALS) có ridge
+  kéo bias về 0 và scale về 1 để reviewer ít review không bị hiệu chỉnh quá tay.
+- agreement: Krippendorff alpha (thang interval), độ lệch chuẩn trung bình theo bài và
+  tương quan của từng reviewer với đồng thuận.
+
+Kết quả được cache theo (conference_id, phiên bản dữ liệu); phiên bản lấy từ
+paper_review_stats (cập nhật cùng transaction với mọi thay đổi review) nên review mới
+tự làm mất hiệu lực cache, kể cả giữa các replica.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from src import models
+
+ALS_ITERATIONS = 25
+RIDGE = 1.0          # số "review ảo" kéo bias -> 0, scale -> 1
+MIN_STD = 1e-6
+
+RANK_METHODS = ("least_squares", "zscore", "raw")
+
+_cache: Dict[int, Tuple[tuple, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+# ---------------- Tính toán ----------------
+def _group_mean(values: np.ndarray, idx: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    count = np.bincount(idx, minlength=size).astype(np.float64)
+    total = np.bincount(idx, weights=values, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / count, np.nan), count
+
+
+def _group_std(values: np.ndarray, idx: np.ndarray, size: int, mean: np.ndarray) -> np.ndarray:
+    count = np.bincount(idx, minlength=size).astype(np.float64)
+    sq = np.bincount(idx, weights=(values - mean[idx]) ** 2, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.sqrt(np.where(count > 0, sq / count, np.nan))
+
+
+def _krippendorff_alpha(scores: np.ndarray, p_idx: np.ndarray, n_papers: int) -> Optional[float]:
+    m = np.bincount(p_idx, minlength=n_papers).astype(np.float64)
+    pairable = m[p_idx] >= 2
+    if pairable.sum() < 2:
+        return None
+    x, pi = scores[pairable], p_idx[pairable]
+    m_u = np.bincount(pi, minlength=n_papers).astype(np.float64)
+    s1 = np.bincount(pi, weights=x, minlength=n_papers)
+    s2 = np.bincount(pi, weights=x * x, minlength=n_papers)
+    units = m_u >= 2
+    # Σ_{i≠j} (xi - xj)^2 = 2 (m Σx² - (Σx)²)
+    d_within = 2.0 * (m_u[units] * s2[units] - s1[units] ** 2) / (m_u[units] - 1)
+    n = x.size
+    d_o = d_within.sum() / n
+    d_e = 2.0 * (n * (x * x).sum() - x.sum() ** 2) / (n * (n - 1))
+    if d_e <= 0:
+        return 1.0
+    return float(1.0 - d_o / d_e)
+
+
+def calibrate(r_idx: np.ndarray, p_idx: np.ndarray, scores: np.ndarray, n_reviewers: int, n_papers: int) -> dict:
+    """Đầu vào dạng thưa (mỗi phần tử là một review). Trả về mảng theo paper/reviewer."""
+    g_mean = float(scores.mean())
+    g_std = float(scores.std()) or 1.0
+
+    raw_mean, p_count = _group_mean(scores, p_idx, n_papers)
+
+    # ---- z-score theo reviewer ----
+    r_mean, r_count = _group_mean(scores, r_idx, n_reviewers)
+    r_std = _group_std(scores, r_idx, n_reviewers, r_mean)
+    # Reviewer chỉ có 1 review hoặc chấm đồng loạt một mức: không chia cho std
+    r_std_safe = np.where((r_count >= 2) & (r_std > MIN_STD), r_std, g_std)
+    z = (scores - r_mean[r_idx]) / r_std_safe[r_idx]
+    z_mean, _ = _group_mean(g_mean + g_std * z, p_idx, n_papers)
+
+    # ---- least squares bias/scale (ALS + ridge) ----
+    q = np.where(np.isnan(raw_mean), g_mean, raw_mean) - g_mean
+    y = scores - g_mean
+    bias = np.zeros(n_reviewers)
+    scale = np.ones(n_reviewers)
+    for _ in range(ALS_ITERATIONS):
+        qi = q[p_idx]
+        # Hồi quy y ~ bias + scale * q cho từng reviewer (chuẩn tắc 2x2, có ridge)
+        sn = r_count + RIDGE
+        sq = np.bincount(r_idx, weights=qi, minlength=n_reviewers)
+        sqq = np.bincount(r_idx, weights=qi * qi, minlength=n_reviewers) + RIDGE
+        sy = np.bincount(r_idx, weights=y, minlength=n_reviewers)
+        sqy = np.bincount(r_idx, weights=qi * y, minlength=n_reviewers) + RIDGE * 1.0
+        det = sn * sqq - sq * sq
+        det = np.where(np.abs(det) < MIN_STD, MIN_STD, det)
+        bias = (sqq * sy - sq * sqy) / det
+        scale = (sn * sqy - sq * sy) / det
+        scale = np.clip(scale, 0.1, 10.0)
+
+        # Chất lượng bài: q[p] = Σ scale (y - bias) / Σ scale² (có ridge về 0)
+        bi, si = bias[r_idx], scale[r_idx]
+        num = np.bincount(p_idx, weights=si * (y - bi), minlength=n_papers)
+        den = np.bincount(p_idx, weights=si * si, minlength=n_papers) + 1e-3
+        q = num / den
+        q = q - q[p_count > 0].mean()  # cố định gốc, tránh trôi giữa bias và q
+
+    ls_quality = np.where(p_count > 0, g_mean + q, np.nan)
+
+    # ---- agreement ----
+    p_std = _group_std(scores, p_idx, n_papers, raw_mean)
+    multi = p_count >= 2
+    consensus = raw_mean[p_idx]
+    dx = scores - r_mean[r_idx]
+    cons_mean, _ = _group_mean(consensus, r_idx, n_reviewers)
+    dc = consensus - cons_mean[r_idx]
+    cov = np.bincount(r_idx, weights=dx * dc, minlength=n_reviewers)
+    vx = np.bincount(r_idx, weights=dx * dx, minlength=n_reviewers)
+    vc = np.bincount(r_idx, weights=dc * dc, minlength=n_reviewers)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.where((vx > MIN_STD) & (vc > MIN_STD), cov / np.sqrt(vx * vc), np.nan)
+
+    return {
+        "raw_mean": raw_mean,
+        "zscore_mean": z_mean,
+        "ls_quality": ls_quality,
+        "paper_count": p_count,
+        "paper_std": p_std,
+        "reviewer_count": r_count,
+        "reviewer_mean": r_mean,
+        "reviewer_std": r_std,
+        "reviewer_bias": bias,
+        "reviewer_scale": scale,
+        "reviewer_corr": corr,
+        "agreement": {
+            "krippendorff_alpha": _krippendorff_alpha(scores, p_idx, n_papers),
+            "mean_paper_std": float(np.nanmean(p_std[multi])) if multi.any() else None,
+            "papers_with_multiple_reviews": int(multi.sum()),
+        },
+        "global_mean": g_mean,
+        "global_std": g_std,
+    }
+
+
+# ---------------- Dữ liệu ----------------
+def _submitted():
+    R = models.Review
+    return or_(R.is_draft == False, R.submitted_at.isnot(None))  # noqa: E712
+
+
+def data_version(db: Session, conference_id: int) -> tuple:
+    S = models.PaperReviewStats
+    row = (
+        db.query(func.count(S.paper_id), func.max(S.updated_at), func.sum(S.review_count))
+        .filter(S.conference_id == conference_id)
+        .one()
+    )
+    return tuple(row)
+
+
+def load_scores(db: Session, conference_id: int):
+    """(reviewer_id, paper_id, score) cho mọi review đã nộp của các bài thuộc hội nghị."""
+    A, R, RC, S = models.Assignment, models.Review, models.ReviewCriteria, models.PaperReviewStats
+    paper_ids = db.query(S.paper_id).filter(S.conference_id == conference_id)
+
+    weight = func.coalesce(RC.weight, 1.0)
+    criteria = dict(
+        db.query(RC.review_id, func.sum(RC.grade * weight) / func.sum(weight))
+        .join(R, R.id == RC.review_id)
+        .join(A, A.id == R.assignment_id)
+        .filter(A.paper_id.in_(paper_ids), _submitted(), RC.grade.isnot(None))
+        .group_by(RC.review_id)
+        .all()
+    )
+    rows = (
+        db.query(R.id, A.reviewer_id, A.paper_id, R.final_score)
+        .join(A, A.id == R.assignment_id)
+        .filter(A.paper_id.in_(paper_ids), _submitted())
+        .all()
+    )
+    out = []
+    for review_id, reviewer_id, paper_id, final_score in rows:
+        score = criteria.get(review_id, final_score)
+        if score is not None:
+            out.append((reviewer_id, paper_id, float(score)))
+    return out
+
+
+def _nan_to_none(x) -> Optional[float]:
+    x = float(x)
+    return None if np.isnan(x) else round(x, 4)
+
+
+def build_report(conference_id: int, triples) -> dict:
+    started = time.perf_counter()
+    if not triples:
+        return {
+            "conference_id": conference_id, "review_count": 0, "papers": [], "reviewers": [],
+            "agreement": {"krippendorff_alpha": None, "mean_paper_std": None, "papers_with_multiple_reviews": 0},
+            "compute_ms": 0,
+        }
+
+    arr = np.array(triples, dtype=np.float64)
+    reviewer_ids, r_idx = np.unique(arr[:, 0].astype(np.int64), return_inverse=True)
+    paper_ids, p_idx = np.unique(arr[:, 1].astype(np.int64), return_inverse=True)
+    res = calibrate(r_idx, p_idx, arr[:, 2], reviewer_ids.size, paper_ids.size)
+
+    papers = [
+        {
+            "paper_id": int(pid),
+            "review_count": int(res["paper_count"][i]),
+            "raw_mean": _nan_to_none(res["raw_mean"][i]),
+            "zscore_mean": _nan_to_none(res["zscore_mean"][i]),
+            "ls_quality": _nan_to_none(res["ls_quality"][i]),
+            "score_std": _nan_to_none(res["paper_std"][i]),
+        }
+        for i, pid in enumerate(paper_ids)
+    ]
+    reviewers = [
+        {
+            "reviewer_id": int(rid),
+            "review_count": int(res["reviewer_count"][i]),
+            "mean": _nan_to_none(res["reviewer_mean"][i]),
+            "std": _nan_to_none(res["reviewer_std"][i]),
+            "bias": _nan_to_none(res["reviewer_bias"][i]),
+            "scale": _nan_to_none(res["reviewer_scale"][i]),
+            "consensus_corr": _nan_to_none(res["reviewer_corr"][i]),
+        }
+        for i, rid in enumerate(reviewer_ids)
+    ]
+    return {
+        "conference_id": conference_id,
+        "review_count": int(arr.shape[0]),
+        "papers": papers,
+        "reviewers": reviewers,
+        "agreement": res["agreement"],
+        "compute_ms": int((time.perf_counter() - started) * 1000),
+    }
+
+
+def get_calibration(db: Session, conference_id: int) -> Tuple[dict, bool]:
+    """(report, cached?)"""
+    version = data_version(db, conference_id)
+    with _cache_lock:
+        hit = _cache.get(conference_id)
+    if hit and hit[0] == version:
+        return hit[1], True
+
+    report = build_report(conference_id, load_scores(db, conference_id))
+    with _cache_lock:
+        _cache[conference_id] = (version, report)
+    return report, False
@@ -0,0 +1,228 @@
+# backend/review-service/src/services/deadlines.py
+"""
+Hạn chót của assignment: truy vấn quá hạn / sắp đến hạn và sweeper sinh job nhắc hạn.
+
+- Truy vấn dùng index (status, due_date) / (conference_id, status, due_date), phân trang
+  keyset theo (due_date, id) -> không quét toàn bảng, không dùng OFFSET.
+- Sweeper chạy định kỳ trên mọi replica nhưng chỉ replica giữ khoá Redis
+  (services/locks.py) mới làm việc.
+- Mỗi lượt: duyệt assignment đến hạn theo lô DEADLINE_SWEEP_BATCH dòng (chỉ lấy cột cần
+  thiết), sinh assignment_reminders còn thiếu (unique theo assignment/loại/due_date), commit
+  theo lô; sau đó gửi các job chưa gửi qua /api/notifications/batch, cũng theo lô.
+  Bộ nhớ không phụ thuộc số assignment.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+
+from src import models
+from src.services import locks
+from src.services.notifier import send_notifications_batch
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = (models.AssignmentStatus.INVITED, models.AssignmentStatus.ACCEPTED)
+
+REMIND_BEFORE_HOURS = float(os.getenv("DEADLINE_REMIND_BEFORE_HOURS", "48"))
+SWEEP_INTERVAL_SECONDS = float(os.getenv("DEADLINE_SWEEP_INTERVAL", "300"))
+SWEEP_BATCH_SIZE = int(os.getenv("DEADLINE_SWEEP_BATCH", "500"))
+LOCK_KEY = "review-service:deadline-sweeper:lock"
+LOCK_TTL_MS = int(os.getenv("DEADLINE_SWEEP_LOCK_MS", "600000"))
+
+DUE_SOON = "DUE_SOON"
+OVERDUE = "OVERDUE"
+
+
+# ---------------- Truy vấn ----------------
+def due_query(
+    db: Session,
+    due_after: Optional[datetime],
+    due_before: datetime,
+    conference_id: Optional[int] = None,
+    reviewer_id: Optional[int] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+    columns=None,
+):
+    """Assignment chưa xong có due_date trong (due_after, due_before], sắp theo (due_date, id)."""
+    A = models.Assignment
+    q = db.query(*columns) if columns is not None else db.query(A)
+    q = q.filter(A.status.in_(PENDING_STATUSES), A.due_date.isnot(None), A.due_date <= due_before)
+    if due_after is not None:
+        q = q.filter(A.due_date > due_after)
+    if conference_id is not None:
+        q = q.filter(A.conference_id == conference_id)
+    if reviewer_id is not None:
+        q = q.filter(A.reviewer_id == reviewer_id)
+    if cursor is not None:
+        due, last_id = cursor
+        q = q.filter(or_(A.due_date > due, and_(A.due_date == due, A.id > last_id)))
+    return q.order_by(A.due_date.asc(), A.id.asc())
+
+
+def window(state: str, now: datetime, within_hours: float) -> Tuple[Optional[datetime], datetime]:
+    if state == OVERDUE:
+        return None, now
+    return now, now + timedelta(hours=within_hours)
+
+
+def encode_cursor(due: datetime, assignment_id: int) -> str:
+    return f"{due.isoformat()}_{assignment_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    due, _, last_id = cursor.rpartition("_")
+    return datetime.fromisoformat(due), int(last_id)
+
+
+def iter_batches(db: Session, due_after, due_before, batch_size: int = SWEEP_BATCH_SIZE) -> Iterator[list]:
+    A = models.Assignment
+    cols = (A.id, A.reviewer_id, A.paper_id, A.due_date)
+    cursor = None
+    while True:
+        rows = due_query(db, due_after, due_before, cursor=cursor, columns=cols).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        cursor = (rows[-1].due_date, rows[-1].id)
+
+
+# ---------------- Sinh & gửi job nhắc ----------------
+def materialize_reminders(db: Session, now: datetime) -> int:
+    R = models.AssignmentReminder
+    created = 0
+    for kind, (due_after, due_before) in (
+        (OVERDUE, window(OVERDUE, now, 0)),
+        (DUE_SOON, window(DUE_SOON, now, REMIND_BEFORE_HOURS)),
+    ):
+        for rows in iter_batches(db, due_after, due_before):
+            existing = {
+                (a, d) for a, d in db.query(R.assignment_id, R.due_date)
+                .filter(R.kind == kind, R.assignment_id.in_([r.id for r in rows]))
+                .all()
+            }
+            fresh = [
+                {
+                    "assignment_id": r.id,
+                    "reviewer_id": r.reviewer_id,
+                    "paper_id": r.paper_id,
+                    "kind": kind,
+                    "due_date": r.due_date,
+                    "created_at": now,
+                }
+                for r in rows
+                if (r.id, r.due_date) not in existing
+            ]
+            if fresh:
+                db.execute(insert(R), fresh)
+                created += len(fresh)
+            db.commit()
+    return created
+
+
+def _reminder_text(r) -> Tuple[str, str]:
+    due = r.due_date.strftime("%d/%m/%Y %H:%M")
+    if r.kind == OVERDUE:
+        return (
+            f"Quá hạn review (Bài #{r.paper_id})",
+            f"Bài review cho bài báo #{r.paper_id} đã quá hạn từ {due} (UTC). Vui lòng hoàn thành hoặc xin gia hạn.",
+        )
+    return (
+        f"Sắp đến hạn review (Bài #{r.paper_id})",
+        f"Bài review cho bài báo #{r.paper_id} sẽ hết hạn lúc {due} (UTC).",
+    )
+
+
+def dispatch_reminders(db: Session, now: datetime, batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """
+    Gửi job chưa gửi theo lô; lô lỗi được giữ lại cho lượt sau. Job đã lỗi thời (assignment
+    đã xong hoặc được gia hạn từ lúc sinh job) được đánh dấu xử lý mà không gửi.
+    """
+    A, R = models.Assignment, models.AssignmentReminder
+    sent = 0
+    last_id = 0
+    while True:
+        batch = (
+            db.query(R.id, R.reviewer_id, R.paper_id, R.kind, R.due_date, A.status, A.due_date.label("current_due"))
+            .join(A, A.id == R.assignment_id)
+            .filter(R.sent_at.is_(None), R.id > last_id)
+            .order_by(R.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return sent
+        last_id = batch[-1].id
+
+        items = []
+        for r in batch:
+            if r.status not in PENDING_STATUSES or r.current_due != r.due_date:
+                continue
+            subject, body = _reminder_text(r)
+            items.append({"user_id": r.reviewer_id, "title": subject, "body": body})
+        if items and not send_notifications_batch(items):
+            return sent
+
+        db.query(R).filter(R.id.in_([r.id for r in batch])).update(
+            {R.sent_at: now}, synchronize_session=False
+        )
+        db.commit()
+        sent += len(items)
+
+
+# ---------------- Sweeper ----------------
+class DeadlineSweeper:
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="deadline-sweeper", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.warning(f"[DeadlineSweeper] Sweep failed: {e}")
+            time.sleep(SWEEP_INTERVAL_SECONDS)
+
+    def run_once(self) -> Optional[dict]:
+        """Một lượt quét; None nếu replica khác đang giữ khoá."""
+        try:
+            with locks.redis_lock(LOCK_KEY, LOCK_TTL_MS) as lock:
+                return self._sweep(lock)
+        except locks.LockBusy:
+            return None
+        except locks.LockUnavailable as e:
+            # Không lấy được khoá thì bỏ lượt: unique constraint vẫn chặn job trùng
+            logger.warning(f"[DeadlineSweeper] Lock unavailable, skipping sweep: {e}")
+            return None
+
+    def _sweep(self, lock: locks.HeldLock) -> dict:
+        from src.database import SessionLocal
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            created = materialize_reminders(db, now)
+            lock.extend()
+            sent = dispatch_reminders(db, now)
+        finally:
+            db.close()
+
+        result = {"created": created, "sent": sent, "elapsed_ms": int((time.perf_counter() - started) * 1000)}
+        if created or sent:
+            logger.info(f"[DeadlineSweeper] {result}")
+        return result
+
+
+deadline_sweeper = DeadlineSweeper()
@@ -0,0 +1,182 @@
+# backend/review-service/src/services/decision_engine.py
+"""
+Quyết định accept/reject hàng loạt cho một hội nghị.
+
+- Danh sách bài (track, trạng thái, người nộp) lấy bằng MỘT request nội bộ tới submission-service.
+- Điểm lấy từ read model paper_review_stats (mean/weighted) hoặc từ bản hiệu chỉnh reviewer
+  (zscore_mean/ls_quality, xem calibration.py) — không đọc lại từng review.
+- compute_decisions() là hàm thuần: một lượt gom theo track + sắp xếp, dùng chung cho xem
+  trước và xác nhận nên kết quả xác nhận đúng bằng kết quả đã xem trước.
+- Xác nhận: MỘT request PUT /submissions/internal/decisions (một transaction bên
+  submission-service) và MỘT job thông báo hàng loạt.
+"""
+import math
+import os
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy.orm import Session
+
+from src import models
+from src.config import SUBMISSION_SERVICE_URL
+from src.services import calibration
+
+INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
+
+ACCEPTED = "ACCEPTED"
+REJECTED = "REJECTED"
+UNDECIDED = "UNDECIDED"
+
+STATS_SCORE_FIELDS = ("weighted_score", "mean_score")
+CALIBRATED_SCORE_FIELDS = ("ls_quality", "zscore_mean")
+SCORE_FIELDS = STATS_SCORE_FIELDS + CALIBRATED_SCORE_FIELDS
+
+
+class PolicyError(ValueError):
+    pass
+
+
+def validate_policy(policy) -> None:
+    if policy.score_field not in SCORE_FIELDS:
+        raise PolicyError(f"Invalid score_field. Allowed: {list(SCORE_FIELDS)}")
+    if policy.mode == "threshold" and policy.threshold is None:
+        raise PolicyError("threshold is required for mode=threshold")
+    if policy.mode == "top_k_per_track" and policy.top_k is None:
+        raise PolicyError("top_k is required for mode=top_k_per_track")
+    bad = {p: d for p, d in policy.overrides.items() if d not in (ACCEPTED, REJECTED)}
+    if bad:
+        raise PolicyError(f"Overrides must be ACCEPTED or REJECTED: {bad}")
+
+
+# ---------------- submission-service ----------------
+def _headers() -> dict:
+    return {"X-Internal-Key": INTERNAL_KEY}
+
+
+async def fetch_candidates(conference_id: int) -> List[dict]:
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=60.0)) as client:
+        resp = await client.get(
+            f"{SUBMISSION_SERVICE_URL.rstrip('/')}/submissions/internal/decision-candidates",
+            params={"conference_id": conference_id},
+            headers=_headers(),
+        )
+    if resp.status_code != 200:
+        raise RuntimeError(f"decision-candidates failed: {resp.status_code} - {resp.text}")
+    return resp.json() or []
+
+
+async def push_decisions(conference_id: int, items: List[dict]) -> dict:
+    async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=120.0)) as client:
+        resp = await client.put(
+            f"{SUBMISSION_SERVICE_URL.rstrip('/')}/submissions/internal/decisions",
+            json={"conference_id": conference_id, "items": items},
+            headers=_headers(),
+        )
+    if resp.status_code != 200:
+        raise RuntimeError(f"batch decisions failed: {resp.status_code} - {resp.text}")
+    return resp.json()
+
+
+# ---------------- Điểm ----------------
+def load_scores(db: Session, conference_id: int, paper_ids: List[int], score_field: str) -> Dict[int, tuple]:
+    """{paper_id: (score, review_count)}."""
+    S = models.PaperReviewStats
+    rows = db.query(S).filter(S.paper_id.in_(paper_ids)).all() if paper_ids else []
+
+    # Danh sách từ submission-service cho biết luôn hội nghị của bài: điền cho stats còn thiếu
+    missing = [{"paper_id": r.paper_id, "conference_id": conference_id} for r in rows if r.conference_id is None]
+    if missing:
+        db.bulk_update_mappings(S, missing)
+        db.commit()
+
+    if score_field in STATS_SCORE_FIELDS:
+        return {r.paper_id: (getattr(r, score_field), r.review_count or 0) for r in rows}
+
+    report, _ = calibration.get_calibration(db, conference_id)
+    return {p["paper_id"]: (p[score_field], p["review_count"]) for p in report["papers"]}
+
+
+# ---------------- Quyết định ----------------
+def compute_decisions(candidates: List[dict], scores: Dict[int, tuple], policy) -> dict:
+    by_track: Dict[int, List[dict]] = {}
+    decisions = []
+    for c in candidates:
+        score, count = scores.get(c["id"], (None, 0))
+        if score is not None and math.isnan(score):
+            score = None  # NaN (bài không có review trong bản hiệu chỉnh) coi như chưa có điểm
+        d = {
+            "paper_id": c["id"],
+            "track_id": c["track_id"],
+            "title": c["title"],
+            "current_status": c["status"],
+            "submitter_id": c["submitter_id"],
+            "score": score,
+            "review_count": count,
+            "decision": None,
+            "reason": "no_score" if score is None else "insufficient_reviews",
+        }
+        decisions.append(d)
+        if score is not None and count >= policy.min_reviews:
+            by_track.setdefault(c["track_id"], []).append(d)
+
+    for track_papers in by_track.values():
+        if policy.mode == "threshold":
+            for d in track_papers:
+                d["decision"] = ACCEPTED if d["score"] >= policy.threshold else REJECTED
+                d["reason"] = "threshold"
+        else:
+            # Hoà điểm: ưu tiên bài có nhiều review hơn, rồi id nhỏ hơn (ổn định giữa các lần xem)
+            ranked = sorted(track_papers, key=lambda d: (-d["score"], -d["review_count"], d["paper_id"]))
+            for rank, d in enumerate(ranked):
+                d["decision"] = ACCEPTED if rank < policy.top_k else REJECTED
+                d["reason"] = "top_k"
+
+    for d in decisions:
+        override = policy.overrides.get(d["paper_id"])
+        if override:
+            d["decision"] = override
+            d["reason"] = "override"
+
+    return {"decisions": decisions, **summarize(decisions)}
+
+
+def summarize(decisions: List[dict]) -> dict:
+    distribution = {ACCEPTED: 0, REJECTED: 0, UNDECIDED: 0}
+    tracks: Dict[int, dict] = {}
+    for d in decisions:
+        key = d["decision"] or UNDECIDED
+        distribution[key] += 1
+        t = tracks.setdefault(d["track_id"], {
+            "track_id": d["track_id"], "total": 0, "accepted": 0, "rejected": 0, "undecided": 0, "cutoff_score": None,
+        })
+        t["total"] += 1
+        t[key.lower()] += 1
+        if key == ACCEPTED and d["score"] is not None and d["reason"] != "override":
+            t["cutoff_score"] = d["score"] if t["cutoff_score"] is None else min(t["cutoff_score"], d["score"])
+    return {"distribution": distribution, "tracks": sorted(tracks.values(), key=lambda t: t["track_id"])}
+
+
+def changed_items(decisions: List[dict], policy) -> List[dict]:
+    """Chỉ đẩy các bài có quyết định khác trạng thái hiện tại."""
+    items = []
+    for d in decisions:
+        if d["decision"] is None or d["decision"] == d["current_status"]:
+            continue
+        note: Optional[str] = policy.accept_note if d["decision"] == ACCEPTED else policy.reject_note
+        items.append({"paper_id": d["paper_id"], "status": d["decision"], "note": note})
+    return items
+
+
+def decision_notifications(updated: List[dict]) -> List[dict]:
+    items = []
+    for u in updated:
+        accepted = u["status"] == ACCEPTED
+        items.append({
+            "user_id": u["submitter_id"],
+            "title": f"Kết quả bài báo #{u['paper_id']}: {'Được chấp nhận' if accepted else 'Bị từ chối'}",
+            "body": (
+                f"Bài báo \"{u['title']}\" đã được {'chấp nhận' if accepted else 'từ chối'}. "
+                "Vui lòng đăng nhập hệ thống để xem chi tiết."
+            ),
+        })
+    return items
@@ -0,0 +1,110 @@
+# backend/review-service/src/services/discussion_stream.py
+"""
+Phát tin nhắn thảo luận mới theo thời gian thực qua Redis pub/sub.
+
+- create_discussion publish bản ghi vừa commit lên kênh của paper.
+- Mỗi kết nối SSE subscribe kênh của paper (mọi replica đều nhận được).
+- Redis không dùng được: stream tự chuyển sang đọc DB định kỳ ở phía server,
+  client vẫn chỉ giữ một kết nối.
+"""
+import json
+import logging
+from typing import Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "review-service:discussions"
+
+_client = None
+
+
+def channel(paper_id: int) -> str:
+    return f"{CHANNEL_PREFIX}:{paper_id}"
+
+
+def _get_client():
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        import redis.asyncio as aioredis
+        _client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+def message_payload(m) -> dict:
+    return {
+        "id": m.id,
+        "paper_id": m.paper_id,
+        "sender_id": m.sender_id,
+        "content": m.content,
+        "sent_at": m.sent_at.isoformat() if m.sent_at else None,
+        "parent_id": m.parent_id,
+    }
+
+
+async def publish(m) -> None:
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        await client.publish(channel(m.paper_id), json.dumps(message_payload(m), ensure_ascii=False))
+    except Exception as e:
+        # Client đang nghe sẽ nhận được ở lần đọc bù theo Last-Event-ID
+        logger.warning(f"[DiscussionStream] Publish failed: {e}")
+
+
+class Subscription:
+    """async with Subscription(paper_id) as sub: msg = await sub.next(timeout)"""
+
+    def __init__(self, paper_id: int):
+        self.paper_id = paper_id
+        self._pubsub = None
+
+    @property
+    def active(self) -> bool:
+        return self._pubsub is not None
+
+    async def __aenter__(self) -> "Subscription":
+        client = _get_client()
+        if client is not None:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(channel(self.paper_id))
+                self._pubsub = pubsub
+            except Exception as e:
+                logger.warning(f"[DiscussionStream] Subscribe failed, falling back to DB polling: {e}")
+        return self
+
+    async def next(self, timeout: float) -> Optional[dict]:
+        if self._pubsub is None:
+            return None
+        try:
+            msg = await self._pubsub.get_message(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"[DiscussionStream] Redis connection lost: {e}")
+            self._pubsub = None
+            return None
+        if not msg or msg.get("type") != "message":
+            return None
+        return json.loads(msg["data"])
+
+    async def __aexit__(self, *exc) -> None:
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(channel(self.paper_id))
+                close = getattr(self._pubsub, "aclose", None) or self._pubsub.close
+                await close()
+            except Exception:
+                pass
+
+
+def sse_event(event_id: Optional[int], data: dict, event: str = "message") -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, default=str)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,236 @@
+# backend/review-service/src/services/download_cache.py
+"""
+Cache file PDF bài báo trên đĩa cục bộ của review-service.
+
+- Khoá: (paper_id, version_number, sha của metadata version). Version mới (file khác)
+  -> khoá khác; file cũ tự rơi khỏi cache theo LRU.
+- LRU giới hạn dung lượng (PAPER_CACHE_MAX_MB): thứ tự dùng và tổng dung lượng giữ trong bộ nhớ
+  (quét thư mục MỘT lần khi process bắt đầu dùng cache, theo mtime), khi vượt giới hạn thì xoá
+  file ít dùng nhất. Mọi thao tác đĩa (ghi file, xoá, đọc meta) chạy trong threadpool.
+- Route mở file qua open_file(): file đang phục vụ bị xoá (evict) vẫn đọc được qua file handle;
+  file đã bị xoá trước lúc mở -> tải lại thay vì lỗi 500.
+- Single-flight: nhiều request cùng lúc cho cùng một file chỉ tải từ submission-service một lần.
+- ETag = sha256 nội dung file, tính khi tải về và lưu kèm file (.json).
+- Metadata version mới nhất của paper được nhớ ngắn hạn (PAPER_META_TTL) để lần tải lặp lại
+  không phải hỏi submission-service.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+CACHE_DIR = os.getenv("PAPER_CACHE_DIR", "/tmp/review-paper-cache")
+MAX_BYTES = int(os.getenv("PAPER_CACHE_MAX_MB", "2048")) * 1024 * 1024
+META_TTL_SECONDS = float(os.getenv("PAPER_META_TTL", "60"))
+CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class CachedFile:
+    path: str
+    etag: str
+    size: int
+    version_number: int
+
+
+def version_key(paper_id: int, version: dict) -> str:
+    sig = f"{version.get('id')}|{version.get('file_url')}|{version.get('created_at')}"
+    sha = hashlib.sha1(sig.encode("utf-8")).hexdigest()[:16]
+    return f"{paper_id}_v{version.get('version_number')}_{sha}"
+
+
+class PaperFileCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._meta: Dict[int, Tuple[float, dict]] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None  # path .pdf -> size, cũ -> mới
+        self._total = 0
+
+    # Một client dùng chung (giữ kết nối) thay vì mở AsyncClient mới cho mỗi bước
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(10.0, read=180.0),
+                follow_redirects=True,
+            )
+        return self._client
+
+    # ---------------- Metadata ----------------
+    def get_latest_version(self, paper_id: int) -> Optional[dict]:
+        hit = self._meta.get(paper_id)
+        if hit and time.monotonic() - hit[0] < META_TTL_SECONDS:
+            return hit[1]
+        return None
+
+    def remember_latest_version(self, paper_id: int, version: dict) -> None:
+        self._meta[paper_id] = (time.monotonic(), version)
+
+    # ---------------- Files ----------------
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, key)
+        return f"{base}.pdf", f"{base}.json"
+
+    def _load_entries(self) -> None:
+        """Gọi khi giữ _lock."""
+        if self._entries is not None:
+            return
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if not name.endswith(".pdf"):
+                continue
+            p = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        self._entries = OrderedDict((p, size) for _, size, p in sorted(entries))
+        self._total = sum(self._entries.values())
+
+    def lookup(self, key: str, version_number: int) -> Optional[CachedFile]:
+        path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            size = os.path.getsize(path)
+        except (OSError, ValueError):
+            return None
+        if size != meta.get("size"):
+            return None
+        os.utime(path, None)  # LRU khi process sau quét lại thư mục
+        with self._lock:
+            if self._entries is not None and path in self._entries:
+                self._entries.move_to_end(path)
+        return CachedFile(path=path, etag=meta["etag"], size=size, version_number=version_number)
+
+    async def get_or_fetch(self, key: str, version_number: int, url: str) -> CachedFile:
+        cached = await run_in_threadpool(self.lookup, key, version_number)
+        if cached:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(key, version_number, url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def open_file(self, key: str, version_number: int, url: str) -> Tuple[CachedFile, BinaryIO]:
+        """File trong cache kèm handle đã mở (caller đóng). Bị xoá giữa lookup và open -> tải lại."""
+        for _ in range(2):
+            cached = await self.get_or_fetch(key, version_number, url)
+            try:
+                return cached, await run_in_threadpool(open, cached.path, "rb")
+            except FileNotFoundError:
+                await run_in_threadpool(self._forget, cached.path)
+        raise RuntimeError(f"Cached file {key} was evicted while opening")
+
+    def _open_tmp(self, tmp: str) -> BinaryIO:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return open(tmp, "wb")
+
+    @staticmethod
+    def _discard_tmp(f: Optional[BinaryIO], tmp: str) -> None:
+        if f is not None and not f.closed:
+            f.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    async def _fill(self, key: str, version_number: int, url: str) -> CachedFile:
+        path, _ = self._paths(key)
+        tmp = f"{path}.{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        f = None
+        try:
+            async with self.client().stream("GET", url) as resp:
+                if resp.status_code == 404:
+                    raise FileNotFoundError(url)
+                if resp.status_code != 200:
+                    raise RuntimeError(f"Storage server error: {resp.status_code}")
+                f = await run_in_threadpool(self._open_tmp, tmp)
+                async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                    await run_in_threadpool(f.write, chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            await run_in_threadpool(f.close)
+            etag = f'"{digest.hexdigest()}"'
+            await run_in_threadpool(self._store, key, tmp, size, etag, url)
+        finally:
+            await run_in_threadpool(self._discard_tmp, f, tmp)
+        return CachedFile(path=path, etag=etag, size=size, version_number=version_number)
+
+    def _store(self, key: str, tmp: str, size: int, etag: str, url: str) -> None:
+        path, meta_path = self._paths(key)
+        os.replace(tmp, path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "size": size, "url": url}, f)
+
+        with self._lock:
+            self._load_entries()
+            self._total += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+            victims = self._pick_victims(keep=path)
+        for p in victims:
+            for victim in (p, p[: -len(".pdf")] + ".json"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
+    def _pick_victims(self, keep: str) -> List[str]:
+        """Gọi khi giữ _lock: bỏ khỏi bộ đếm các file ít dùng nhất đến khi về dưới giới hạn."""
+        victims = []
+        for p in list(self._entries):
+            if self._total <= self.max_bytes:
+                break
+            if p == keep:
+                continue
+            self._total -= self._entries.pop(p)
+            victims.append(p)
+        return victims
+
+    def _forget(self, path: str) -> None:
+        with self._lock:
+            if self._entries is not None and path in self._entries:
+                self._total -= self._entries.pop(path)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Chỉ hỗ trợ một khoảng 'bytes=a-b' / 'bytes=a-' / 'bytes=-n'. None = không hợp lệ/không có."""
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[len("bytes="):].strip().partition("-")
+    try:
+        if start_s == "":
+            length = int(end_s)
+            if length <= 0:
+                return None
+            return max(size - length, 0), size - 1
+        start = int(start_s)
+        end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+paper_file_cache = PaperFileCache()
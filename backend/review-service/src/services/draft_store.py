@@ -0,0 +1,379 @@
+# backend/review-service/src/services/draft_store.py
+"""
+Autosave bản nháp review trên Redis, ghi gộp xuống MySQL.
+
+- Mỗi lần autosave là MỘT script Lua trên Redis: merge patch (từng trường review và
+  từng tiêu chí) vào bản nháp, tăng version, đánh dấu "dirty" trong sorted set với
+  hạn flush = min(bây giờ + DRAFT_DEBOUNCE, lần sửa đầu tiên chưa flush + DRAFT_MAX_DELAY).
+  Gõ liên tục không tạo transaction MySQL nào.
+- Flusher (thread nền, mỗi replica một cái) lấy các bản nháp đến hạn, ghi tất cả trong
+  MỘT transaction rồi commit. Claim bằng script Lua (ZREM + khoá theo review) nên mỗi
+  bản nháp chỉ một replica ghi, và không có hai lần flush của cùng review chạy song song
+  (bản cũ không thể ghi đè bản mới).
+- Lưu tường minh (POST /reviews/{id}/draft/flush), PATCH trực tiếp và submit đều flush
+  bản nháp đang chờ trước, trong cùng transaction với thao tác đó.
+- Bản nháp chỉ chứa trạng thái cuối cùng (đã merge) nên flush bao nhiêu lần cũng cho
+  cùng kết quả; review đã nộp thì bản nháp bị bỏ.
+"""
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from src import models
+from src.config import settings
+from src.services.review_stats import is_submitted
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "review-service:draft"
+DIRTY_KEY = f"{KEY_PREFIX}:dirty"
+
+DEBOUNCE_SECONDS = float(os.getenv("DRAFT_DEBOUNCE", "5"))
+MAX_DELAY_SECONDS = float(os.getenv("DRAFT_MAX_DELAY", "60"))
+RETRY_SECONDS = float(os.getenv("DRAFT_RETRY", "30"))
+DRAFT_TTL_SECONDS = int(os.getenv("DRAFT_TTL", str(7 * 24 * 3600)))
+LOCK_MS = 30_000
+FLUSH_INTERVAL_SECONDS = 1.0
+FLUSH_BATCH_SIZE = 200
+
+REVIEW_FIELDS = ("final_score", "confidence_score", "content_author", "content_pc", "is_anonymous")
+CRITERIA_FIELDS = ("criteria_name", "grade", "weight", "comment")
+
+# KEYS: draft, dirty | ARGV: review_id, fields_json, criterias_json, now, debounce, max_delay, base_version, ttl
+_PATCH_LUA = """
+local cur = tonumber(redis.call('HGET', KEYS[1], 'version') or '0')
+if ARGV[7] ~= '' and tonumber(ARGV[7]) ~= cur then
+    return {-1, cur}
+end
+local fields = cjson.decode(redis.call('HGET', KEYS[1], 'fields') or '{}')
+for k, v in pairs(cjson.decode(ARGV[2])) do fields[k] = v end
+local crits = cjson.decode(redis.call('HGET', KEYS[1], 'criterias') or '{}')
+for cid, patch in pairs(cjson.decode(ARGV[3])) do
+    local c = crits[cid] or {}
+    for k, v in pairs(patch) do c[k] = v end
+    crits[cid] = c
+end
+local now = tonumber(ARGV[4])
+local since = tonumber(redis.call('HGET', KEYS[1], 'dirty_since') or ARGV[4])
+local version = cur + 1
+redis.call('HSET', KEYS[1], 'version', version, 'fields', cjson.encode(fields),
+           'criterias', cjson.encode(crits), 'updated_at', ARGV[4], 'dirty_since', since)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[8]))
+local due = math.min(now + tonumber(ARGV[5]), since + tonumber(ARGV[6]))
+redis.call('ZADD', KEYS[2], due, ARGV[1])
+return {version, 0}
+"""
+
+# KEYS: draft, dirty, lock | ARGV: review_id, now, force(1/0), token, lock_ms
+_CLAIM_LUA = """
+local score = redis.call('ZSCORE', KEYS[2], ARGV[1])
+if ARGV[3] ~= '1' then
+    if not score or tonumber(score) > tonumber(ARGV[2]) then
+        return {'clean'}
+    end
+elseif not score then
+    -- flush trước đó bị gián đoạn (replica chết giữa chừng): vẫn còn version chưa ghi
+    local v = redis.call('HMGET', KEYS[1], 'version', 'flushed_version')
+    if tonumber(v[1] or '0') <= tonumber(v[2] or '0') then
+        return {'clean'}
+    end
+end
+if not redis.call('SET', KEYS[3], ARGV[4], 'NX', 'PX', tonumber(ARGV[5])) then
+    return {'locked'}
+end
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[1], 'dirty_since')
+local v = redis.call('HMGET', KEYS[1], 'version', 'fields', 'criterias')
+return {'ok', v[1] or '0', v[2] or '{}', v[3] or '{}'}
+"""
+
+# KEYS: draft, lock | ARGV: token, version
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[2]) == ARGV[1] then
+    redis.call('DEL', KEYS[2])
+end
+if ARGV[2] ~= '' and redis.call('EXISTS', KEYS[1]) == 1 then
+    local flushed = tonumber(redis.call('HGET', KEYS[1], 'flushed_version') or '0')
+    if tonumber(ARGV[2]) > flushed then
+        redis.call('HSET', KEYS[1], 'flushed_version', ARGV[2])
+    end
+end
+return 1
+"""
+
+
+class DraftConflict(Exception):
+    def __init__(self, current_version: int):
+        super().__init__(f"Draft version conflict (current={current_version})")
+        self.current_version = current_version
+
+
+class DraftUnavailable(Exception):
+    pass
+
+
+@dataclass
+class Claim:
+    review_id: int
+    version: int
+    fields: dict
+    criterias: Dict[str, dict]
+    token: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+def draft_key(review_id: int) -> str:
+    return f"{KEY_PREFIX}:{review_id}"
+
+
+def lock_key(review_id: int) -> str:
+    return f"{KEY_PREFIX}:{review_id}:lock"
+
+
+class DraftStore:
+    def __init__(self):
+        self._redis = None
+        self._scripts: Dict[str, object] = {}
+        self._flusher: Optional[threading.Thread] = None
+
+    def _get_redis(self):
+        if not settings.REDIS_URL:
+            return None
+        if self._redis is None:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            except Exception as e:
+                logger.warning(f"[DraftStore] Redis unavailable: {e}")
+                return None
+        return self._redis
+
+    def _client(self):
+        client = self._get_redis()
+        if client is None:
+            raise DraftUnavailable("Redis is not configured")
+        return client
+
+    def _script(self, name: str, source: str):
+        if name not in self._scripts:
+            self._scripts[name] = self._client().register_script(source)
+        return self._scripts[name]
+
+    # ---------------- Autosave ----------------
+    def owner(self, review_id: int) -> Optional[int]:
+        """reviewer_id đã xác thực ở lần autosave đầu (None = chưa có bản nháp)."""
+        client = self._client()
+        try:
+            value = client.hget(draft_key(review_id), "reviewer_id")
+        except Exception as e:
+            raise DraftUnavailable(str(e))
+        return int(value) if value else None
+
+    def remember_owner(self, review_id: int, reviewer_id: int) -> None:
+        client = self._client()
+        try:
+            client.hsetnx(draft_key(review_id), "reviewer_id", reviewer_id)
+            client.expire(draft_key(review_id), DRAFT_TTL_SECONDS)
+        except Exception as e:
+            raise DraftUnavailable(str(e))
+
+    def patch(self, review_id: int, fields: dict, criterias: Dict[int, dict], base_version: Optional[int] = None) -> int:
+        """Merge patch vào bản nháp, trả về version mới."""
+        script = self._script("patch", _PATCH_LUA)
+        try:
+            version, current = script(
+                keys=[draft_key(review_id), DIRTY_KEY],
+                args=[
+                    review_id,
+                    json.dumps(fields, ensure_ascii=False),
+                    json.dumps({str(k): v for k, v in criterias.items()}, ensure_ascii=False),
+                    time.time(),
+                    DEBOUNCE_SECONDS,
+                    MAX_DELAY_SECONDS,
+                    "" if base_version is None else base_version,
+                    DRAFT_TTL_SECONDS,
+                ],
+            )
+        except Exception as e:
+            raise DraftUnavailable(str(e))
+        if int(version) < 0:
+            raise DraftConflict(int(current))
+        return int(version)
+
+    def get(self, review_id: int) -> Optional[dict]:
+        client = self._client()
+        try:
+            raw = client.hgetall(draft_key(review_id))
+        except Exception as e:
+            raise DraftUnavailable(str(e))
+        if not raw or "version" not in raw:
+            return None
+        version = int(raw["version"])
+        flushed = int(raw.get("flushed_version") or 0)
+        return {
+            "version": version,
+            "flushed_version": flushed,
+            "pending": version > flushed,
+            "fields": json.loads(raw.get("fields") or "{}"),
+            "criterias": {int(k): v for k, v in json.loads(raw.get("criterias") or "{}").items()},
+            "updated_at": float(raw["updated_at"]) if raw.get("updated_at") else None,
+        }
+
+    def pending_map(self, review_ids: List[int]) -> Dict[int, bool]:
+        """{review_id: còn bản nháp chưa flush?} cho nhiều review trong một round-trip (pipeline)."""
+        client = self._get_redis()
+        if client is None or not review_ids:
+            return {}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for rid in review_ids:
+                pipe.hmget(draft_key(rid), "version", "flushed_version")
+            values = pipe.execute()
+        except Exception as e:
+            logger.warning(f"[DraftStore] Read pending drafts failed: {e}")
+            return {}
+        return {
+            rid: int(v or 0) > int(f or 0)
+            for rid, (v, f) in zip(review_ids, values)
+        }
+
+    def discard(self, review_id: int) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.zrem(DIRTY_KEY, review_id)
+            client.delete(draft_key(review_id))
+        except Exception as e:
+            logger.warning(f"[DraftStore] Discard draft {review_id} failed: {e}")
+
+    # ---------------- Flush ----------------
+    def claim(self, review_id: int, force: bool = False, wait_seconds: float = 5.0) -> Optional[Claim]:
+        """
+        Lấy quyền flush bản nháp. force=True: không chờ debounce và chờ flush đang chạy
+        (của replica khác) xong. None = không có gì cần flush.
+        """
+        client = self._get_redis()
+        if client is None:
+            return None
+        deadline = time.monotonic() + wait_seconds
+        token = uuid.uuid4().hex
+        while True:
+            try:
+                res = self._script("claim", _CLAIM_LUA)(
+                    keys=[draft_key(review_id), DIRTY_KEY, lock_key(review_id)],
+                    args=[review_id, time.time(), "1" if force else "0", token, LOCK_MS],
+                )
+            except Exception as e:
+                logger.warning(f"[DraftStore] Claim draft {review_id} failed: {e}")
+                return None
+            if res[0] == "ok":
+                criterias = json.loads(res[3])
+                return Claim(
+                    review_id=review_id,
+                    version=int(res[1]),
+                    fields=json.loads(res[2]),
+                    criterias=criterias if isinstance(criterias, dict) else {},
+                    token=token,
+                )
+            if res[0] == "clean" or not force or time.monotonic() >= deadline:
+                return None
+            time.sleep(0.05)  # replica khác đang flush review này
+
+    def release(self, claim: Claim, flushed: bool) -> None:
+        """Gọi SAU commit (flushed=True) hoặc khi rollback (flushed=False -> thử lại sau)."""
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            if not flushed:
+                # Chỉ đặt lại hạn nếu chưa có patch mới (patch mới đã tự ZADD)
+                client.zadd(DIRTY_KEY, {str(claim.review_id): time.time() + RETRY_SECONDS}, nx=True)
+            self._script("release", _RELEASE_LUA)(
+                keys=[draft_key(claim.review_id), lock_key(claim.review_id)],
+                args=[claim.token, claim.version if flushed else ""],
+            )
+        except Exception as e:
+            logger.warning(f"[DraftStore] Release draft {claim.review_id} failed: {e}")
+
+    def due(self, limit: int = FLUSH_BATCH_SIZE) -> List[int]:
+        client = self._get_redis()
+        if client is None:
+            return []
+        return [int(r) for r in client.zrangebyscore(DIRTY_KEY, "-inf", time.time(), start=0, num=limit)]
+
+    def start_flusher(self) -> None:
+        if self._flusher is not None or self._get_redis() is None:
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="review-draft-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        from src.database import SessionLocal
+
+        while True:
+            try:
+                claims = [c for c in (self.claim(rid) for rid in self.due()) if c is not None]
+                if claims:
+                    db = SessionLocal()
+                    try:
+                        apply_claims(db, claims)
+                        db.commit()
+                        ok = True
+                    except Exception as e:
+                        db.rollback()
+                        ok = False
+                        logger.warning(f"[DraftStore] Flush of {len(claims)} drafts failed: {e}")
+                    finally:
+                        db.close()
+                    for c in claims:
+                        self.release(c, flushed=ok)
+                    continue  # còn bản nháp đến hạn thì flush tiếp ngay
+            except Exception as e:
+                logger.warning(f"[DraftStore] Flusher error: {e}")
+            time.sleep(FLUSH_INTERVAL_SECONDS)
+
+
+def apply_claims(db: Session, claims: List[Claim]) -> List[int]:
+    """
+    Ghi các bản nháp vào session (không commit): 2 query cho cả lô.
+    Review đã nộp (cùng điều kiện với paper_review_stats) thì bỏ qua. Trả về review_id đã áp dụng.
+    """
+    by_review = {c.review_id: c for c in claims}
+    reviews = {
+        r.id: r for r in db.query(models.Review).filter(models.Review.id.in_(list(by_review))).all()
+    }
+    crit_ids = {int(cid) for c in claims for cid in c.criterias}
+    crits = {}
+    if crit_ids:
+        crits = {
+            c.id: c for c in db.query(models.ReviewCriteria).filter(models.ReviewCriteria.id.in_(crit_ids)).all()
+        }
+
+    applied = []
+    for review_id, claim in by_review.items():
+        rev = reviews.get(review_id)
+        if rev is None or is_submitted(rev):
+            continue
+        for k, v in claim.fields.items():
+            if k in REVIEW_FIELDS:
+                setattr(rev, k, v)
+        for cid, patch in claim.criterias.items():
+            crit = crits.get(int(cid))
+            if crit is None or crit.review_id != review_id:
+                continue
+            for k, v in patch.items():
+                if k in CRITERIA_FIELDS:
+                    setattr(crit, k, v)
+        applied.append(review_id)
+    # Bản nháp chưa nộp không tính vào paper_review_stats nên không cần refresh read model
+    return applied
+
+
+draft_store = DraftStore()
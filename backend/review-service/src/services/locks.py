@@ -0,0 +1,91 @@
+# backend/review-service/src/services/locks.py
+"""
+Khoá Redis ngắn hạn giữa các replica (SET NX PX, nhả bằng compare-and-delete) cho các thao tác
+không được chạy song song (vd. auto-assign ghi phân công, sweeper nhắc hạn, backfill).
+Việc dài gọi lock.extend() giữa các bước để khoá không hết hạn giữa chừng.
+Redis không cấu hình -> không khoá (môi trường dev một process).
+"""
+import logging
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_EXTEND_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_redis = None
+
+
+class LockBusy(Exception):
+    pass
+
+
+class LockUnavailable(Exception):
+    pass
+
+
+def get_redis():
+    global _redis
+    if not settings.REDIS_URL:
+        return None
+    if _redis is None:
+        import redis
+        _redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _redis
+
+
+class HeldLock:
+    def __init__(self, client, key: str, token: Optional[str], ttl_ms: int):
+        self.client = client
+        self.key = key
+        self.token = token
+        self.ttl_ms = ttl_ms
+
+    def extend(self) -> bool:
+        """Đặt lại TTL nếu khoá vẫn của mình. False: khoá đã mất (hết hạn / Redis lỗi)."""
+        if self.client is None:
+            return True
+        try:
+            return bool(self.client.eval(_EXTEND_LUA, 1, self.key, self.token, self.ttl_ms))
+        except Exception as e:
+            logger.warning(f"[Locks] Extend {self.key} failed: {e}")
+            return False
+
+
+@contextmanager
+def redis_lock(key: str, ttl_ms: int) -> Iterator[HeldLock]:
+    """LockBusy: replica/request khác đang giữ khoá. LockUnavailable: Redis lỗi."""
+    client = get_redis()
+    if client is None:
+        yield HeldLock(None, key, None, ttl_ms)
+        return
+
+    token = uuid.uuid4().hex
+    try:
+        acquired = client.set(key, token, nx=True, px=ttl_ms)
+    except Exception as e:
+        raise LockUnavailable(str(e))
+    if not acquired:
+        raise LockBusy(key)
+    try:
+        yield HeldLock(client, key, token, ttl_ms)
+    finally:
+        try:
+            client.eval(_RELEASE_LUA, 1, key, token)
+        except Exception as e:
+            logger.warning(f"[Locks] Release {key} failed: {e}")
@@ -6,6 +6,8 @@ import logging
 NOTI_SERVICE_URL = os.getenv("NOTIFICATION_SERVICE_URL", "http://notification-service:8000")
 # Lấy Internal Key để xác thực giữa các service (quan trọng)
 INTERNAL_KEY = os.getenv("INTERNAL_KEY", "secure_internal_key") 
+# Không vượt MAX_BATCH_SIZE (1000) của POST /api/notifications/batch
+NOTI_BATCH_SIZE = 1000
 
 logger = logging.getLogger(__name__)
 
@@ -42,4 +44,46 @@ def send_notification_to_user(user_id: int, title: str, body: str, receiver_emai
             logger.warning(f"⚠️ [Notification] Failed to save (Status {response.status_code}): {response.text}")
             
     except requests.exceptions.RequestException as e:
-        logger.error(f"🔥 [Notification] Connection Error: {str(e)}")
\ No newline at end of file
+        logger.error(f"🔥 [Notification] Connection Error: {str(e)}")
+
+def send_notifications_batch(items: list):
+    """
+    Gửi nhiều thông báo tới Notification Service (/api/notifications/batch), chia thành các lô
+    tối đa NOTI_BATCH_SIZE (giới hạn MAX_BATCH_SIZE của endpoint).
+    items: list dict {user_id, title, body, receiver_email?}. Gọi trong BackgroundTasks.
+    Trả về True nếu Notification Service đã nhận tất cả các lô.
+    """
+    if not items:
+        return True
+    url = f"{NOTI_SERVICE_URL}/api/notifications/batch"
+    headers = {
+        "Content-Type": "application/json",
+        "X-Internal-Key": INTERNAL_KEY
+    }
+    payload = [
+        {
+            "receiver_id": it["user_id"],
+            "subject": it["title"],
+            "body": it["body"],
+            "receiver_email": it.get("receiver_email"),
+        }
+        for it in items
+    ]
+
+    ok = True
+    for start in range(0, len(payload), NOTI_BATCH_SIZE):
+        chunk = payload[start:start + NOTI_BATCH_SIZE]
+        try:
+            response = requests.post(url, json=chunk, headers=headers, timeout=10)
+            if response.status_code in [200, 201]:
+                logger.info(f"✅ [Notification] Batch saved: {len(chunk)} notifications")
+                continue
+            logger.warning(
+                f"⚠️ [Notification] Batch {start}-{start + len(chunk) - 1} failed "
+                f"(Status {response.status_code}): {response.text}"
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f"🔥 [Notification] Connection Error: {str(e)}")
+        # Lô lỗi không chặn các lô còn lại
+        ok = False
+    return ok
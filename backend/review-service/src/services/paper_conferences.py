@@ -0,0 +1,141 @@
+# backend/review-service/src/services/paper_conferences.py
+"""
+conference_id của bài báo (thuộc submission-service). Conference của bài không đổi nên
+mỗi paper chỉ cần biết một lần rồi lưu lại vào bảng của review-service
+(paper_review_stats, assignments). Nguồn: paper_projection (paper events) lúc tạo dữ liệu;
+phần còn thiếu do ConferenceBackfill điền nền -- request không bao giờ gọi HTTP để hỏi.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src import models
+from src.services import locks, paper_projection
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = 20
+
+BACKFILL_INTERVAL_SECONDS = float(os.getenv("CONFERENCE_BACKFILL_INTERVAL", "600"))
+BACKFILL_BATCH = int(os.getenv("CONFERENCE_BACKFILL_BATCH", "500"))
+BACKFILL_LOCK_KEY = "review-service:conference-backfill:lock"
+BACKFILL_LOCK_TTL_MS = 600000
+MISSING_KEY_PREFIX = "review-service:paper-missing:"
+MISSING_TTL_SECONDS = int(os.getenv("CONFERENCE_MISSING_TTL", "86400"))
+
+
+def backfill_local(db: Session) -> None:
+    """Điền conference_id còn thiếu của assignments / paper_review_stats từ các bảng đã biết (chỉ SQL)."""
+    copies = (
+        ("assignments", "paper_projection"),
+        ("assignments", "paper_review_stats"),
+        ("paper_review_stats", "paper_projection"),
+        ("paper_review_stats", "assignments"),
+    )
+    for target, source in copies:
+        db.execute(text(
+            f"UPDATE {target} SET conference_id = ("
+            f" SELECT MAX(p.conference_id) FROM {source} p WHERE p.paper_id = {target}.paper_id"
+            ") WHERE conference_id IS NULL AND EXISTS ("
+            f" SELECT 1 FROM {source} p WHERE p.paper_id = {target}.paper_id AND p.conference_id IS NOT NULL"
+            ")"
+        ))
+    db.commit()
+
+
+class ConferenceBackfill:
+    """
+    Chạy nền (một replica giữ khoá mỗi lượt) thay vì trong request: assignment / stats mới đã được
+    gắn conference_id lúc tạo (crud, refresh_paper_stats, từ paper_projection), job này chỉ xử lý
+    dữ liệu cũ / bài chưa có bản sao. Bài hỏi submission-service không ra (404...) được ghi nhớ MISSING_TTL giây để
+    không hỏi lại mỗi lượt.
+    """
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._missing: Dict[int, float] = {}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="conference-backfill", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                with locks.redis_lock(BACKFILL_LOCK_KEY, BACKFILL_LOCK_TTL_MS):
+                    self.run_once()
+            except (locks.LockBusy, locks.LockUnavailable):
+                pass
+            except Exception as e:
+                logger.warning(f"[ConferenceBackfill] Backfill failed: {e}")
+            time.sleep(BACKFILL_INTERVAL_SECONDS)
+
+    def _known_missing(self, paper_ids: List[int]) -> set:
+        client = locks.get_redis()
+        if client is not None:
+            flags = client.mget([f"{MISSING_KEY_PREFIX}{p}" for p in paper_ids])
+            return {p for p, f in zip(paper_ids, flags) if f}
+        now = time.monotonic()
+        return {p for p in paper_ids if now - self._missing.get(p, -MISSING_TTL_SECONDS) < MISSING_TTL_SECONDS}
+
+    def _remember_missing(self, paper_ids: List[int]) -> None:
+        client = locks.get_redis()
+        if client is not None:
+            pipe = client.pipeline(transaction=False)
+            for p in paper_ids:
+                pipe.set(f"{MISSING_KEY_PREFIX}{p}", 1, ex=MISSING_TTL_SECONDS)
+            pipe.execute()
+            return
+        now = time.monotonic()
+        self._missing.update({p: now for p in paper_ids})
+
+    def run_once(self) -> int:
+        """Trả về số paper vừa nạp được từ submission-service."""
+        from src.database import SessionLocal
+
+        A, S = models.Assignment, models.PaperReviewStats
+        db = SessionLocal()
+        try:
+            backfill_local(db)
+            pending = sorted(
+                {p for (p,) in db.query(A.paper_id).filter(A.conference_id.is_(None)).distinct().all()}
+                | {p for (p,) in db.query(S.paper_id).filter(S.conference_id.is_(None)).all()}
+            )
+            if not pending:
+                return 0
+            missing = self._known_missing(pending)
+            pending = [p for p in pending if p not in missing][:BACKFILL_BATCH]
+            if not pending:
+                return 0
+
+            snapshots = asyncio.run(_fetch_snapshots(pending))
+            for data in snapshots.values():
+                paper_projection.upsert(db, data, (0, 0))
+            paper_projection.stamp_conferences(db, {p: d.get("conference_id") for p, d in snapshots.items()})
+            db.commit()
+            self._remember_missing([p for p in pending if snapshots.get(p, {}).get("conference_id") is None])
+            return len(snapshots)
+        finally:
+            db.close()
+
+
+async def _fetch_snapshots(paper_ids: List[int]) -> Dict[int, dict]:
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def fetch(paper_id: int):
+        async with sem:
+            return paper_id, await paper_projection.fetch_paper(paper_id)
+
+    resolved = await asyncio.gather(*(fetch(p) for p in paper_ids))
+    return {p: d for p, d in resolved if d is not None}
+
+
+conference_backfill = ConferenceBackfill()
@@ -0,0 +1,309 @@
+# backend/review-service/src/services/paper_projection.py
+"""
+Bản sao cục bộ (bảng paper_projection) của bài báo thuộc submission-service.
+
+- submission-service phát ảnh chụp bài lên Redis Stream "paper-events" sau mỗi thay đổi
+  (nộp, sửa metadata, version mới, quyết định, rút bài). Consumer group PAPER_EVENTS_GROUP:
+  mỗi event chỉ do MỘT replica xử lý, ACK sau khi commit; event của replica chết được
+  replica khác nhận lại (XAUTOCLAIM) -> at-least-once.
+- Tên consumer cố định theo replica (PAPER_EVENTS_CONSUMER, mặc định hostname) để lần chạy lại
+  đọc tiếp được pending của chính nó; consumer không còn pending và im lặng quá
+  DEAD_CONSUMER_IDLE_MS (replica đã bị thay thế) được xoá khỏi group.
+- Upsert idempotent theo id event: UPDATE có điều kiện (event_ms, event_seq) nhỏ hơn, nên
+  event lặp lại hoặc đến trễ (khác replica) không ghi đè dữ liệu mới hơn.
+- Kiểm tra quyền / metadata (tác giả của bài, hội nghị, version mới nhất...) đọc bảng này
+  theo khoá chính. Bài chưa có bản sao (trước khi bật event, Redis chết...) được nạp một lần
+  qua GET /submissions/{id} rồi lưu lại với (0, 0) -> event thật luôn ghi đè được.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src import models
+from src.config import SUBMISSION_SERVICE_URL, settings
+
+logger = logging.getLogger(__name__)
+
+INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
+STREAM = os.getenv("PAPER_EVENTS_STREAM", "paper-events")
+GROUP = os.getenv("PAPER_EVENTS_GROUP", "review-service")
+CONSUMER = os.getenv("PAPER_EVENTS_CONSUMER") or socket.gethostname()
+BATCH_SIZE = int(os.getenv("PAPER_EVENTS_BATCH", "200"))
+BLOCK_MS = 5000
+CLAIM_IDLE_MS = int(os.getenv("PAPER_EVENTS_CLAIM_IDLE_MS", "60000"))
+CLAIM_INTERVAL_SECONDS = 30.0
+DEAD_CONSUMER_IDLE_MS = int(os.getenv("PAPER_EVENTS_DEAD_CONSUMER_IDLE_MS", str(24 * 3600 * 1000)))
+RETRY_SECONDS = 5.0
+
+_FIELDS = (
+    "conference_id", "track_id", "submitter_id", "title", "status", "is_blind_mode", "submitted_at",
+    "latest_version_id", "latest_version_number", "latest_file_url", "latest_version_created_at",
+)
+_DATETIME_FIELDS = ("submitted_at", "latest_version_created_at")
+
+
+# ---------------- Upsert ----------------
+def _parse_id(event_id: str) -> Tuple[int, int]:
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def _values(data: dict) -> dict:
+    values = {f: data.get(f) for f in _FIELDS}
+    for f in _DATETIME_FIELDS:
+        if isinstance(values[f], str):
+            values[f] = datetime.fromisoformat(values[f].replace("Z", "+00:00")).replace(tzinfo=None)
+    return values
+
+
+def upsert(db: Session, data: dict, event_id: Tuple[int, int]) -> bool:
+    """Ghi ảnh chụp nếu mới hơn bản đang có. Không commit."""
+    P = models.PaperProjection
+    ms, seq = event_id
+    values = {**_values(data), "event_ms": ms, "event_seq": seq, "updated_at": datetime.utcnow()}
+    newer = or_(P.event_ms < ms, and_(P.event_ms == ms, P.event_seq < seq))
+
+    for _ in range(2):
+        if db.execute(update(P).where(P.paper_id == data["id"], newer).values(**values)).rowcount:
+            return True
+        if db.query(P.paper_id).filter(P.paper_id == data["id"]).first() is not None:
+            return False  # đã có bản mới hơn (hoặc chính event này)
+        try:
+            with db.begin_nested():
+                db.add(P(paper_id=data["id"], **values))
+            return True
+        except IntegrityError:
+            continue  # replica khác vừa chèn: thử lại nhánh UPDATE
+    return False
+
+
+def apply_events(db: Session, entries: List[Tuple[str, dict]]) -> int:
+    """entries: [(stream_id, fields)] theo thứ tự stream. Chỉ áp dụng event mới nhất mỗi bài."""
+    latest: Dict[int, Tuple[Tuple[int, int], dict]] = {}
+    for event_id, fields in entries:
+        try:
+            data = json.loads(fields["data"])
+            key = _parse_id(event_id)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"[PaperProjection] Skip malformed event {event_id}: {e}")
+            continue
+        prev = latest.get(data["id"])
+        if prev is None or prev[0] < key:
+            latest[data["id"]] = (key, data)
+
+    applied = sum(upsert(db, data, key) for key, data in latest.values())
+    # Conference của bài không đổi: gắn luôn cho assignment / stats còn thiếu
+    stamp_conferences(db, {pid: data.get("conference_id") for pid, (_, data) in latest.items()})
+    db.commit()
+    return applied
+
+
+def stamp_conferences(db: Session, conferences: Dict[int, int]) -> None:
+    """Điền conference_id (còn NULL) cho assignment và paper_review_stats của các paper đã biết hội nghị. Không commit."""
+    by_conference: Dict[int, list] = {}
+    for paper_id, conference_id in conferences.items():
+        if conference_id is not None:
+            by_conference.setdefault(conference_id, []).append(paper_id)
+    for table in (models.Assignment, models.PaperReviewStats):
+        for conference_id, paper_ids in by_conference.items():
+            db.execute(
+                update(table)
+                .where(table.paper_id.in_(paper_ids), table.conference_id.is_(None))
+                .values(conference_id=conference_id)
+            )
+
+
+# ---------------- Đọc ----------------
+def get(db: Session, paper_id: int) -> Optional[models.PaperProjection]:
+    return db.get(models.PaperProjection, paper_id)
+
+
+def get_many(db: Session, paper_ids: Iterable[int]) -> Dict[int, models.PaperProjection]:
+    paper_ids = list(set(paper_ids))
+    if not paper_ids:
+        return {}
+    P = models.PaperProjection
+    return {p.paper_id: p for p in db.query(P).filter(P.paper_id.in_(paper_ids)).all()}
+
+
+def summary(p: models.PaperProjection) -> dict:
+    """Cùng dạng với GET /submissions/internal/papers (PaperSummary)."""
+    return {
+        "id": p.paper_id,
+        "title": p.title,
+        "conference_id": p.conference_id,
+        "track_id": p.track_id,
+        "status": p.status,
+    }
+
+
+def latest_version(p: models.PaperProjection) -> Optional[dict]:
+    """Cùng dạng với phần tử versions của GET /submissions/{id}."""
+    if p is None or p.latest_version_number is None:
+        return None
+    return {
+        "id": p.latest_version_id,
+        "paper_id": p.paper_id,
+        "version_number": p.latest_version_number,
+        "file_url": p.latest_file_url,
+        "created_at": p.latest_version_created_at.isoformat() if p.latest_version_created_at else None,
+    }
+
+
+def _snapshot_from_paper(paper: dict) -> dict:
+    versions = paper.get("versions") or []
+    latest = max(versions, key=lambda v: v.get("version_number", 0)) if versions else {}
+    return {
+        **{f: paper.get(f) for f in ("id", "conference_id", "track_id", "submitter_id", "title", "status", "is_blind_mode", "submitted_at")},
+        "latest_version_id": latest.get("id"),
+        "latest_version_number": latest.get("version_number"),
+        "latest_file_url": latest.get("file_url"),
+        "latest_version_created_at": latest.get("created_at"),
+    }
+
+
+async def fetch_paper(paper_id: int) -> Optional[dict]:
+    sub_url = (SUBMISSION_SERVICE_URL or "").rstrip("/")
+    if not sub_url:
+        return None
+    headers = {"X-Internal-Key": INTERNAL_KEY} if INTERNAL_KEY else {}
+    try:
+        async with httpx.AsyncClient(timeout=httpx.Timeout(5.0, read=10.0)) as client:
+            r = await client.get(f"{sub_url}/submissions/{paper_id}", headers=headers)
+        if r.status_code == 200:
+            return _snapshot_from_paper(r.json())
+        if r.status_code != 404:
+            print(f"[Review Service] Paper {paper_id} lookup failed: {r.status_code}")
+    except Exception as e:
+        print(f"[Review Service] Paper {paper_id} lookup error: {e}")
+    return None
+
+
+async def ensure(db: Session, paper_id: int) -> Optional[models.PaperProjection]:
+    """Bản sao cục bộ của bài; chưa có thì nạp một lần từ submission-service."""
+    p = get(db, paper_id)
+    if p is not None:
+        return p
+    data = await fetch_paper(paper_id)
+    if data is None:
+        return None
+    upsert(db, data, (0, 0))
+    db.commit()
+    return get(db, paper_id)
+
+
+async def load_latest_version(paper_id: int) -> Optional[dict]:
+    """Cho các route không giữ Session (tải file): tự mở session trong threadpool."""
+    from src.database import SessionLocal
+
+    def _load():
+        db = SessionLocal()
+        try:
+            return latest_version(get(db, paper_id))
+        finally:
+            db.close()
+
+    return await run_in_threadpool(_load)
+
+
+# ---------------- Consumer ----------------
+class PaperProjectionConsumer:
+    def __init__(self):
+        self._redis = None
+        self._thread: Optional[threading.Thread] = None
+        self._last_claim = 0.0
+
+    def _get_redis(self):
+        if not settings.REDIS_URL:
+            return None
+        if self._redis is None:
+            import redis
+            self._redis = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        return self._redis
+
+    def start(self) -> None:
+        if self._thread is not None or not settings.REDIS_URL:
+            return
+        self._thread = threading.Thread(target=self._loop, name="paper-projection", daemon=True)
+        self._thread.start()
+
+    def _ensure_group(self, client) -> None:
+        import redis
+        try:
+            # id "0": nhóm mới đọc lại toàn bộ event còn trong stream (dựng bản sao lần đầu)
+            client.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _loop(self) -> None:
+        ready = False
+        while True:
+            try:
+                client = self._get_redis()
+                if not ready:
+                    self._ensure_group(client)
+                    ready = True
+                    # Event đã nhận nhưng chưa ACK từ lần chạy trước của chính consumer này
+                    while self.run_once(client, pending=True):
+                        pass
+                self.run_once(client)
+            except Exception as e:
+                logger.warning(f"[PaperProjection] Consume failed: {e}")
+                ready = False
+                time.sleep(RETRY_SECONDS)
+
+    def run_once(self, client, pending: bool = False) -> int:
+        entries: List[Tuple[str, dict]] = []
+        now = time.monotonic()
+        if not pending and now - self._last_claim >= CLAIM_INTERVAL_SECONDS:
+            self._last_claim = now
+            # Nhận lại event của consumer đã chết (treo quá CLAIM_IDLE_MS chưa ACK)
+            claimed = client.xautoclaim(STREAM, GROUP, CONSUMER, CLAIM_IDLE_MS, "0-0", count=BATCH_SIZE)
+            entries.extend(e for e in claimed[1] if e and e[1])
+            if not entries:
+                self._remove_dead_consumers(client)
+
+        if not entries:
+            resp = client.xreadgroup(
+                GROUP, CONSUMER, {STREAM: "0" if pending else ">"},
+                count=BATCH_SIZE, block=None if pending else BLOCK_MS,
+            )
+            for _, stream_entries in resp or []:
+                entries.extend(stream_entries)
+        if not entries:
+            return 0
+
+        from src.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            apply_events(db, [(eid, fields) for eid, fields in entries if fields])
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        client.xack(STREAM, GROUP, *[eid for eid, _ in entries])
+        return len(entries)
+
+    def _remove_dead_consumers(self, client) -> None:
+        """Chỉ xoá consumer đã hết pending (pending của nó được XAUTOCLAIM nhận lại trước)."""
+        for c in client.xinfo_consumers(STREAM, GROUP):
+            if c["name"] != CONSUMER and not c["pending"] and c["idle"] >= DEAD_CONSUMER_IDLE_MS:
+                client.xgroup_delconsumer(STREAM, GROUP, c["name"])
+                logger.info(f"[PaperProjection] Removed idle consumer {c['name']}")
+
+
+paper_projection_consumer = PaperProjectionConsumer()
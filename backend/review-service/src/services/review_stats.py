@@ -0,0 +1,135 @@
+# backend/review-service/src/services/review_stats.py
+"""
+Read model paper_review_stats: số review, trung bình, phương sai, min/max điểm và điểm
+có trọng số confidence cho từng paper, kèm thống kê theo từng tiêu chí.
+
+refresh_paper_stats() được gọi trong CÙNG transaction với thao tác làm thay đổi review
+(submit, revert về draft, sửa điểm, thêm/sửa tiêu chí) -> chỉ tính lại một paper
+(vài review), còn xếp hạng cả hội nghị là một query có index trên bảng này.
+"""
+import json
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from src import models
+
+SORTABLE_FIELDS = (
+    "mean_score",
+    "weighted_score",
+    "score_variance",
+    "min_score",
+    "max_score",
+    "review_count",
+    "mean_confidence",
+)
+
+
+def _submitted():
+    R = models.Review
+    return or_(R.is_draft == False, R.submitted_at.isnot(None))  # noqa: E712
+
+
+def is_submitted(review: models.Review) -> bool:
+    """Cùng điều kiện với _submitted(): review đã tính vào paper_review_stats."""
+    return review.is_draft is False or review.submitted_at is not None
+
+
+def summarize(values: Sequence[Tuple[float, Optional[int]]]) -> Dict[str, Optional[float]]:
+    """values: (điểm, confidence). Phương sai dạng tổng thể; confidence thiếu coi như 1.
+    Điểm None/NaN bị bỏ qua (không tính vào count)."""
+    values = [(float(v), c) for v, c in values if v is not None and not math.isnan(float(v))]
+    scores = [v for v, _ in values]
+    n = len(scores)
+    if n == 0:
+        return {"count": 0, "mean": None, "variance": None, "min": None, "max": None, "weighted_mean": None}
+
+    mean = sum(scores) / n
+    weights = [float(c) if c else 1.0 for _, c in values]
+    return {
+        "count": n,
+        "mean": mean,
+        "variance": sum((x - mean) ** 2 for x in scores) / n,
+        "min": min(scores),
+        "max": max(scores),
+        "weighted_mean": sum(w * x for w, x in zip(weights, scores)) / sum(weights),
+    }
+
+
+def refresh_paper_stats(db: Session, paper_id: int) -> models.PaperReviewStats:
+    """Tính lại thống kê của một paper; không commit (caller commit cùng thay đổi review)."""
+    A, R, RC = models.Assignment, models.Review, models.ReviewCriteria
+    db.flush()  # SessionLocal autoflush=False: đảm bảo query thấy thay đổi chưa commit
+
+    reviews: List[Tuple[Optional[float], Optional[int]]] = (
+        db.query(R.final_score, R.confidence_score)
+        .join(A, A.id == R.assignment_id)
+        .filter(A.paper_id == paper_id, _submitted())
+        .all()
+    )
+    criteria_rows = (
+        db.query(RC.criteria_name, RC.grade, R.confidence_score)
+        .join(R, R.id == RC.review_id)
+        .join(A, A.id == R.assignment_id)
+        .filter(A.paper_id == paper_id, _submitted(), RC.grade.isnot(None))
+        .all()
+    )
+
+    scored = [(s, c) for s, c in reviews if s is not None]
+    overall = summarize(scored)
+    confidences = [c for _, c in reviews if c is not None]
+
+    by_criteria: Dict[str, List[Tuple[float, Optional[int]]]] = {}
+    for name, grade, conf in criteria_rows:
+        by_criteria.setdefault(name, []).append((grade, conf))
+
+    stats = db.get(models.PaperReviewStats, paper_id)
+    if stats is None:
+        stats = models.PaperReviewStats(paper_id=paper_id)
+        db.add(stats)
+    if stats.conference_id is None:
+        # Conference của bài không đổi: lấy từ bản sao paper_projection / assignment đã gắn sẵn.
+        # Bài chưa biết được ConferenceBackfill điền sau, không hỏi submission-service ở đây.
+        projection = db.get(models.PaperProjection, paper_id)
+        if projection is not None and projection.conference_id is not None:
+            stats.conference_id = projection.conference_id
+        else:
+            row = (
+                db.query(A.conference_id)
+                .filter(A.paper_id == paper_id, A.conference_id.isnot(None))
+                .first()
+            )
+            stats.conference_id = row[0] if row else None
+
+    stats.review_count = len(reviews)
+    stats.scored_count = overall["count"]
+    stats.mean_score = overall["mean"]
+    stats.score_variance = overall["variance"]
+    stats.min_score = overall["min"]
+    stats.max_score = overall["max"]
+    stats.weighted_score = overall["weighted_mean"]
+    stats.mean_confidence = sum(confidences) / len(confidences) if confidences else None
+    stats.criteria_stats = json.dumps(
+        {name: summarize(vals) for name, vals in sorted(by_criteria.items())},
+        ensure_ascii=False,
+    )
+    return stats
+
+
+def paper_id_of_review(db: Session, review_id: int) -> Optional[int]:
+    A, R = models.Assignment, models.Review
+    row = db.query(A.paper_id).join(R, R.assignment_id == A.id).filter(R.id == review_id).first()
+    return row[0] if row else None
+
+
+def rebuild_all(db: Session) -> int:
+    """Dựng lại toàn bộ read model (migration/backfill)."""
+    A, R = models.Assignment, models.Review
+    paper_ids = [
+        p for (p,) in db.query(A.paper_id).join(R, R.assignment_id == A.id).distinct().all()
+    ]
+    for paper_id in paper_ids:
+        refresh_paper_stats(db, paper_id)
+    return len(paper_ids)
@@ -0,0 +1,200 @@
+# backend/review-service/src/services/workspace.py
+"""
+Dữ liệu dashboard của reviewer (GET /me/workspace) trong một request.
+
+- Local: assignment -> review -> COI mở -> trạng thái autosave, mỗi loại MỘT query theo tập
+  (IN) thay vì một request/assignment từ frontend.
+- Thông tin bài (title, track, trạng thái) đọc từ paper_projection; chỉ các bài chưa có bản
+  sao mới hỏi upstream bằng MỘT request GET /submissions/internal/papers?ids=..., chạy song
+  song với phần query local.
+- Cache hai lớp: metadata bài theo paper_id (PAPER_META_TTL, ít thay đổi) và toàn bộ
+  workspace theo reviewer (WORKSPACE_CACHE_TTL, ngắn; bị xoá trên replica này ở mọi thao tác đổi
+  nội dung workspace: tạo/sửa assignment, accept/decline, review/criteria/autosave, COI, gia hạn).
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from src import models
+from src.config import SUBMISSION_SERVICE_URL
+from src.services import paper_projection
+from src.services.draft_store import draft_store
+
+INTERNAL_KEY = os.getenv("INTERNAL_KEY", "")
+WORKSPACE_TTL_SECONDS = float(os.getenv("WORKSPACE_CACHE_TTL", "15"))
+PAPER_META_TTL_SECONDS = float(os.getenv("WORKSPACE_PAPER_TTL", "300"))
+DUE_SOON_HOURS = float(os.getenv("DEADLINE_REMIND_BEFORE_HOURS", "48"))
+
+
+class WorkspaceCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._workspaces: Dict[int, Tuple[float, dict]] = {}
+        self._papers: Dict[int, Tuple[float, dict]] = {}
+
+    def get(self, reviewer_id: int) -> Optional[dict]:
+        with self._lock:
+            hit = self._workspaces.get(reviewer_id)
+        if hit and time.monotonic() - hit[0] < WORKSPACE_TTL_SECONDS:
+            return hit[1]
+        return None
+
+    def put(self, reviewer_id: int, data: dict) -> None:
+        with self._lock:
+            self._workspaces[reviewer_id] = (time.monotonic(), data)
+
+    def invalidate(self, reviewer_id: int) -> None:
+        with self._lock:
+            self._workspaces.pop(reviewer_id, None)
+
+    def invalidate_many(self, reviewer_ids: Iterable[int]) -> None:
+        with self._lock:
+            for reviewer_id in reviewer_ids:
+                self._workspaces.pop(reviewer_id, None)
+
+    def papers(self, paper_ids: List[int]) -> Tuple[Dict[int, dict], List[int]]:
+        """(đã có trong cache, còn thiếu)."""
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for pid in paper_ids:
+                hit = self._papers.get(pid)
+                if hit and now - hit[0] < PAPER_META_TTL_SECONDS:
+                    found[pid] = hit[1]
+                else:
+                    missing.append(pid)
+        return found, missing
+
+    def remember_papers(self, papers: List[dict]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for p in papers:
+                self._papers[p["id"]] = (now, p)
+
+
+workspace_cache = WorkspaceCache()
+
+
+async def fetch_papers(paper_ids: List[int], auth_header: Optional[str] = None) -> Dict[int, dict]:
+    found, missing = workspace_cache.papers(paper_ids)
+    if not missing:
+        return found
+
+    headers = {"X-Internal-Key": INTERNAL_KEY}
+    if auth_header:
+        headers["Authorization"] = auth_header
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            resp = await client.get(
+                f"{SUBMISSION_SERVICE_URL.rstrip('/')}/submissions/internal/papers",
+                params=[("ids", pid) for pid in missing],
+                headers=headers,
+            )
+        if resp.status_code == 200:
+            papers = resp.json() or []
+            workspace_cache.remember_papers(papers)
+            found.update({p["id"]: p for p in papers})
+        else:
+            print(f"[Review Service] Paper lookup failed: {resp.status_code} - {resp.text}")
+    except Exception as e:
+        # Dashboard vẫn hiển thị được (thiếu title/track) khi submission-service lỗi
+        print(f"[Review Service] Paper lookup error: {e}")
+    return found
+
+
+def load_local(db: Session, reviewer_id: int, assignments: list) -> dict:
+    """Review, COI mở, autosave của các assignment (mỗi loại một query)."""
+    A_ids = [a.id for a in assignments]
+    paper_ids = list({a.paper_id for a in assignments})
+    R, C = models.Review, models.ConflictOfInterest
+
+    reviews: Dict[int, models.Review] = {}
+    if A_ids:
+        # Mỗi assignment một review; nếu có nhiều thì lấy bản mới nhất
+        for r in db.query(R).filter(R.assignment_id.in_(A_ids)).order_by(R.id.asc()).all():
+            reviews[r.assignment_id] = r
+
+    open_coi = set()
+    if paper_ids:
+        open_coi = {
+            p for (p,) in db.query(C.paper_id)
+            .filter(C.reviewer_id == reviewer_id, C.paper_id.in_(paper_ids), C.status == models.ConflictStatus.OPEN)
+            .all()
+        }
+
+    pending = draft_store.pending_map([r.id for r in reviews.values()])
+    return {"reviews": reviews, "open_coi": open_coi, "pending": pending}
+
+
+def _review_state(review: Optional[models.Review]) -> str:
+    if review is None:
+        return "none"
+    if review.submitted_at is not None or review.is_draft is False:
+        return "submitted"
+    return "draft"
+
+
+async def build_workspace(db: Session, reviewer_id: int, auth_header: Optional[str] = None) -> dict:
+    A = models.Assignment
+    assignments = await run_in_threadpool(
+        lambda: db.query(A).filter(A.reviewer_id == reviewer_id).order_by(A.due_date.is_(None), A.due_date, A.id).all()
+    )
+    paper_ids = list({a.paper_id for a in assignments})
+    known = {
+        pid: paper_projection.summary(p)
+        for pid, p in (await run_in_threadpool(paper_projection.get_many, db, paper_ids)).items()
+    }
+
+    local, papers = await asyncio.gather(
+        run_in_threadpool(load_local, db, reviewer_id, assignments),
+        fetch_papers([p for p in paper_ids if p not in known], auth_header),
+    )
+    papers.update(known)
+
+    now = datetime.utcnow()
+    soon = now + timedelta(hours=DUE_SOON_HOURS)
+    active = (models.AssignmentStatus.INVITED, models.AssignmentStatus.ACCEPTED)
+    counts = {"total": 0, "invited": 0, "accepted": 0, "completed": 0, "overdue": 0, "due_soon": 0, "coi": 0}
+    items = []
+    for a in assignments:
+        review = local["reviews"].get(a.id)
+        paper = papers.get(a.paper_id) or {}
+        is_active = a.status in active
+        overdue = bool(is_active and a.due_date and a.due_date <= now)
+        due_soon = bool(is_active and a.due_date and now < a.due_date <= soon)
+        has_coi = a.paper_id in local["open_coi"]
+
+        status = getattr(a.status, "value", str(a.status))
+        counts["total"] += 1
+        if status.lower() in counts:
+            counts[status.lower()] += 1
+        counts["overdue"] += overdue
+        counts["due_soon"] += due_soon
+        counts["coi"] += has_coi
+
+        items.append({
+            "assignment_id": a.id,
+            "paper_id": a.paper_id,
+            "paper_title": paper.get("title"),
+            "track_id": paper.get("track_id"),
+            "conference_id": paper.get("conference_id", a.conference_id),
+            "paper_status": paper.get("status"),
+            "assignment_status": status,
+            "due_date": a.due_date,
+            "overdue": overdue,
+            "due_soon": due_soon,
+            "has_open_coi": has_coi,
+            "review_id": review.id if review else None,
+            "review_state": _review_state(review),
+            "draft_pending": bool(review and local["pending"].get(review.id)),
+            "final_score": review.final_score if review else None,
+        })
+
+    return {"reviewer_id": reviewer_id, "generated_at": now, "counts": counts, "items": items}
@@ -0,0 +1,9 @@
+# backend/review-service/tests/conftest.py
+"""Chạy unit test không cần MySQL/Redis: `cd backend/review-service && python -m pytest -q tests`."""
+import os
+import sys
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("REDIS_URL", "")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
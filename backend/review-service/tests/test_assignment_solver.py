@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pytest
+
+from src.services.assignment_solver import SolverInput, solve
+
+
+def _load(result):
+    per_paper = Counter(p for p, _, _ in result.pairs)
+    per_reviewer = Counter(r for _, r, _ in result.pairs)
+    return per_paper, per_reviewer
+
+
+def test_forbidden_pairs_are_never_assigned():
+    # Reviewer 10 là lựa chọn tốt nhất cho bài 1 nhưng có COI
+    inp = SolverInput(
+        paper_ids=[1, 2],
+        reviewer_ids=[10, 11, 12],
+        need={1: 2, 2: 2},
+        capacity={10: 2, 11: 2, 12: 2},
+        bids=[(1, 10, "YES"), (2, 10, "YES")],
+        forbidden=[(1, 10)],
+    )
+    result = solve(inp)
+
+    pairs = {(p, r) for p, r, _ in result.pairs}
+    assert (1, 10) not in pairs
+    assert (2, 10) in pairs
+    assert result.unfilled == {}
+
+
+def test_need_and_capacity_are_respected():
+    inp = SolverInput(
+        paper_ids=[1, 2, 3, 4],
+        reviewer_ids=[10, 11, 12],
+        need={1: 2, 2: 2, 3: 2, 4: 2},
+        capacity={10: 3, 11: 3, 12: 2},
+        bids=[(p, 10, "YES") for p in (1, 2, 3, 4)],
+    )
+    result = solve(inp)
+    per_paper, per_reviewer = _load(result)
+
+    assert len(set((p, r) for p, r, _ in result.pairs)) == len(result.pairs)
+    assert all(per_paper[p] <= inp.need[p] for p in per_paper)
+    assert all(per_reviewer[r] <= inp.capacity[r] for r in per_reviewer)
+    # Tổng capacity = 8 = tổng need -> phủ kín
+    assert sum(per_paper.values()) == 8
+    assert result.unfilled == {}
+
+
+def test_unfilled_when_capacity_is_short():
+    inp = SolverInput(
+        paper_ids=[1, 2],
+        reviewer_ids=[10, 11],
+        need={1: 3, 2: 1},
+        capacity={10: 2, 11: 1},
+        forbidden=[(2, 11)],
+    )
+    result = solve(inp)
+    per_paper, per_reviewer = _load(result)
+
+    assert per_reviewer[10] <= 2 and per_reviewer[11] <= 1
+    # Bài 1 chỉ có 2 reviewer khả dĩ nên thiếu ít nhất 1
+    assert result.unfilled.get(1, 0) >= 1
+    assert sum(per_paper.values()) + sum(result.unfilled.values()) == 4
+
+
+def test_bids_are_preferred():
+    inp = SolverInput(
+        paper_ids=[1],
+        reviewer_ids=[10, 11, 12],
+        need={1: 1},
+        capacity={10: 1, 11: 1, 12: 1},
+        bids=[(1, 11, "YES"), (1, 12, "MAYBE")],
+    )
+    result = solve(inp)
+
+    assert [(p, r) for p, r, _ in result.pairs] == [(1, 11)]
+    assert result.pairs[0][2] == pytest.approx(1.0)
+
+
+def test_zero_need_and_zero_capacity_are_skipped():
+    inp = SolverInput(
+        paper_ids=[1, 2],
+        reviewer_ids=[10, 11],
+        need={1: 0, 2: 1},
+        capacity={10: 0, 11: 1},
+        bids=[(1, 10, "YES"), (2, 10, "YES")],
+    )
+    result = solve(inp)
+
+    assert [(p, r) for p, r, _ in result.pairs] == [(2, 11)]
+    assert result.unfilled == {}
+
+
+def test_empty_input():
+    result = solve(SolverInput(paper_ids=[], reviewer_ids=[], need={}, capacity={}))
+    assert result.pairs == []
+    assert result.unfilled == {}
@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.services.calibration import build_report, calibrate
+
+
+def _arrays(triples):
+    r, p, s = zip(*triples)
+    return np.array(r), np.array(p), np.array(s, dtype=np.float64)
+
+
+def test_harsh_reviewer_is_corrected():
+    # Reviewer 0 chấm thấp hơn reviewer 1 đúng 2 điểm trên mọi bài;
+    # bài 2 chỉ có reviewer khó tính chấm -> điểm thô bị thiệt
+    triples = [
+        (0, 0, 3.0), (1, 0, 5.0),
+        (0, 1, 4.0), (1, 1, 6.0),
+        (0, 2, 5.0),
+        (1, 3, 6.0),
+    ]
+    out = calibrate(*_arrays(triples), n_reviewers=2, n_papers=4)
+
+    assert out["raw_mean"][2] < out["raw_mean"][3]
+    assert out["ls_quality"][2] == pytest.approx(out["ls_quality"][3], abs=0.5)
+    assert out["reviewer_bias"][0] < out["reviewer_bias"][1]
+    assert out["reviewer_mean"].tolist() == pytest.approx([4.0, 17 / 3])
+
+
+def test_papers_without_reviews_are_nan():
+    out = calibrate(*_arrays([(0, 0, 4.0), (1, 0, 6.0)]), n_reviewers=2, n_papers=3)
+
+    assert out["paper_count"].tolist() == [2, 0, 0]
+    for key in ("raw_mean", "zscore_mean", "ls_quality"):
+        assert not math.isnan(out[key][0])
+        assert np.isnan(out[key][1:]).all()
+    assert out["agreement"]["papers_with_multiple_reviews"] == 1
+
+
+def test_single_review_and_constant_reviewers_do_not_divide_by_zero():
+    triples = [(0, 0, 5.0), (1, 0, 3.0), (1, 1, 3.0)]
+    with np.errstate(all="raise"):
+        out = calibrate(*_arrays(triples), n_reviewers=2, n_papers=2)
+
+    assert np.isfinite(out["zscore_mean"]).all()
+    assert np.isfinite(out["ls_quality"]).all()
+    # Reviewer chỉ chấm một mức -> không tính được tương quan
+    assert np.isnan(out["reviewer_corr"]).all()
+
+
+def test_build_report_without_reviews():
+    report = build_report(7, [])
+    assert report["conference_id"] == 7
+    assert report["review_count"] == 0
+
+
+def test_build_report_maps_nan_to_none():
+    report = build_report(7, [(10, 100, 4.0), (11, 100, 6.0), (10, 101, 5.0)])
+    assert report["review_count"] == 3
+    for value in _walk(report):
+        assert not (isinstance(value, float) and math.isnan(value))
+
+
+def _walk(obj):
+    if isinstance(obj, dict):
+        for v in obj.values():
+            yield from _walk(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from _walk(v)
+    else:
+        yield obj
@@ -0,0 +1,101 @@
+import pytest
+
+from src.schemas import DecisionPolicy
+from src.services.decision_engine import (
+    ACCEPTED, REJECTED, UNDECIDED, PolicyError, compute_decisions, validate_policy,
+)
+
+
+def _paper(pid, track_id=1, status="SUBMITTED"):
+    return {"id": pid, "track_id": track_id, "title": f"Paper {pid}", "status": status, "submitter_id": 100 + pid}
+
+
+def _by_id(result):
+    return {d["paper_id"]: d for d in result["decisions"]}
+
+
+def test_threshold_mode():
+    policy = DecisionPolicy(mode="threshold", threshold=5.0)
+    result = compute_decisions(
+        [_paper(1), _paper(2), _paper(3)],
+        {1: (6.0, 3), 2: (5.0, 3), 3: (4.9, 3)},
+        policy,
+    )
+    d = _by_id(result)
+
+    assert [d[p]["decision"] for p in (1, 2, 3)] == [ACCEPTED, ACCEPTED, REJECTED]
+    assert all(x["reason"] == "threshold" for x in d.values())
+    assert result["distribution"] == {ACCEPTED: 2, REJECTED: 1, UNDECIDED: 0}
+    assert result["tracks"][0]["cutoff_score"] == 5.0
+
+
+def test_top_k_ties_break_on_review_count_then_paper_id():
+    policy = DecisionPolicy(mode="top_k_per_track", top_k=2)
+    result = compute_decisions(
+        [_paper(4), _paper(3), _paper(2), _paper(1)],
+        {1: (7.0, 2), 2: (7.0, 3), 3: (7.0, 3), 4: (8.0, 1)},
+        policy,
+    )
+    d = _by_id(result)
+
+    # 4 điểm cao nhất; 2 và 3 hoà điểm & số review -> id nhỏ hơn thắng; 1 ít review hơn
+    assert d[4]["decision"] == ACCEPTED
+    assert d[2]["decision"] == ACCEPTED
+    assert d[3]["decision"] == REJECTED
+    assert d[1]["decision"] == REJECTED
+
+
+def test_top_k_is_per_track():
+    policy = DecisionPolicy(mode="top_k_per_track", top_k=1)
+    result = compute_decisions(
+        [_paper(1, track_id=1), _paper(2, track_id=1), _paper(3, track_id=2)],
+        {1: (6.0, 2), 2: (7.0, 2), 3: (1.0, 2)},
+        policy,
+    )
+    d = _by_id(result)
+
+    assert d[2]["decision"] == ACCEPTED and d[3]["decision"] == ACCEPTED
+    assert d[1]["decision"] == REJECTED
+    assert [(t["track_id"], t["cutoff_score"]) for t in result["tracks"]] == [(1, 7.0), (2, 1.0)]
+
+
+def test_missing_nan_and_insufficient_scores_stay_undecided():
+    policy = DecisionPolicy(mode="top_k_per_track", top_k=5, min_reviews=2)
+    result = compute_decisions(
+        [_paper(1), _paper(2), _paper(3), _paper(4)],
+        {2: (float("nan"), 0), 3: (9.0, 1), 4: (5.0, 2)},
+        policy,
+    )
+    d = _by_id(result)
+
+    assert (d[1]["decision"], d[1]["reason"]) == (None, "no_score")
+    assert (d[2]["decision"], d[2]["reason"]) == (None, "no_score")
+    assert d[2]["score"] is None
+    assert (d[3]["decision"], d[3]["reason"]) == (None, "insufficient_reviews")
+    assert d[4]["decision"] == ACCEPTED
+    assert result["distribution"][UNDECIDED] == 3
+
+
+def test_overrides_apply_last_and_do_not_set_cutoff():
+    policy = DecisionPolicy(mode="threshold", threshold=5.0, overrides={1: REJECTED, 2: ACCEPTED})
+    result = compute_decisions(
+        [_paper(1), _paper(2), _paper(3)],
+        {1: (9.0, 3), 2: (1.0, 3), 3: (6.0, 3)},
+        policy,
+    )
+    d = _by_id(result)
+
+    assert (d[1]["decision"], d[1]["reason"]) == (REJECTED, "override")
+    assert (d[2]["decision"], d[2]["reason"]) == (ACCEPTED, "override")
+    assert result["tracks"][0]["cutoff_score"] == 6.0
+
+
+@pytest.mark.parametrize("policy", [
+    DecisionPolicy(mode="threshold"),
+    DecisionPolicy(mode="top_k_per_track"),
+    DecisionPolicy(mode="threshold", threshold=5.0, score_field="bogus"),
+    DecisionPolicy(mode="threshold", threshold=5.0, overrides={1: "MAYBE"}),
+])
+def test_validate_policy_rejects_incomplete_policies(policy):
+    with pytest.raises(PolicyError):
+        validate_policy(policy)
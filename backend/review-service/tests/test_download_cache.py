@@ -0,0 +1,42 @@
+import pytest
+
+from src.services.download_cache import parse_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=5-5", (5, 5)),
+    ("bytes=990-", (990, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes= 0-9", (0, 9)),
+    # Vượt cuối file -> cắt về byte cuối
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+])
+def test_valid_ranges(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", [
+    None,
+    "",
+    "items=0-9",
+    "bytes=0-9,20-29",       # nhiều khoảng: trả cả file
+    "bytes=1000-",           # bắt đầu ngoài file
+    "bytes=1000-1001",
+    "bytes=20-10",           # end < start
+    "bytes=-0",              # suffix rỗng
+    "bytes=--5",
+    "bytes=a-b",
+    "bytes=0-x",
+    "bytes=-",
+    "bytes=",
+])
+def test_invalid_ranges(header):
+    assert parse_range(header, 1000) is None
+
+
+def test_empty_file_has_no_satisfiable_range():
+    assert parse_range("bytes=0-", 0) is None
+    assert parse_range("bytes=0-0", 0) is None
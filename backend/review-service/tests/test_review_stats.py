@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from src.services.review_stats import summarize
+
+
+def test_empty():
+    assert summarize([]) == {
+        "count": 0, "mean": None, "variance": None, "min": None, "max": None, "weighted_mean": None,
+    }
+
+
+def test_population_variance_and_extremes():
+    out = summarize([(2, 1), (4, 1), (4, 1), (6, 1)])
+    assert out["count"] == 4
+    assert out["mean"] == pytest.approx(4.0)
+    assert out["variance"] == pytest.approx(2.0)
+    assert (out["min"], out["max"]) == (2.0, 6.0)
+
+
+def test_weighted_mean_treats_missing_confidence_as_one():
+    out = summarize([(8, 3), (2, None), (5, 0)])
+    assert out["mean"] == pytest.approx(5.0)
+    assert out["weighted_mean"] == pytest.approx((8 * 3 + 2 + 5) / 5)
+
+
+def test_identical_scores_have_zero_variance():
+    out = summarize([(5, 2), (5, 4)])
+    assert out["variance"] == 0.0
+    assert out["min"] == out["max"] == out["weighted_mean"] == 5.0
+
+
+def test_nan_and_none_scores_are_ignored():
+    out = summarize([(float("nan"), 5), (None, 2), (3, 1), (5, 1)])
+    assert out["count"] == 2
+    assert out["mean"] == pytest.approx(4.0)
+    assert out["weighted_mean"] == pytest.approx(4.0)
+    assert not any(isinstance(v, float) and math.isnan(v) for v in out.values())
+
+
+def test_only_nan_scores_is_empty():
+    assert summarize([(float("nan"), 1)])["count"] == 0
@@ -1,41 +1,85 @@
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, noload
 import os
-from sqlalchemy import desc
+from sqlalchemy import desc, and_, or_, select, update, delete, func
 from datetime import datetime
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
 from . import models, schemas, exceptions
-import requests
+import httpx
 from pypdf import PdfReader
 from .config import settings
+from .utils.pagination import decode_cursor
+from .services.duplicate_index import duplicate_index
+
+
+# Các quan hệ có thể chọn qua tham số fields=
+PAPER_RELATIONS = {
+    "authors": models.Paper.authors,
+    "topics": models.Paper.topics,
+    "versions": models.Paper.versions,
+}
+
+
+def _relation_load_options(fields: Optional[set[str]]):
+    """
+    fields=None -> nạp đủ authors/topics/versions (hành vi cũ).
+    Quan hệ không được chọn dùng noload -> không phát sinh query, trả về [].
+    """
+    return [
+        selectinload(rel) if fields is None or name in fields else noload(rel)
+        for name, rel in PAPER_RELATIONS.items()
+    ]
+
+
+async def get_paper(db: AsyncSession, paper_id: int, with_relations: bool = False) -> Optional[models.Paper]:
+    """
+    Lấy bài theo id. with_relations=True nạp sẵn authors/topics/versions
+    (bắt buộc trước khi trả PaperResponse vì AsyncSession không lazy-load được).
+    """
+    stmt = select(models.Paper).where(models.Paper.id == paper_id)
+    if with_relations:
+        stmt = stmt.options(*_relation_load_options(None)).execution_options(populate_existing=True)
+    result = await db.execute(stmt)
+    return result.scalars().first()
 
 
 # ====================================================
 # 1. CREATE PAPER (Nộp bài)
 # ====================================================
-def create_paper(
-    db: Session, 
-    paper_data: schemas.PaperCreate, 
+async def create_paper(
+    db: AsyncSession,
+    paper_data: schemas.PaperCreate,
     submitter_id: int
 ) -> models.Paper:
-    
+
     # Kiểm tra deadline bên Conference Service
-    validate_submission_window(paper_data.conference_id)
+    await validate_submission_window(paper_data.conference_id)
 
     # Kiểm tra trùng lặp (Logic NV: Không cho nộp trùng bài đang active)
-    existing_paper = db.query(models.Paper).filter(
-        models.Paper.submitter_id == submitter_id,
-        models.Paper.conference_id == paper_data.conference_id,
-        models.Paper.title == paper_data.title,
-        models.Paper.status.notin_([
-            models.PaperStatus.WITHDRAWN, 
-            models.PaperStatus.REJECTED
-        ])
-    ).first()
+    result = await db.execute(
+        select(models.Paper.id).where(
+            models.Paper.submitter_id == submitter_id,
+            models.Paper.conference_id == paper_data.conference_id,
+            models.Paper.title == paper_data.title,
+            models.Paper.status.notin_([
+                models.PaperStatus.WITHDRAWN,
+                models.PaperStatus.REJECTED
+            ])
+        ).limit(1)
+    )
+    existing_paper = result.first()
 
     if existing_paper:
         raise exceptions.BusinessRuleError(
             f"Duplicate submission: You already have an active paper titled '{paper_data.title}' in this conference."
         )
 
+    # Kiểm tra gần trùng (MinHash/LSH): chỉ cảnh báo, không chặn
+    duplicate_candidates = await find_duplicate_candidates(
+        db, paper_data.conference_id, paper_data.title, paper_data.abstract
+    )
+
     # Tạo bài báo
     db_paper = models.Paper(
         title=paper_data.title,
@@ -49,7 +93,8 @@ def create_paper(
         submitted_at=datetime.utcnow()
     )
     db.add(db_paper)
-    db.flush() # Để lấy ID ngay
+    await db.flush() # Để lấy ID ngay
+    db_paper.duplicate_candidates = duplicate_candidates
 
     # Lưu danh sách đồng tác giả
     if paper_data.authors:
@@ -78,29 +123,30 @@ def create_paper(
         db.add_all(db_topics)
 
     return db_paper
-    
+
 
 # ====================================================
 # 2. CREATE VERSION (Tạo version file mới)
 # ====================================================
-def create_new_paper_version(
-    db: Session, 
-    paper_id: int, 
+async def create_new_paper_version(
+    db: AsyncSession,
+    paper_id: int,
     file_url: str,
     is_blind_mode: bool,
     is_camera_ready: bool = False
 )-> models.PaperVersion:
-    
+
     # Lấy version mới nhất để tính số tiếp theo
-    latest = (
-        db.query(models.PaperVersion)
-        .filter(models.PaperVersion.paper_id == paper_id)
+    result = await db.execute(
+        select(models.PaperVersion)
+        .where(models.PaperVersion.paper_id == paper_id)
         .order_by(desc(models.PaperVersion.version_number))
+        .limit(1)
         .with_for_update()
-        .first()
     )
+    latest = result.scalars().first()
     version_number = 1 if not latest else latest.version_number + 1
-    
+
     db_version = models.PaperVersion(
         paper_id=paper_id,
         version_number=version_number,
@@ -109,49 +155,93 @@ def create_new_paper_version(
         is_anonymous=is_blind_mode
     )
     db.add(db_version)
-    return db_version    
+    return db_version
 
 
 # ====================================================
 # 3. GET PAPERS (Danh sách bài của Author)
 # ====================================================
-def get_papers_by_author(
-    db: Session,
-    submitter_id: int
-) -> list[models.Paper]:
-    return (
-        db.query(models.Paper)
-        .options(
-            selectinload(models.Paper.authors),
-            selectinload(models.Paper.topics),
-            selectinload(models.Paper.versions)
+def _apply_listing_filters(
+    stmt,
+    conference_id: Optional[int] = None,
+    track_id: Optional[int] = None,
+    topic_id: Optional[int] = None,
+    status: Optional[models.PaperStatus] = None,
+):
+    if conference_id is not None:
+        stmt = stmt.where(models.Paper.conference_id == conference_id)
+    if track_id is not None:
+        stmt = stmt.where(models.Paper.track_id == track_id)
+    if topic_id is not None:
+        stmt = stmt.where(
+            models.Paper.topics.any(models.PaperTopic.topic_id == topic_id)
         )
-        .filter(models.Paper.submitter_id == submitter_id)
-        .order_by(desc(models.Paper.submitted_at))
-        .all()
+    if status is not None:
+        stmt = stmt.where(models.Paper.status == status)
+    return stmt
+
+
+def _apply_keyset_page(stmt, cursor: Optional[str], limit: Optional[int]):
+    """
+    Keyset pagination trên (submitted_at DESC, id DESC).
+    Trang sau chỉ đọc các bản ghi "nhỏ hơn" bản ghi cuối của trang trước,
+    nên chi phí không tăng theo số trang như OFFSET.
+    """
+    if cursor:
+        ts, last_id = decode_cursor(cursor)
+        if ts is None:
+            stmt = stmt.where(
+                models.Paper.submitted_at.is_(None),
+                models.Paper.id < last_id,
+            )
+        else:
+            stmt = stmt.where(
+                or_(
+                    models.Paper.submitted_at < ts,
+                    and_(models.Paper.submitted_at == ts, models.Paper.id < last_id),
+                    models.Paper.submitted_at.is_(None),
+                )
+            )
+
+    stmt = stmt.order_by(desc(models.Paper.submitted_at), desc(models.Paper.id))
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+async def get_papers_by_author(
+    db: AsyncSession,
+    submitter_id: int,
+    conference_id: Optional[int] = None,
+    track_id: Optional[int] = None,
+    topic_id: Optional[int] = None,
+    status: Optional[models.PaperStatus] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    fields: Optional[set[str]] = None,
+) -> list[models.Paper]:
+    stmt = (
+        select(models.Paper)
+        .options(*_relation_load_options(fields))
+        .where(models.Paper.submitter_id == submitter_id)
     )
+    stmt = _apply_listing_filters(stmt, conference_id, track_id, topic_id, status)
+    result = await db.execute(_apply_keyset_page(stmt, cursor, limit))
+    return list(result.scalars().all())
 
 
 # ====================================================
 # 4. GET DETAIL (Chi tiết bài của Author)
 # ====================================================
-def get_author_paper_detail(
-    db: Session,
+async def get_author_paper_detail(
+    db: AsyncSession,
     paper_id: int,
     submitter_id: int
 ) -> models.Paper:
-    
-    paper = (
-            db.query(models.Paper)
-            .options(
-                selectinload(models.Paper.authors),
-                selectinload(models.Paper.topics),
-                selectinload(models.Paper.versions)
-            )
-            .filter(models.Paper.id == paper_id)
-            .first()
-        )
-    
+
+    paper = await get_paper(db, paper_id, with_relations=True)
+
     if not paper:
         raise exceptions.PaperNotFoundError(f"Paper with id {paper_id} not found")
 
@@ -162,34 +252,51 @@ def get_author_paper_detail(
 
 
 # Helper check quyền sở hữu
-def check_paper_ownership(db: Session, paper_id: int, submitter_id: int):
-    paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
+async def check_paper_ownership(db: AsyncSession, paper_id: int, submitter_id: int):
+    paper = await get_paper(db, paper_id)
     if not paper:
         raise exceptions.PaperNotFoundError(f"Paper {paper_id} not found")
-    
+
     if paper.submitter_id != submitter_id:
         raise exceptions.NotAuthorizedError("You are not the owner of this paper")
-    
+
     return paper
 
 
+async def _get_author_by_email(db: AsyncSession, paper_id: int, email: str):
+    result = await db.execute(
+        select(models.PaperAuthor).where(
+            models.PaperAuthor.paper_id == paper_id,
+            models.PaperAuthor.email == email
+        ).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def _get_paper_author(db: AsyncSession, paper_id: int, author_id: int):
+    result = await db.execute(
+        select(models.PaperAuthor).where(
+            models.PaperAuthor.id == author_id,
+            models.PaperAuthor.paper_id == paper_id
+        )
+    )
+    return result.scalars().first()
+
+
 # ====================================================
 # 5. MANAGE AUTHORS (Thêm/Sửa/Xóa tác giả)
 # ====================================================
-def add_author(db: Session, paper_id: int, submitter_id: int, author_data: schemas.AuthorAdd):
-    paper = check_paper_ownership(db, paper_id, submitter_id)
-    
+async def add_author(db: AsyncSession, paper_id: int, submitter_id: int, author_data: schemas.AuthorAdd):
+    paper = await check_paper_ownership(db, paper_id, submitter_id)
+
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED, models.PaperStatus.WITHDRAWN]:
         raise exceptions.BusinessRuleError("Cannot add authors to a closed paper.")
 
     if paper.status != models.PaperStatus.REVISION_REQUIRED:
-        validate_submission_window(paper.conference_id)
+        await validate_submission_window(paper.conference_id)
+
+    exists = await _get_author_by_email(db, paper_id, author_data.email)
 
-    exists = db.query(models.PaperAuthor).filter(
-        models.PaperAuthor.paper_id == paper_id,
-        models.PaperAuthor.email == author_data.email
-    ).first()
-    
     if exists:
         raise exceptions.BusinessRuleError(f"Author with email '{author_data.email}' already exists in this paper.")
 
@@ -201,56 +308,47 @@ def add_author(db: Session, paper_id: int, submitter_id: int, author_data: schem
         is_corresponding=author_data.is_corresponding,
         user_id=author_data.user_id
     )
-    
+
     db.add(new_author)
-    db.commit()
-    db.refresh(new_author)
+    await db.commit()
+    await db.refresh(new_author)
     return new_author
 
-def remove_author(db: Session, paper_id: int, author_id: int, submitter_id: int):
-    paper = check_paper_ownership(db, paper_id, submitter_id)
+async def remove_author(db: AsyncSession, paper_id: int, author_id: int, submitter_id: int):
+    paper = await check_paper_ownership(db, paper_id, submitter_id)
 
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED]:
         raise exceptions.BusinessRuleError("Cannot remove authors from a closed paper.")
-    
+
     if paper.status != models.PaperStatus.REVISION_REQUIRED:
-        validate_submission_window(paper.conference_id)
+        await validate_submission_window(paper.conference_id)
 
-    author = db.query(models.PaperAuthor).filter(
-        models.PaperAuthor.id == author_id,
-        models.PaperAuthor.paper_id == paper_id
-    ).first()
+    author = await _get_paper_author(db, paper_id, author_id)
 
     if not author:
         raise exceptions.AuthorNotFoundError(f"Author {author_id} not found in paper {paper_id}")
 
-    db.delete(author)
-    db.commit()
+    await db.delete(author)
+    await db.commit()
     return True
 
-def update_author(db: Session, paper_id: int, author_id: int, submitter_id: int, author_data: schemas.AuthorUpdate):
-    paper = check_paper_ownership(db, paper_id, submitter_id)
+async def update_author(db: AsyncSession, paper_id: int, author_id: int, submitter_id: int, author_data: schemas.AuthorUpdate):
+    paper = await check_paper_ownership(db, paper_id, submitter_id)
 
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED, models.PaperStatus.WITHDRAWN]:
         raise exceptions.BusinessRuleError("Cannot edit authors of a closed paper.")
 
     if paper.status != models.PaperStatus.REVISION_REQUIRED:
-        validate_submission_window(paper.conference_id)
+        await validate_submission_window(paper.conference_id)
 
-    author = db.query(models.PaperAuthor).filter(
-        models.PaperAuthor.id == author_id,
-        models.PaperAuthor.paper_id == paper_id
-    ).first()
+    author = await _get_paper_author(db, paper_id, author_id)
 
     if not author:
         raise exceptions.AuthorNotFoundError(f"Author {author_id} not found in paper {paper_id}")
 
     # email duplicate check nếu đổi email
     if author_data.email and author_data.email != author.email:
-        exists = db.query(models.PaperAuthor).filter(
-            models.PaperAuthor.paper_id == paper_id,
-            models.PaperAuthor.email == author_data.email
-        ).first()
+        exists = await _get_author_by_email(db, paper_id, author_data.email)
         if exists:
             raise exceptions.BusinessRuleError(f"Author with email '{author_data.email}' already exists in this paper.")
 
@@ -264,30 +362,32 @@ def update_author(db: Session, paper_id: int, author_id: int, submitter_id: int,
     # nếu set corresponding = true thì đảm bảo chỉ 1 người corresponding
     if author_data.is_corresponding is not None:
         if author_data.is_corresponding:
-            db.query(models.PaperAuthor).filter(
-                models.PaperAuthor.paper_id == paper_id
-            ).update({models.PaperAuthor.is_corresponding: False})
+            await db.execute(
+                update(models.PaperAuthor)
+                .where(models.PaperAuthor.paper_id == paper_id)
+                .values(is_corresponding=False)
+            )
         author.is_corresponding = author_data.is_corresponding
 
-    db.commit()
-    db.refresh(author)
+    await db.commit()
+    await db.refresh(author)
     return author
 
 
 # ====================================================
 # 6. WITHDRAW (Rút bài)
 # ====================================================
-def withdraw_paper(db: Session, paper_id: int, submitter_id: int) -> models.Paper:
-    
-    paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
-    
+async def withdraw_paper(db: AsyncSession, paper_id: int, submitter_id: int) -> models.Paper:
+
+    paper = await get_paper(db, paper_id)
+
     if not paper:
         raise exceptions.PaperNotFoundError(f"Paper {paper_id} not found")
-    
+
     if paper.submitter_id != submitter_id:
         raise exceptions.NotAuthorizedError("You are not the owner of this paper")
 
-    validate_submission_window(paper.conference_id)
+    await validate_submission_window(paper.conference_id)
 
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED]:
         raise exceptions.BusinessRuleError("Cannot withdraw a paper that has been Accepted or Rejected.")
@@ -296,91 +396,96 @@ def withdraw_paper(db: Session, paper_id: int, submitter_id: int) -> models.Pape
         raise exceptions.BusinessRuleError("This paper is already withdrawn.")
 
     paper.status = models.PaperStatus.WITHDRAWN
-    
-    db.commit()
-    db.refresh(paper)
-    return paper
+
+    await db.commit()
+    await refresh_duplicate_index(db, paper)
+    return await get_paper(db, paper_id, with_relations=True)
 
 
 # ====================================================
 # 7. UPDATE METADATA (Cập nhật thông tin bài)
 # ====================================================
-def update_paper_metadata(
-    db: Session, 
-    paper_id: int, 
-    submitter_id: int, 
+async def update_paper_metadata(
+    db: AsyncSession,
+    paper_id: int,
+    submitter_id: int,
     update_data: schemas.PaperUpdate
 ) -> models.Paper:
-    
-    paper = check_paper_ownership(db, paper_id, submitter_id)
+
+    paper = await check_paper_ownership(db, paper_id, submitter_id)
 
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED, models.PaperStatus.WITHDRAWN]:
         raise exceptions.BusinessRuleError("Cannot edit a closed paper.")
 
     if paper.status != models.PaperStatus.REVISION_REQUIRED:
-        validate_submission_window(paper.conference_id)
-        
+        await validate_submission_window(paper.conference_id)
+
     if update_data.title is not None:
         if update_data.title != paper.title:
-            exists = db.query(models.Paper).filter(
-                models.Paper.submitter_id == submitter_id,
-                models.Paper.conference_id == paper.conference_id,
-                models.Paper.title == update_data.title,
-                models.Paper.status.notin_([models.PaperStatus.WITHDRAWN, models.PaperStatus.REJECTED])
-            ).first()
-            if exists:
+            result = await db.execute(
+                select(models.Paper.id).where(
+                    models.Paper.submitter_id == submitter_id,
+                    models.Paper.conference_id == paper.conference_id,
+                    models.Paper.title == update_data.title,
+                    models.Paper.status.notin_([models.PaperStatus.WITHDRAWN, models.PaperStatus.REJECTED])
+                ).limit(1)
+            )
+            if result.first():
                 raise exceptions.BusinessRuleError("Title already exists in another active submission.")
-        
+
         paper.title = update_data.title
 
     if update_data.abstract is not None:
         paper.abstract = update_data.abstract
-        
+
     if update_data.keywords is not None:
         paper.keywords = update_data.keywords
 
     if update_data.topics is not None:
-        db.query(models.PaperTopic).filter(models.PaperTopic.paper_id == paper_id).delete()
-        
+        await db.execute(
+            delete(models.PaperTopic).where(models.PaperTopic.paper_id == paper_id)
+        )
+
         new_topics = [
             models.PaperTopic(paper_id=paper_id, topic_id=t.topic_id)
             for t in update_data.topics
         ]
         db.add_all(new_topics)
 
-    db.commit()
-    db.refresh(paper)
-    return paper
+    await db.commit()
+    await refresh_duplicate_index(db, paper)
+    return await get_paper(db, paper_id, with_relations=True)
 
-def get_next_version_number(db: Session, paper_id: int) -> int:
-    last_ver = (
-        db.query(models.PaperVersion)
-        .filter(models.PaperVersion.paper_id == paper_id)
+async def get_next_version_number(db: AsyncSession, paper_id: int) -> int:
+    result = await db.execute(
+        select(models.PaperVersion.version_number)
+        .where(models.PaperVersion.paper_id == paper_id)
         .order_by(desc(models.PaperVersion.version_number))
-        .first()
+        .limit(1)
     )
-    return 1 if not last_ver else last_ver.version_number + 1
+    last_ver = result.scalar()
+    return 1 if not last_ver else last_ver + 1
 
 
 # ====================================================
 # 8. UPLOAD NEW VERSION (Nộp lại file)
 # ====================================================
-def upload_new_version(
-    db: Session, 
-    paper_id: int, 
-    submitter_id: int, 
+async def upload_new_version(
+    db: AsyncSession,
+    paper_id: int,
+    submitter_id: int,
     file_path: str,
     version_number: int,
     is_blind_mode: bool
 ) -> models.PaperVersion:
-    
-    paper = check_paper_ownership(db, paper_id, submitter_id)
+
+    paper = await check_paper_ownership(db, paper_id, submitter_id)
     if paper.status in [models.PaperStatus.ACCEPTED, models.PaperStatus.REJECTED, models.PaperStatus.WITHDRAWN]:
         raise exceptions.BusinessRuleError("Cannot upload a new file for a closed paper.")
 
     if paper.status != models.PaperStatus.REVISION_REQUIRED:
-        validate_submission_window(paper.conference_id)
-    
+        await validate_submission_window(paper.conference_id)
+
     new_version = models.PaperVersion(
         paper_id=paper_id,
         version_number=version_number,
@@ -395,15 +500,15 @@ def upload_new_version(
         paper.status = models.PaperStatus.SUBMITTED
     paper.submitted_at = datetime.utcnow()
 
-    db.commit()
-    db.refresh(new_version)
+    await db.commit()
+    await db.refresh(new_version)
     return new_version
 
 
 # ====================================================
 # 9. VALIDATE SUBMISSION WINDOW (Hàm quan trọng)
 # ====================================================
-def validate_submission_window(conference_id: int):
+async def validate_submission_window(conference_id: int):
     """
     Gọi sang Conference Service để kiểm tra xem hội nghị có tồn tại và còn hạn nộp bài không.
     """
@@ -411,39 +516,40 @@ def validate_submission_window(conference_id: int):
         # 1. Tạo URL đúng (có /api)
         # Ví dụ: http://conference-service:8000/api/conferences/1
         url = f"{settings.CONFERENCE_SERVICE_URL}/api/conferences/{conference_id}"
-        
+
         # [DEBUG LOG] In ra console để biết đang gọi đi đâu
         print(f"[DEBUG] Validating submission window. Calling URL: {url}")
 
-        # 2. Gọi API
-        resp = requests.get(url, timeout=5)
-        
+        # 2. Gọi API (async: không giữ thread của server trong lúc chờ)
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            resp = await client.get(url)
+
         # 3. Xử lý lỗi 404 (Không tìm thấy hội nghị)
         if resp.status_code == 404:
             # Nếu 404 nghĩa là ID hội nghị sai thật sự -> Chặn
             raise exceptions.BusinessRuleError(f"Conference {conference_id} not found in Conference Service.")
-        
+
         # 4. Xử lý các lỗi khác (500, 403...)
         if resp.status_code != 200:
             print(f"[WARNING] Cannot check conference timeline. Status: {resp.status_code}. Response: {resp.text}")
             # Fail-open: Cho phép nộp bài để tránh chặn nhầm khi service kia lỗi
-            return True 
-            
+            return True
+
         # 5. Parse dữ liệu deadline
         conf_info = schemas.ConferenceExternalInfo(**resp.json())
-        
+
         if conf_info.submission_deadline:
             now = datetime.utcnow()
             # Xử lý timezone nếu cần (ở đây giả sử UTC)
-            deadline = conf_info.submission_deadline.replace(tzinfo=None) 
-            
+            deadline = conf_info.submission_deadline.replace(tzinfo=None)
+
             if now > deadline:
                 raise exceptions.DeadlineExceededError(
                     f"Submission deadline passed. The deadline was {deadline.strftime('%d/%m/%Y %H:%M UTC')}."
                 )
         return conf_info
-    
-    except requests.RequestException as e:
+
+    except httpx.HTTPError as e:
         # Nếu mất kết nối tới Conference Service -> In lỗi nhưng vẫn cho qua (Fail-open)
         print(f"[ERROR] Failed to connect to Conference Service: {str(e)}")
         print("[INFO] Skipping deadline check due to connection error.")
@@ -454,41 +560,160 @@ def validate_submission_window(conference_id: int):
 # 10. CHAIR/ADMIN ACTIONS (Decision, Camera-ready...)
 # ====================================================
 
-def update_paper_decision(
-    db: Session, 
-    paper_id: int, 
+async def update_paper_decision(
+    db: AsyncSession,
+    paper_id: int,
     decision_data: schemas.PaperDecision
 ) -> models.Paper:
-    
-    paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
-    
+
+    paper = await get_paper(db, paper_id)
+
     if not paper:
         raise exceptions.PaperNotFoundError(f"Paper {paper_id} not found")
 
     if paper.status == models.PaperStatus.WITHDRAWN:
         raise exceptions.BusinessRuleError("Cannot change status of a withdrawn paper.")
-    
+
     paper.status = decision_data.status
-    
+
     if decision_data.note is not None:
         paper.decision_note = decision_data.note
-    
-    db.commit()
-    db.refresh(paper)
-    return paper
+
+    await db.commit()
+    return await get_paper(db, paper_id, with_relations=True)
+
+
+async def get_paper_summaries(db: AsyncSession, paper_ids: list[int]) -> list:
+    P = models.Paper
+    if not paper_ids:
+        return []
+    result = await db.execute(
+        select(P.id, P.title, P.conference_id, P.track_id, P.status).where(P.id.in_(paper_ids))
+    )
+    return list(result.all())
+
+
+async def get_paper_snapshots(db: AsyncSession, paper_ids: list[int]) -> list[dict]:
+    """Ảnh chụp bài + version mới nhất (2 query cho cả tập) để phát paper events."""
+    P, V = models.Paper, models.PaperVersion
+    if not paper_ids:
+        return []
+    papers = (await db.execute(
+        select(
+            P.id, P.conference_id, P.track_id, P.submitter_id, P.title, P.status, P.is_blind_mode, P.submitted_at,
+        ).where(P.id.in_(paper_ids))
+    )).all()
+
+    latest = (
+        select(V.paper_id, func.max(V.version_number).label("version_number"))
+        .where(V.paper_id.in_(paper_ids))
+        .group_by(V.paper_id)
+        .subquery()
+    )
+    versions = {
+        v.paper_id: v
+        for v in (await db.execute(
+            select(V.id, V.paper_id, V.version_number, V.file_url, V.created_at)
+            .join(latest, and_(V.paper_id == latest.c.paper_id, V.version_number == latest.c.version_number))
+        )).all()
+    }
+
+    snapshots = []
+    for p in papers:
+        v = versions.get(p.id)
+        snapshots.append({
+            "id": p.id,
+            "conference_id": p.conference_id,
+            "track_id": p.track_id,
+            "submitter_id": p.submitter_id,
+            "title": p.title,
+            "status": getattr(p.status, "value", p.status),
+            "is_blind_mode": bool(p.is_blind_mode),
+            "submitted_at": p.submitted_at.isoformat() if p.submitted_at else None,
+            "latest_version_id": v.id if v else None,
+            "latest_version_number": v.version_number if v else None,
+            "latest_file_url": v.file_url if v else None,
+            "latest_version_created_at": v.created_at.isoformat() if v and v.created_at else None,
+        })
+    return snapshots
+
+
+async def get_decision_candidates(db: AsyncSession, conference_id: int) -> list:
+    """Bài (chưa rút) của hội nghị, chỉ các cột cần cho engine quyết định."""
+    P = models.Paper
+    result = await db.execute(
+        select(P.id, P.title, P.track_id, P.status, P.submitter_id)
+        .where(P.conference_id == conference_id, P.status != models.PaperStatus.WITHDRAWN)
+        .order_by(P.id)
+    )
+    return list(result.all())
 
 
-def submit_camera_ready(
-    db: Session, 
-    paper_id: int, 
-    submitter_id: int, 
+async def bulk_update_paper_decisions(
+    db: AsyncSession,
+    conference_id: int,
+    items: list[schemas.PaperDecisionItem],
+) -> dict:
+    """
+    Ghi quyết định cho nhiều bài trong MỘT transaction: một SELECT kiểm tra, UPDATE theo lô
+    (executemany theo khoá chính). Bài không thuộc hội nghị / đã rút bị bỏ qua, không làm hỏng cả lô.
+    """
+    P = models.Paper
+    by_id = {it.paper_id: it for it in items}
+    result = await db.execute(
+        select(P.id, P.conference_id, P.status, P.submitter_id, P.title).where(P.id.in_(list(by_id)))
+    )
+    rows = {r.id: r for r in result.all()}
+
+    updated, skipped = [], []
+    with_note, without_note = [], []
+    for paper_id, it in by_id.items():
+        row = rows.get(paper_id)
+        if row is None:
+            skipped.append({"paper_id": paper_id, "reason": "not_found"})
+            continue
+        if row.conference_id != conference_id:
+            skipped.append({"paper_id": paper_id, "reason": "other_conference"})
+            continue
+        if row.status == models.PaperStatus.WITHDRAWN:
+            skipped.append({"paper_id": paper_id, "reason": "withdrawn"})
+            continue
+
+        if it.note is not None:
+            with_note.append({"id": paper_id, "status": it.status, "decision_note": it.note})
+        else:
+            without_note.append({"id": paper_id, "status": it.status})
+        updated.append({
+            "paper_id": paper_id,
+            "status": it.status,
+            "previous_status": row.status,
+            "submitter_id": row.submitter_id,
+            "title": row.title,
+        })
+
+    # note=None giữ nguyên decision_note như PUT /{paper_id}/decision
+    for params in (with_note, without_note):
+        if params:
+            await db.execute(update(P), params)
+    await db.commit()
+    return {"updated": updated, "skipped": skipped}
+
+
+def _count_pdf_pages(file_path: str) -> int:
+    return len(PdfReader(file_path).pages)
+
+
+async def submit_camera_ready(
+    db: AsyncSession,
+    paper_id: int,
+    submitter_id: int,
     file_path: str
 ) -> models.PaperVersion:
-    
-    paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
+
+    paper = await get_paper(db, paper_id)
     if not paper:
         raise exceptions.PaperNotFoundError(f"Paper {paper_id} not found")
-    
+
     if paper.submitter_id != submitter_id:
         raise exceptions.BusinessRuleError("You are not the owner of this paper.")
 
@@ -498,77 +723,151 @@ def submit_camera_ready(
         )
 
     try:
-        reader = PdfReader(file_path)
-        num_pages = len(reader.pages)
+        # Đọc PDF là tác vụ CPU/IO đồng bộ -> đẩy sang threadpool
+        num_pages = await run_in_threadpool(_count_pdf_pages, file_path)
         MAX_PAGES = 15
         if num_pages > MAX_PAGES:
             os.remove(file_path)
             raise exceptions.BusinessRuleError(f"File exceeds page limit. Max is {MAX_PAGES}, got {num_pages}.")
-            
+
     except Exception as e:
         if os.path.exists(file_path):
             os.remove(file_path)
         raise exceptions.BusinessRuleError(f"Invalid PDF file. Details: {str(e)}")
 
-    next_ver = get_next_version_number(db, paper_id)
+    next_ver = await get_next_version_number(db, paper_id)
 
     new_version = models.PaperVersion(
         paper_id=paper_id,
         version_number=next_ver,
         file_url=file_path,
-        is_camera_ready=True,  
-        is_anonymous=False 
+        is_camera_ready=True,
+        is_anonymous=False
     )
-    
+
     db.add(new_version)
-    db.commit()
-    db.refresh(new_version)
+    await db.commit()
+    await db.refresh(new_version)
     return new_version
 
 
 # ====================================================
-# 11. OTHER HELPERS
+# 11. NEAR-DUPLICATE DETECTION (MinHash/LSH)
 # ====================================================
 
-def check_spelling_with_ai(text: str):
+async def _sync_duplicate_index(db: AsyncSession, conference_id: int) -> None:
+    """
+    Đưa index của process này về khớp DB: bài mới / bài sửa (kể cả qua worker khác) được băm lại,
+    bài đã rút bị gỡ. Chỉ đọc các bài có updated_at từ mốc đã đồng bộ (index ix_papers_conference_updated).
+    """
+    P = models.Paper
+    since = duplicate_index.sync_since(conference_id)
+    query = select(
+        P.id, P.title, P.abstract, P.submitter_id,
+        P.status == models.PaperStatus.WITHDRAWN, P.updated_at,
+    ).where(P.conference_id == conference_id)
+    if since is None:
+        query = query.where(P.status != models.PaperStatus.WITHDRAWN)
+    else:
+        query = query.where(P.updated_at >= since)
+    result = await db.execute(query.order_by(P.id))
+    duplicate_index.sync(conference_id, result.all())
+
+
+async def find_duplicate_candidates(
+    db: AsyncSession,
+    conference_id: int,
+    title: str,
+    abstract: str,
+    exclude_paper_id: Optional[int] = None,
+    threshold: Optional[float] = None,
+) -> list[dict]:
+    try:
+        await _sync_duplicate_index(db, conference_id)
+        return duplicate_index.find_candidates(
+            conference_id,
+            title,
+            abstract,
+            threshold=threshold if threshold is not None else settings.DUPLICATE_JACCARD_THRESHOLD,
+            exclude_paper_id=exclude_paper_id,
+        )
+    except Exception as e:
+        # Index lỗi không được chặn việc nộp bài
+        print(f"[WARNING] Duplicate check skipped: {e}")
+        return []
+
+
+async def refresh_duplicate_index(db: AsyncSession, paper: models.Paper) -> None:
+    try:
+        await _sync_duplicate_index(db, paper.conference_id)
+        duplicate_index.upsert(paper)
+    except Exception as e:
+        print(f"[WARNING] Failed to update duplicate index for paper {paper.id}: {e}")
+
+
+async def get_duplicate_clusters(db: AsyncSession, conference_id: int, threshold: Optional[float] = None) -> list[dict]:
+    await _sync_duplicate_index(db, conference_id)
+    return duplicate_index.clusters(
+        conference_id,
+        threshold=threshold if threshold is not None else settings.DUPLICATE_JACCARD_THRESHOLD,
+    )
+
+
+# ====================================================
+# 12. OTHER HELPERS
+# ====================================================
+
+async def check_spelling_with_ai(text: str):
     payload = {
         "text": text,
         "type": "ABSTRACT"
     }
     try:
-        response = requests.post(f"{settings.INTELLIGENT_URL}/author/refine", json=payload, timeout=10)
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(f"{settings.INTELLIGENT_SERVICE_URL}/author/refine", json=payload)
         if response.status_code == 200:
             return response.json()
     except Exception as e:
         print(f"AI Service unavailable: {e}")
         return None
-    
-def send_notification_email(to_email: str, subject: str, content: str):
+
+async def send_notification_email(to_email: str, subject: str, content: str):
     payload = {
         "email": to_email,
         "subject": subject,
         "content": content
     }
-    
+
     try:
-        requests.post(settings.NOTIFICATION_URL, json=payload, timeout=5)
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            await client.post(settings.NOTIFICATION_SERVICE_URL, json=payload)
     except Exception as e:
         print(f"Failed to send email notification: {e}")
 
 
-def get_papers_for_bidding(db: Session, exclude_submitter_id: int = None) -> list[models.Paper]:
+async def get_papers_for_bidding(
+    db: AsyncSession,
+    exclude_submitter_id: int = None,
+    conference_id: Optional[int] = None,
+    track_id: Optional[int] = None,
+    topic_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[models.Paper]:
     """
     Lấy danh sách bài cho Reviewer chọn (Bidding).
     """
-    query = (
-        db.query(models.Paper)
+    stmt = (
+        select(models.Paper)
         .options(
             selectinload(models.Paper.topics),
         )
-        .filter(models.Paper.status == models.PaperStatus.SUBMITTED)
+        .where(models.Paper.status == models.PaperStatus.SUBMITTED)
     )
 
     if exclude_submitter_id:
-        query = query.filter(models.Paper.submitter_id != exclude_submitter_id)
+        stmt = stmt.where(models.Paper.submitter_id != exclude_submitter_id)
 
-    return query.order_by(desc(models.Paper.submitted_at)).all()
\ No newline at end of file
+    stmt = _apply_listing_filters(stmt, conference_id, track_id, topic_id)
+    result = await db.execute(_apply_keyset_page(stmt, cursor, limit))
+    return list(result.scalars().all())
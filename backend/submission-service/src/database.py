@@ -1,15 +1,41 @@
-# Dependency để lấy database session (Dùng trong router)
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config import settings
 
 
+# Engine đồng bộ: dùng cho create_all, seed, script và các job chạy nền (thread/process riêng)
 engine = create_engine(
     settings.DATABASE_URL, 
     pool_pre_ping=True
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _to_async_url(url: str) -> str:
+    """mysql+pymysql -> mysql+aiomysql, sqlite -> sqlite+aiosqlite"""
+    if url.startswith("mysql+pymysql://"):
+        return url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    if url.startswith("mysql://"):
+        return url.replace("mysql://", "mysql+aiomysql://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+# Engine bất đồng bộ: dùng cho toàn bộ API (routers/crud)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _to_async_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+)
+# expire_on_commit=False: object vẫn đọc được sau commit mà không phát sinh lazy-load
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -17,4 +43,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -3,42 +3,108 @@ import json
 import os
 import sys
 import time
+from multiprocessing import Process
 
-def main():
-    kafka_host = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
-    topic_name = "system_logs"
+from src.services.activity_store import ActivityStore, row_from_message
 
-    print(f" [Kafka Worker] Connecting to {kafka_host}...")
-    
+# Số message tối đa mỗi lần flush và thời gian tối đa giữ buffer trước khi flush
+BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+FLUSH_INTERVAL_SECONDS = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "2"))
+RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "30"))
+
+
+def connect(kafka_host: str, topic_name: str) -> KafkaConsumer:
     # Retry kết nối
-    consumer = None
     while True:
         try:
             consumer = KafkaConsumer(
                 topic_name,
                 bootstrap_servers=[kafka_host],
-                auto_offset_reset='latest',
-                enable_auto_commit=True,
+                auto_offset_reset='earliest',
+                # Chỉ commit offset sau khi đã ghi xong lô -> không mất log khi worker chết
+                enable_auto_commit=False,
+                max_poll_records=BATCH_SIZE,
                 group_id='logging-group',
-                value_deserializer=lambda x: json.loads(x.decode('utf-8'))
+                value_deserializer=lambda x: _safe_json(x)
             )
             print(" [Kafka Worker] Connected! Waiting for logs...")
-            break
+            return consumer
         except Exception:
             print(" [Kafka Worker] Retrying connection in 5s...")
             time.sleep(5)
 
-    for message in consumer:
-        log_data = message.value
-        # Giả lập hành động ghi log vào file hoặc ElasticSearch
-        print(f" =========================================")
-        print(f" [LOGGING SERVICE] New Event Received:")
-        print(f" TYPE: {log_data.get('type')}")
-        print(f" DETAIL: {log_data.get('details')}")
-        print(f" =========================================")
+
+def _safe_json(raw: bytes):
+    try:
+        return json.loads(raw.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        # Message hỏng vẫn được lưu (dạng text) thay vì làm chết consumer
+        return {"type": "UNPARSEABLE", "details": raw.decode('utf-8', errors='replace')}
+
+
+def run_consumer(worker_id: int):
+    kafka_host = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "kafka:9092")
+    topic_name = "system_logs"
+
+    print(f" [Kafka Worker {worker_id}] Connecting to {kafka_host}...")
+    consumer = connect(kafka_host, topic_name)
+    store = ActivityStore()
+
+    buffer = []
+    last_flush = time.monotonic()
+    last_purge = 0.0
+
+    try:
+        while True:
+            polled = consumer.poll(timeout_ms=500, max_records=BATCH_SIZE)
+            for records in polled.values():
+                buffer.extend(row_from_message(m) for m in records)
+
+            due = buffer and (
+                len(buffer) >= BATCH_SIZE or time.monotonic() - last_flush >= FLUSH_INTERVAL_SECONDS
+            )
+            if due:
+                try:
+                    inserted = store.write_batch(buffer)
+                except Exception as e:
+                    # Không commit offset và ngừng đọc thêm (buffer không phình ra) đến khi ghi được;
+                    # poll() vẫn được gọi để giữ chỗ trong consumer group.
+                    # Pause lại mỗi lần lỗi: partition mới nhận sau rebalance cũng bị dừng.
+                    print(f" [Kafka Worker {worker_id}] Flush failed, pausing consumption: {e}")
+                    consumer.pause(*consumer.assignment())
+                    time.sleep(1)
+                    continue
+                consumer.commit()
+                if consumer.paused():
+                    consumer.resume(*consumer.paused())
+                    print(f" [Kafka Worker {worker_id}] Store recovered, resuming consumption")
+                print(f" [Kafka Worker {worker_id}] Flushed {len(buffer)} events ({inserted} new)")
+                buffer = []
+                last_flush = time.monotonic()
+
+            if time.monotonic() - last_purge > 3600:
+                store.purge_older_than(RETENTION_DAYS)
+                last_purge = time.monotonic()
+    finally:
+        consumer.close()
+        store.close()
+
+
+def main():
+    # Mỗi process là một consumer trong cùng group: Kafka chia partition cho các process
+    workers = int(os.getenv("ACTIVITY_CONSUMERS", "1"))
+    if workers <= 1:
+        run_consumer(0)
+        return
+
+    processes = [Process(target=run_consumer, args=(i,), daemon=True) for i in range(workers)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
 
 if __name__ == '__main__':
     try:
         main()
     except KeyboardInterrupt:
-        sys.exit(0)
\ No newline at end of file
+        sys.exit(0)
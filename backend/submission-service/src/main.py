@@ -1,5 +1,7 @@
 import os
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from prometheus_fastapi_instrumentator import Instrumentator 
@@ -10,15 +12,33 @@ from src.rabbitmq_client import publish_message as send_email_task
 from .database import engine, Base
 from .routers import submissions
 from .config import settings
+from .migrations import run_migrations
+from .utils.idempotency import IdempotencyMiddleware
+from .security.jwt import decode_access_token
 
 # Tạo bảng Database nếu chưa có
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 app = FastAPI(
     title="UTH Conference Submission Service",
-    root_path="/submission"
+    root_path="/submission",
+    default_response_class=ORJSONResponse,
 )
 
+# Idempotency-Key cho API nộp bài (client retry không tạo bài/file/email trùng).
+# Thêm trước GZip -> nằm trong: response lưu để phát lại là bản chưa nén.
+app.add_middleware(
+    IdempotencyMiddleware,
+    redis_url=settings.REDIS_URL,
+    routes=[("POST", "/submissions")],
+    namespace="submission-service",
+    decode_token=decode_access_token,
+)
+
+# JSON qua orjson + nén gzip cho response lớn (danh sách), bỏ qua response nhỏ
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Cấu hình CORS (Để Frontend React gọi được)
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 # Kích hoạt Monitoring (Grafana/Prometheus)
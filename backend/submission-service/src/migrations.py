@@ -0,0 +1,77 @@
+# backend/submission-service/src/migrations.py
+"""
+Migration có đánh số phiên bản cho submission-service.
+
+create_all chỉ tạo bảng còn thiếu, không thêm index/cột vào bảng đã có.
+Mỗi migration chạy đúng một lần; phiên bản đã áp dụng được ghi trong bảng
+schema_migrations. Thêm thay đổi schema mới = thêm một phần tử vào MIGRATIONS
+(không sửa migration đã phát hành).
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from . import models
+
+_meta = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _meta,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _ensure_indexes(conn: Connection, table: Table, names: List[str]) -> None:
+    """Tạo các index (khai báo trong __table_args__ của model) nếu DB chưa có."""
+    existing = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in names and index.name not in existing:
+            index.create(conn)
+
+
+def _0001_query_indexes(conn: Connection) -> None:
+    _ensure_indexes(conn, models.Paper.__table__, [
+        "ix_papers_submitter_conference_title",
+        "ix_papers_submitter_submitted",
+        "ix_papers_status_submitted",
+        "ix_papers_conference_status_submitted",
+    ])
+    _ensure_indexes(conn, models.PaperVersion.__table__, ["ix_paper_versions_paper_version"])
+    _ensure_indexes(conn, models.PaperAuthor.__table__, ["ix_paper_authors_paper_email"])
+    _ensure_indexes(conn, models.PaperTopic.__table__, ["ix_paper_topics_topic_paper"])
+
+
+def _0002_paper_updated_at(conn: Connection) -> None:
+    columns = {c["name"] for c in inspect(conn).get_columns("papers")}
+    if "updated_at" not in columns:
+        conn.execute(text("ALTER TABLE papers ADD COLUMN updated_at DATETIME NULL"))
+    conn.execute(text("UPDATE papers SET updated_at = COALESCE(submitted_at, created_at) WHERE updated_at IS NULL"))
+    _ensure_indexes(conn, models.Paper.__table__, ["ix_papers_conference_updated"])
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Composite indexes for duplicate check, author/bidding listings and versions", _0001_query_indexes),
+    (2, "papers.updated_at for incremental duplicate index sync", _0002_paper_updated_at),
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    _meta.create_all(bind=engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                schema_migrations.insert().values(
+                    version=version, description=description, applied_at=datetime.utcnow()
+                )
+            )
+        print(f"[Migrations] Applied {version}: {description}")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from sqlalchemy.dialects.mysql import JSON
@@ -35,6 +35,8 @@ class Paper(Base):
 
     submitted_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Đổi mỗi lần sửa cột của bài (title/abstract/status...): duplicate index đồng bộ theo cột này
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # 1 paper có nhiều versions (phiên bản file)
     versions = relationship("PaperVersion", back_populates="paper", cascade="all, delete-orphan")
@@ -45,6 +47,19 @@ class Paper(Base):
     # 1 paper thuộc nhiều topics (chủ đề)
     topics = relationship("PaperTopic", back_populates="paper", cascade="all, delete-orphan")
 
+    # Index theo đúng dạng truy vấn (xem migrations.py):
+    # - kiểm tra nộp trùng: submitter_id + conference_id + title
+    # - danh sách của author / bidding: lọc rồi sắp (submitted_at DESC, id DESC) cho keyset
+    # - export, proceedings: theo conference_id (+ status)
+    # - duplicate index: các bài của conference thay đổi sau mốc đã đồng bộ
+    __table_args__ = (
+        Index("ix_papers_submitter_conference_title", "submitter_id", "conference_id", "title"),
+        Index("ix_papers_submitter_submitted", "submitter_id", "submitted_at", "id"),
+        Index("ix_papers_status_submitted", "status", "submitted_at", "id"),
+        Index("ix_papers_conference_status_submitted", "conference_id", "status", "submitted_at"),
+        Index("ix_papers_conference_updated", "conference_id", "updated_at"),
+    )
+
 
 # 3. Bảng Tác giả (Paper Authors)
 class PaperAuthor(Base):
@@ -62,6 +77,10 @@ class PaperAuthor(Base):
 
     paper = relationship("Paper", back_populates="authors")
 
+    __table_args__ = (
+        Index("ix_paper_authors_paper_email", "paper_id", "email"),
+    )
+
 
 # 4. Bảng Phiên bản file (Paper Versions)
 class PaperVersion(Base):
@@ -79,6 +98,11 @@ class PaperVersion(Base):
 
     paper = relationship("Paper", back_populates="versions")
 
+    # Lấy version mới nhất / camera-ready của một bài
+    __table_args__ = (
+        Index("ix_paper_versions_paper_version", "paper_id", "version_number"),
+    )
+
 
 # 5. Bảng Chủ đề bài báo (Paper Topics)
 class PaperTopic(Base):
@@ -90,4 +114,9 @@ class PaperTopic(Base):
 
     paper = relationship("Paper", back_populates="topics")
 
+    # Lọc bài theo topic (EXISTS ... WHERE topic_id = ? AND paper_id = papers.id)
+    __table_args__ = (
+        Index("ix_paper_topics_topic_paper", "topic_id", "paper_id"),
+    )
+
 
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Header
-from sqlalchemy.orm import Session, selectinload
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, BackgroundTasks, Header, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 import json
+import hashlib
 import httpx
+import orjson
 import os
 import shutil
-from datetime import datetime
+import zipfile
+from datetime import datetime, timedelta
 
 from .. import database, crud, schemas, exceptions, models
 from ..config import settings
 from ..utils.file_handler import save_paper_file, delete_paper_version_file
+from ..utils.pagination import encode_cursor, page_limit, NEXT_CURSOR_HEADER, MAX_PAGE_SIZE
+from ..services import similarity_sweep, export, proceedings, bulk_import, paper_events
+from ..services.activity_store import ActivityStore
 
 from ..security.deps import get_current_payload, require_roles
 
@@ -34,6 +42,32 @@ def _notification_endpoint() -> str:
         return base
     return f"{base}/api/notifications"
 
+def _parse_fields(fields: Optional[str]) -> Optional[set]:
+    """
+    fields=authors,topics -> {"authors", "topics"}. Không truyền -> None (nạp đủ).
+    """
+    if fields is None:
+        return None
+    selected = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = selected - set(crud.PAPER_RELATIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {sorted(unknown)}. Allowed: {sorted(crud.PAPER_RELATIONS)}",
+        )
+    return selected
+
+def _set_next_cursor(response: Response, papers: list, limit: Optional[int]) -> None:
+    # Trang đầy -> còn dữ liệu, trả cursor của bản ghi cuối qua header
+    if limit is not None and len(papers) == limit:
+        last = papers[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.submitted_at, last.id)
+
+def _write_upload(upload_file: UploadFile, file_path: str) -> None:
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(upload_file.file, buffer)
+
+
 # --- HÀM GỌI API ---
 def call_notification_service_task(payload: dict):
     notification_url = settings.NOTIFICATION_SERVICE_URL
@@ -58,18 +92,314 @@ def call_notification_service_task(payload: dict):
     response_model=List[schemas.PaperBiddingResponse], 
     dependencies=[Depends(require_roles(["REVIEWER", "CHAIR", "ADMIN"]))],
 )
-def get_open_papers_for_bidding(
-    db: Session = Depends(database.get_db),
+async def get_open_papers_for_bidding(
+    response: Response,
+    conference_id: Optional[int] = Query(default=None),
+    track_id: Optional[int] = Query(default=None),
+    topic_id: Optional[int] = Query(default=None),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     user_id = payload.get("user_id")
     if not user_id:
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
-    papers = crud.get_papers_for_bidding(db, exclude_submitter_id=user_id)
+    limit = page_limit(cursor, limit)
+    try:
+        papers = await crud.get_papers_for_bidding(
+            db,
+            exclude_submitter_id=user_id,
+            conference_id=conference_id,
+            track_id=track_id,
+            topic_id=topic_id,
+            cursor=cursor,
+            limit=limit,
+        )
+    except exceptions.BusinessRuleError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    _set_next_cursor(response, papers, limit)
     return papers
 
 
+# Internal: snapshot bài mở bidding cho review-service (có ETag để revalidate rẻ)
+@router.get(
+    "/internal/open-for-bidding",
+    response_model=List[schemas.PaperBiddingSnapshotItem],
+)
+async def get_bidding_snapshot(
+    conference_id: Optional[int] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    x_internal_key: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    if not settings.INTERNAL_KEY or x_internal_key != settings.INTERNAL_KEY:
+        raise HTTPException(status_code=401, detail="Invalid internal key")
+
+    papers = await crud.get_papers_for_bidding(db, conference_id=conference_id)
+    body = orjson.dumps([
+        schemas.PaperBiddingSnapshotItem.model_validate(p).model_dump(mode="json") for p in papers
+    ])
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# -----------------------------
+# Chair/Admin: Near-duplicate detection
+# -----------------------------
+@router.post(
+    "/duplicates/check",
+    response_model=List[schemas.DuplicateCandidate],
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+async def check_duplicate_submission(
+    req: schemas.DuplicateCheckRequest,
+    threshold: Optional[float] = Query(default=None, gt=0, le=1),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    return await crud.find_duplicate_candidates(
+        db,
+        conference_id=req.conference_id,
+        title=req.title,
+        abstract=req.abstract,
+        exclude_paper_id=req.exclude_paper_id,
+        threshold=threshold,
+    )
+
+
+@router.get(
+    "/duplicates",
+    response_model=List[schemas.DuplicateCluster],
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+async def list_duplicate_clusters(
+    conference_id: int = Query(...),
+    threshold: Optional[float] = Query(default=None, gt=0, le=1),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    return await crud.get_duplicate_clusters(db, conference_id, threshold=threshold)
+
+
+# -----------------------------
+# Chair/Admin: Full-text similarity sweep
+# -----------------------------
+@router.post(
+    "/similarity/sweep",
+    response_model=schemas.SimilaritySweepStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def start_similarity_sweep(
+    background_tasks: BackgroundTasks,
+    conference_id: int = Query(...),
+):
+    if not similarity_sweep.try_start(conference_id):
+        raise HTTPException(status_code=409, detail="Similarity sweep is already running for this conference")
+
+    workers = settings.SIMILARITY_SWEEP_WORKERS or None
+    background_tasks.add_task(similarity_sweep.run_sweep, conference_id, workers)
+    return {**similarity_sweep.get_status(conference_id), "state": "queued"}
+
+
+@router.get(
+    "/similarity/status",
+    response_model=schemas.SimilaritySweepStatus,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_similarity_sweep_status(conference_id: int = Query(...)):
+    return similarity_sweep.get_status(conference_id)
+
+
+@router.get(
+    "/similarity/report",
+    response_model=List[schemas.SimilarityPaperReport],
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_similarity_report(
+    conference_id: int = Query(...),
+    min_overlap: float = Query(default=0.0, ge=0, le=1),
+):
+    report = similarity_sweep.get_report(conference_id)
+    rows = [r for r in report.values() if r["max_overlap"] >= min_overlap]
+    rows.sort(key=lambda r: r["max_overlap"], reverse=True)
+    return rows
+
+
+@router.get(
+    "/similarity/report/{paper_id}",
+    response_model=schemas.SimilarityPaperReport,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_paper_similarity_report(paper_id: int, conference_id: int = Query(...)):
+    row = similarity_sweep.get_report(conference_id, paper_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="No similarity report for this paper")
+    return row
+
+
+# -----------------------------
+# Admin: Activity log (ghi bởi kafka_worker)
+# -----------------------------
+@router.get(
+    "/activity",
+    response_model=List[schemas.ActivityEvent],
+    dependencies=[Depends(require_roles(["ADMIN"]))],
+)
+def list_activity(
+    response: Response,
+    event_type: Optional[str] = Query(default=None, alias="type"),
+    since: Optional[datetime] = Query(default=None),
+    until: Optional[datetime] = Query(default=None),
+    cursor: Optional[int] = Query(default=None, description="id nhỏ nhất của trang trước"),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    store = ActivityStore()
+    try:
+        events = store.query(event_type=event_type, since=since, until=until, before_id=cursor, limit=limit)
+    finally:
+        store.close()
+
+    if len(events) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = str(events[-1]["id"])
+    return events
+
+
+@router.get(
+    "/activity/summary",
+    response_model=List[schemas.ActivityTypeSummary],
+    dependencies=[Depends(require_roles(["ADMIN"]))],
+)
+def activity_summary(hours: int = Query(default=24, ge=1, le=24 * 30)):
+    store = ActivityStore()
+    try:
+        return store.summary(since=datetime.utcnow() - timedelta(hours=hours))
+    finally:
+        store.close()
+
+
+# -----------------------------
+# Chair/Admin: Proceedings volume
+# -----------------------------
+@router.post(
+    "/proceedings/build",
+    response_model=schemas.ProceedingsStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def start_proceedings_build(
+    background_tasks: BackgroundTasks,
+    conference_id: int = Query(...),
+):
+    if not proceedings.try_start(conference_id):
+        raise HTTPException(status_code=409, detail="Proceedings build is already running for this conference")
+
+    background_tasks.add_task(proceedings.run_build, conference_id)
+    return {**proceedings.get_status(conference_id), "state": "queued"}
+
+
+@router.get(
+    "/proceedings/status",
+    response_model=schemas.ProceedingsStatus,
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_proceedings_status(conference_id: int = Query(...)):
+    return proceedings.get_status(conference_id)
+
+
+@router.get(
+    "/proceedings/toc",
+    response_model=List[schemas.ProceedingsTocEntry],
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def get_proceedings_toc(conference_id: int = Query(...)):
+    return proceedings.get_toc(conference_id)
+
+
+@router.get(
+    "/proceedings/volume",
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+def download_proceedings_volume(conference_id: int = Query(...)):
+    path = proceedings.volume_path(conference_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Proceedings volume has not been built yet")
+    return FileResponse(
+        path,
+        media_type="application/pdf",
+        filename=f"conference_{conference_id}_proceedings.pdf",
+    )
+
+
+# -----------------------------
+# Chair/Admin: Bulk export
+# -----------------------------
+@router.get(
+    "/export",
+    dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
+)
+async def export_submissions(
+    conference_id: int = Query(...),
+    export_format: str = Query(default="csv", alias="format", pattern="^(csv|jsonl|parquet)$"),
+    compress: bool = Query(default=True, description="Nén gzip cho csv/jsonl (parquet luôn nén theo cột)"),
+):
+    """
+    Xuất toàn bộ bài của hội nghị (kèm authors, topics, version mới nhất) dạng luồng.
+    Bộ nhớ cố định: đọc DB theo lô bằng server-side cursor và nén từng lô.
+    """
+    return StreamingResponse(
+        export.stream_export(conference_id, export_format, compress),
+        media_type=export.media_type(export_format, compress),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export.filename(conference_id, export_format, compress)}"'
+        },
+    )
+
+
+# -----------------------------
+# Admin: Bulk import (manifest CSV/JSON + zip PDF)
+# -----------------------------
+@router.post(
+    "/import",
+    response_model=schemas.BulkImportReport,
+    dependencies=[Depends(require_roles(["ADMIN"]))],
+)
+async def import_submissions(
+    conference_id: int = Form(...),
+    manifest: UploadFile = File(...),
+    archive: UploadFile = File(...),
+    db: AsyncSession = Depends(database.get_async_db),
+    payload=Depends(get_current_payload),
+):
+    """
+    Nhập hàng loạt bài (migrate từ hệ thống khác), bỏ qua kiểm tra hạn nộp.
+    Trả về báo cáo: các dòng đã nhập (kèm paper_id) và lỗi theo từng dòng manifest.
+    """
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Token missing user_id")
+
+    try:
+        report = await run_in_threadpool(
+            bulk_import.run_import,
+            conference_id,
+            user_id,
+            manifest.file,
+            manifest.filename,
+            archive.file,
+        )
+    except bulk_import.ImportRowError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (zipfile.BadZipFile, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid import files: {str(e)}")
+
+    await paper_events.publish(db, paper_events.CREATED, [row["paper_id"] for row in report["imported"]])
+    return report
+
+
 # API nộp bài: AUTHOR/ADMIN
 @router.post(
     "/",
@@ -77,11 +407,11 @@ def get_open_papers_for_bidding(
     status_code=status.HTTP_201_CREATED,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def submit_paper(
+async def submit_paper(
     background_tasks: BackgroundTasks,
     metadata: str = Form(...),
     file: UploadFile = File(...),
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     created_paper_id = None
@@ -98,14 +428,14 @@ def submit_paper(
         except Exception as json_error:
             raise HTTPException(status_code=400, detail=f"Invalid JSON format: {str(json_error)}")
 
-        paper = crud.create_paper(
+        paper = await crud.create_paper(
             db=db,
             paper_data=paper_data,
             submitter_id=submitter_id,
         )
         created_paper_id = paper.id
 
-        version = crud.create_new_paper_version(
+        version = await crud.create_new_paper_version(
             db=db,
             paper_id=paper.id,
             file_url="TEMP_URL_HOLDER",
@@ -113,15 +443,26 @@ def submit_paper(
         )
         created_version_number = version.version_number
 
-        file_url = save_paper_file(
+        # Ghi file là I/O đồng bộ -> chạy trong threadpool, không chặn event loop
+        file_url = await run_in_threadpool(
+            save_paper_file,
             paper_id=paper.id,
             version_number=version.version_number,
             upload_file=file,
         )
         version.file_url = file_url
 
-        db.commit()
-        db.refresh(paper)
+        await db.commit()
+        await paper_events.publish(db, paper_events.CREATED, [paper.id])
+        await crud.refresh_duplicate_index(db, paper)
+        paper = await crud.get_paper(db, paper.id, with_relations=True)
+
+        # Author chỉ thấy cảnh báo trùng với bài của chính mình (giữ ẩn danh bài khác)
+        if "ADMIN" not in (payload.get("roles") or []):
+            paper.duplicate_candidates = [
+                c for c in paper.duplicate_candidates
+                if c["submitter_id"] == submitter_id
+            ]
 
         recipient_email = None
         recipient_name = "Author"
@@ -150,7 +491,7 @@ def submit_paper(
         return paper
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f" Error submitting paper: {str(e)}")
 
         if created_paper_id is not None and created_version_number is not None:
@@ -171,15 +512,49 @@ def submit_paper(
     response_model=List[schemas.PaperResponse],
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def get_my_submissions(
-    db: Session = Depends(database.get_db),
+async def get_my_submissions(
+    response: Response,
+    conference_id: Optional[int] = Query(default=None),
+    track_id: Optional[int] = Query(default=None),
+    topic_id: Optional[int] = Query(default=None),
+    paper_status: Optional[models.PaperStatus] = Query(default=None, alias="status"),
+    cursor: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(default=None, description="VD: topics hoặc authors,topics,versions"),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
+    """
+    Danh sách bài của author.
+    - Không truyền limit/cursor: trả toàn bộ như cũ.
+    - Có limit (hoặc chỉ có cursor -> limit = DEFAULT_PAGE_SIZE): phân trang keyset,
+      cursor trang sau nằm ở header X-Next-Cursor.
+    - fields: chỉ nạp các quan hệ được chọn, quan hệ còn lại trả về [].
+    """
     submitter_id = payload.get("user_id")
     if not submitter_id:
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
-    return crud.get_papers_by_author(db, submitter_id)
+    selected_fields = _parse_fields(fields)
+    limit = page_limit(cursor, limit)
+
+    try:
+        papers = await crud.get_papers_by_author(
+            db,
+            submitter_id,
+            conference_id=conference_id,
+            track_id=track_id,
+            topic_id=topic_id,
+            status=paper_status,
+            cursor=cursor,
+            limit=limit,
+            fields=selected_fields,
+        )
+    except exceptions.BusinessRuleError as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    _set_next_cursor(response, papers, limit)
+    return papers
 
 
 # =========================================================
@@ -189,9 +564,9 @@ def get_my_submissions(
     "/{paper_id}",
     response_model=schemas.PaperResponse,
 )
-def get_submission_detail(
+async def get_submission_detail(
     paper_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload: dict = Depends(get_current_payload),  # Vẫn validate token user (nếu có)
     x_internal_key: Optional[str] = Header(default=None) # Hứng Internal Key
 ):
@@ -199,7 +574,7 @@ def get_submission_detail(
     # Nếu Key đúng -> Cho phép lấy bài báo bất kỳ (dùng cho AI Service, Review Service...)
     if x_internal_key and x_internal_key == settings.INTERNAL_KEY:
         # Lấy bài báo trực tiếp từ DB (bỏ qua check owner)
-        paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
+        paper = await crud.get_paper(db, paper_id, with_relations=True)
         if not paper:
             raise HTTPException(status_code=404, detail="Paper not found")
         return paper
@@ -213,7 +588,7 @@ def get_submission_detail(
 
     # Admin hoặc Chair được xem mọi bài
     if "ADMIN" in roles or "CHAIR" in roles:
-         paper = db.query(models.Paper).filter(models.Paper.id == paper_id).first()
+         paper = await crud.get_paper(db, paper_id, with_relations=True)
          if not paper:
             raise HTTPException(status_code=404, detail="Paper not found")
          return paper
@@ -221,7 +596,7 @@ def get_submission_detail(
     # Author chỉ được xem bài của mình
     if "AUTHOR" in roles:
         try:
-            return crud.get_author_paper_detail(db=db, paper_id=paper_id, submitter_id=submitter_id)
+            return await crud.get_author_paper_detail(db=db, paper_id=paper_id, submitter_id=submitter_id)
         except exceptions.PaperNotFoundError as e:
             raise HTTPException(status_code=404, detail=str(e))
         except exceptions.NotAuthorizedError as e:
@@ -237,10 +612,10 @@ def get_submission_detail(
     response_model=schemas.AuthorResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def add_co_author(
+async def add_co_author(
     paper_id: int,
     author_data: schemas.AuthorAdd,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -248,7 +623,7 @@ def add_co_author(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        return crud.add_author(db, paper_id, submitter_id, author_data)
+        return await crud.add_author(db, paper_id, submitter_id, author_data)
 
     except exceptions.PaperNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message)
@@ -266,10 +641,10 @@ def add_co_author(
     status_code=status.HTTP_204_NO_CONTENT,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def remove_co_author(
+async def remove_co_author(
     paper_id: int,
     author_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -277,7 +652,7 @@ def remove_co_author(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        crud.remove_author(db, paper_id, author_id, submitter_id)
+        await crud.remove_author(db, paper_id, author_id, submitter_id)
         return
     except exceptions.AuthorNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message)
@@ -293,9 +668,9 @@ def remove_co_author(
     response_model=schemas.PaperResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def withdraw_submission(
+async def withdraw_submission(
     paper_id: int,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -303,7 +678,7 @@ def withdraw_submission(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        return crud.withdraw_paper(db, paper_id, submitter_id)
+        paper = await crud.withdraw_paper(db, paper_id, submitter_id)
     except exceptions.PaperNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message)
     except exceptions.NotAuthorizedError as e:
@@ -311,6 +686,9 @@ def withdraw_submission(
     except exceptions.BusinessRuleError as e:
         raise HTTPException(status_code=400, detail=e.message)
 
+    await paper_events.publish(db, paper_events.WITHDRAWN, [paper_id])
+    return paper
+
 
 # Update metadata: AUTHOR/ADMIN
 @router.put(
@@ -318,10 +696,10 @@ def withdraw_submission(
     response_model=schemas.PaperResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def update_paper_details(
+async def update_paper_details(
     paper_id: int,
     update_data: schemas.PaperUpdate,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -329,7 +707,7 @@ def update_paper_details(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        return crud.update_paper_metadata(db, paper_id, submitter_id, update_data)
+        paper = await crud.update_paper_metadata(db, paper_id, submitter_id, update_data)
     except exceptions.PaperNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message)
     except exceptions.NotAuthorizedError as e:
@@ -337,6 +715,9 @@ def update_paper_details(
     except exceptions.BusinessRuleError as e:
         raise HTTPException(status_code=400, detail=e.message)
 
+    await paper_events.publish(db, paper_events.UPDATED, [paper_id])
+    return paper
+
 
 # Upload new file version: AUTHOR/ADMIN
 @router.post(
@@ -344,10 +725,10 @@ def update_paper_details(
     response_model=schemas.PaperVersionResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def update_paper_file(
+async def update_paper_file(
     paper_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -355,16 +736,15 @@ def update_paper_file(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        next_ver = crud.get_next_version_number(db, paper_id)
+        next_ver = await crud.get_next_version_number(db, paper_id)
 
         base_dir = f"uploads/papers/{paper_id}/v{next_ver}"
         os.makedirs(base_dir, exist_ok=True)
 
         file_path = f"{base_dir}/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await run_in_threadpool(_write_upload, file, file_path)
 
-        return crud.upload_new_version(
+        version = await crud.upload_new_version(
             db=db,
             paper_id=paper_id,
             submitter_id=submitter_id,
@@ -380,6 +760,9 @@ def update_paper_file(
     except exceptions.BusinessRuleError as e:
         raise HTTPException(status_code=400, detail=e.message)
 
+    await paper_events.publish(db, paper_events.VERSION_ADDED, [paper_id])
+    return version
+
 
 # Quyết định bài: CHAIR/ADMIN
 @router.put(
@@ -387,18 +770,68 @@ def update_paper_file(
     response_model=schemas.PaperResponse,
     dependencies=[Depends(require_roles(["CHAIR", "ADMIN"]))],
 )
-def make_decision_on_paper(
+async def make_decision_on_paper(
     paper_id: int,
     decision: schemas.PaperDecision,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     try:
-        return crud.update_paper_decision(db=db, paper_id=paper_id, decision_data=decision)
+        paper = await crud.update_paper_decision(db=db, paper_id=paper_id, decision_data=decision)
     except exceptions.PaperNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except exceptions.BusinessRuleError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    await paper_events.publish(db, paper_events.STATUS_CHANGED, [paper_id])
+    return paper
+
+
+# Internal: tra nhiều bài một lần (?ids=1&ids=2...) thay vì gọi GET /{paper_id} từng bài
+@router.get(
+    "/internal/papers",
+    response_model=List[schemas.PaperSummary],
+)
+async def get_paper_summaries(
+    ids: List[int] = Query(..., max_length=1000),
+    x_internal_key: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    if not settings.INTERNAL_KEY or x_internal_key != settings.INTERNAL_KEY:
+        raise HTTPException(status_code=401, detail="Invalid internal key")
+    return await crud.get_paper_summaries(db, list(set(ids)))
+
+
+# Internal: danh sách bài để review-service tính quyết định hàng loạt
+@router.get(
+    "/internal/decision-candidates",
+    response_model=List[schemas.PaperDecisionCandidate],
+)
+async def get_decision_candidates(
+    conference_id: int = Query(...),
+    x_internal_key: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    if not settings.INTERNAL_KEY or x_internal_key != settings.INTERNAL_KEY:
+        raise HTTPException(status_code=401, detail="Invalid internal key")
+    return await crud.get_decision_candidates(db, conference_id)
+
+
+# Internal: ghi quyết định hàng loạt (một request, một transaction)
+@router.put(
+    "/internal/decisions",
+    response_model=schemas.PaperDecisionBatchResult,
+)
+async def apply_decisions_batch(
+    batch: schemas.PaperDecisionBatch,
+    x_internal_key: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(database.get_async_db),
+):
+    if not settings.INTERNAL_KEY or x_internal_key != settings.INTERNAL_KEY:
+        raise HTTPException(status_code=401, detail="Invalid internal key")
+    result = await crud.bulk_update_paper_decisions(db, batch.conference_id, batch.items)
+    await paper_events.publish(db, paper_events.STATUS_CHANGED, [u["paper_id"] for u in result["updated"]])
+    return result
+
 
 # Camera-ready: AUTHOR/ADMIN (chủ bài)
 @router.post(
@@ -406,10 +839,10 @@ def make_decision_on_paper(
     response_model=schemas.PaperVersionResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def upload_camera_ready(
+async def upload_camera_ready(
     paper_id: int,
     file: UploadFile = File(...),
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -425,13 +858,12 @@ def upload_camera_ready(
     file_path = f"{upload_dir}/camera_ready_{file.filename}"
 
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await run_in_threadpool(_write_upload, file, file_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Could not save file: {str(e)}")
 
     try:
-        return crud.submit_camera_ready(db=db, paper_id=paper_id, submitter_id=submitter_id, file_path=file_path)
+        version = await crud.submit_camera_ready(db=db, paper_id=paper_id, submitter_id=submitter_id, file_path=file_path)
     except exceptions.PaperNotFoundError as e:
         if os.path.exists(file_path):
             os.remove(file_path)
@@ -440,6 +872,9 @@ def upload_camera_ready(
         if os.path.exists(file_path):
             os.remove(file_path)
         raise HTTPException(status_code=400, detail=str(e))
+
+    await paper_events.publish(db, paper_events.VERSION_ADDED, [paper_id])
+    return version
     
     
 # UPDATE tác giả: AUTHOR/ADMIN
@@ -448,11 +883,11 @@ def upload_camera_ready(
     response_model=schemas.AuthorResponse,
     dependencies=[Depends(require_roles(["AUTHOR", "ADMIN"]))],
 )
-def update_author(
+async def update_author(
     paper_id: int,
     author_id: int,
     author_data: schemas.AuthorUpdate,   # tạo schema mới
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
     payload=Depends(get_current_payload),
 ):
     submitter_id = payload.get("user_id")
@@ -460,7 +895,7 @@ def update_author(
         raise HTTPException(status_code=401, detail="Token missing user_id")
 
     try:
-        return crud.update_author(db, paper_id, author_id, submitter_id, author_data)
+        return await crud.update_author(db, paper_id, author_id, submitter_id, author_data)
     except exceptions.PaperNotFoundError as e:
         raise HTTPException(status_code=404, detail=e.message)
     except exceptions.AuthorNotFoundError as e:
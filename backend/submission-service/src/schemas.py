@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Any, List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -72,6 +72,121 @@ class PaperCreate(PaperBase):
     topics: List[PaperTopicCreate]
 
 
+class DuplicateCandidate(BaseModel):
+    paper_id: int
+    title: str
+    submitter_id: int
+    similarity: float
+
+
+class DuplicateCheckRequest(BaseModel):
+    conference_id: int
+    title: str
+    abstract: str = ""
+    exclude_paper_id: Optional[int] = None
+
+
+class DuplicateCluster(BaseModel):
+    paper_ids: List[int]
+    papers: List[DuplicateCandidate]
+    max_similarity: float
+
+
+class SimilarityMatch(BaseModel):
+    paper_id: int
+    shared: int
+    overlap: float
+
+
+class SimilarityPaperReport(BaseModel):
+    paper_id: int
+    version_id: int
+    fingerprint_count: int
+    max_overlap: float
+    matches: List[SimilarityMatch] = []
+
+
+class SimilaritySweepStatus(BaseModel):
+    conference_id: int
+    state: str
+    total: Optional[int] = None
+    to_process: Optional[int] = None
+    processed: Optional[int] = None
+    errors: Optional[int] = None
+    pairs: Optional[int] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class ProceedingsTocEntry(BaseModel):
+    paper_id: int
+    version_id: int
+    title: str
+    authors: str
+    track_id: Optional[int] = None
+    start_page: int
+    end_page: int
+    page_count: int
+
+
+class ProceedingsStatus(BaseModel):
+    conference_id: int
+    state: str
+    total: Optional[int] = None
+    processed: Optional[int] = None
+    reused: Optional[int] = None
+    merged: Optional[int] = None
+    included: Optional[int] = None
+    page_count: Optional[int] = None
+    up_to_date: Optional[bool] = None
+    missing: List[int] = []
+    failed: List[int] = []
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class BulkImportRow(BaseModel):
+    row: int
+    ref: Optional[str] = None
+    paper_id: int
+
+
+class BulkImportError(BaseModel):
+    row: int
+    ref: Optional[str] = None
+    error: str
+
+
+class BulkImportReport(BaseModel):
+    conference_id: int
+    total_rows: int
+    imported_count: int
+    error_count: int
+    imported: List[BulkImportRow] = []
+    errors: List[BulkImportError] = []
+
+
+class ActivityEvent(BaseModel):
+    id: int
+    topic: str
+    partition: int
+    offset: int
+    type: Optional[str] = None
+    details: Optional[Any] = None
+    event_time: datetime
+    received_at: datetime
+
+
+class ActivityTypeSummary(BaseModel):
+    type: Optional[str] = None
+    count: int
+    last_seen: Optional[datetime] = None
+
+
 class PaperResponse(PaperBase):
     id: int
     submitter_id: int
@@ -86,6 +201,9 @@ class PaperResponse(PaperBase):
     topics: List[PaperTopicResponse]
     versions: List[PaperVersionResponse]
 
+    # Chỉ có giá trị ngay sau khi nộp bài (cảnh báo bài gần trùng)
+    duplicate_candidates: List[DuplicateCandidate] = []
+
     class Config:
         from_attributes = True
 
@@ -136,6 +254,44 @@ class PaperDecision(BaseModel):
     status: PaperStatus
     note: Optional[str] = None
 
+# Internal: thông tin tóm tắt nhiều bài trong một request (workspace của reviewer)
+class PaperSummary(BaseModel):
+    id: int
+    title: str
+    conference_id: int
+    track_id: int
+    status: PaperStatus
+
+# Internal: quyết định hàng loạt từ review-service
+class PaperDecisionCandidate(BaseModel):
+    id: int
+    title: str
+    track_id: int
+    status: PaperStatus
+    submitter_id: int
+
+class PaperDecisionItem(PaperDecision):
+    paper_id: int
+
+class PaperDecisionBatch(BaseModel):
+    conference_id: int
+    items: List[PaperDecisionItem] = Field(min_length=1, max_length=20000)
+
+class PaperDecisionApplied(BaseModel):
+    paper_id: int
+    status: PaperStatus
+    previous_status: PaperStatus
+    submitter_id: int
+    title: str
+
+class PaperDecisionSkipped(BaseModel):
+    paper_id: int
+    reason: str
+
+class PaperDecisionBatchResult(BaseModel):
+    updated: List[PaperDecisionApplied] = []
+    skipped: List[PaperDecisionSkipped] = []
+
 class PaperBiddingResponse(BaseModel):
     id: int
     title: str
@@ -145,4 +301,9 @@ class PaperBiddingResponse(BaseModel):
     topics: List[PaperTopicResponse] = []
     submitted_at: Optional[datetime] = None
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PaperBiddingSnapshotItem(PaperBiddingResponse):
+    # Chỉ dùng cho API nội bộ: review-service tự loại bài của chính reviewer
+    conference_id: int
+    submitter_id: int
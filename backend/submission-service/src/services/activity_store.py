@@ -0,0 +1,143 @@
+# backend/submission-service/src/services/activity_store.py
+"""
+Kho lưu activity log (topic Kafka system_logs) dạng SQLite cục bộ.
+
+- Chế độ WAL: nhiều worker (mỗi worker giữ vài partition) ghi tuần tự theo lô,
+  API đọc song song không bị chặn.
+- UNIQUE(topic, partition, offset) + INSERT OR IGNORE: consumer chỉ commit offset
+  sau khi flush, nên khi chạy lại sau sự cố các message bị đọc lại sẽ không trùng.
+"""
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from ..config import settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity_events (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic       TEXT    NOT NULL,
+    partition   INTEGER NOT NULL,
+    "offset"    INTEGER NOT NULL,
+    type        TEXT,
+    details     TEXT,
+    event_time  TEXT    NOT NULL,
+    received_at TEXT    NOT NULL,
+    UNIQUE (topic, partition, "offset")
+);
+CREATE INDEX IF NOT EXISTS ix_activity_events_time ON activity_events (event_time);
+CREATE INDEX IF NOT EXISTS ix_activity_events_type_time ON activity_events (type, event_time);
+"""
+
+# (topic, partition, offset, type, details_json, event_time_iso)
+ActivityRow = Tuple[str, int, int, Optional[str], str, str]
+
+
+def default_path() -> str:
+    return settings.ACTIVITY_STORE_PATH or os.path.join(settings.UPLOAD_DIR, "activity", "activity.db")
+
+
+class ActivityStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_path()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---------------- Ghi ----------------
+    def write_batch(self, rows: Iterable[ActivityRow]) -> int:
+        received_at = datetime.utcnow().isoformat()
+        with self._conn:  # một transaction cho cả lô
+            cur = self._conn.executemany(
+                'INSERT OR IGNORE INTO activity_events (topic, partition, "offset", type, details, event_time, received_at) '
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, received_at) for row in rows],
+            )
+        return cur.rowcount
+
+    def purge_older_than(self, days: int) -> int:
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM activity_events WHERE event_time < ?", (cutoff,))
+        return cur.rowcount
+
+    # ---------------- Đọc ----------------
+    def query(
+        self,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        limit: int = 100,
+    ) -> List[dict]:
+        """Mới nhất trước; before_id là cursor (id nhỏ nhất của trang trước)."""
+        clauses, params = [], []
+        if event_type:
+            clauses.append("type = ?")
+            params.append(event_type)
+        if since:
+            clauses.append("event_time >= ?")
+            params.append(_iso(since))
+        if until:
+            clauses.append("event_time < ?")
+            params.append(_iso(until))
+        if before_id:
+            clauses.append("id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._conn.execute(
+            f'SELECT id, topic, partition, "offset", type, details, event_time, received_at '
+            f"FROM activity_events {where} ORDER BY id DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [
+            {**dict(r), "details": _loads(r["details"])}
+            for r in rows
+        ]
+
+    def summary(self, since: datetime) -> List[dict]:
+        rows = self._conn.execute(
+            "SELECT type, COUNT(*) AS count, MAX(event_time) AS last_seen "
+            "FROM activity_events WHERE event_time >= ? GROUP BY type ORDER BY count DESC",
+            (_iso(since),),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def _iso(value: datetime) -> str:
+    """Mốc thời gian lưu dạng ISO UTC không timezone -> so sánh chuỗi đúng thứ tự."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _loads(value: Optional[str]):
+    if value is None:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def row_from_message(message) -> ActivityRow:
+    """Chuyển ConsumerRecord (kafka-python) thành dòng lưu trữ."""
+    value = message.value if isinstance(message.value, dict) else {"details": message.value}
+    ts_ms = message.timestamp if message.timestamp and message.timestamp > 0 else int(time.time() * 1000)
+    return (
+        message.topic,
+        message.partition,
+        message.offset,
+        value.get("type"),
+        json.dumps(value.get("details"), ensure_ascii=False, default=str),
+        datetime.utcfromtimestamp(ts_ms / 1000).isoformat(),
+    )
@@ -0,0 +1,361 @@
+# backend/submission-service/src/services/bulk_import.py
+"""
+Nhập hàng loạt bài nộp từ manifest (CSV kiểu EasyChair / JSON / JSONL) + file zip chứa PDF.
+
+Manifest được đọc theo luồng và xử lý theo lô IMPORT_BATCH_SIZE dòng:
+1. Validate từng dòng (schemas.PaperCreate), kiểm tra PDF có trong zip,
+   kiểm tra trùng tiêu đề (trong manifest và với bài đang active trong DB: 1 query/lô).
+2. Thêm Paper của cả lô rồi flush để lấy id; authors/topics/versions
+   chèn bằng executemany.
+3. Ghi PDF song song (ThreadPoolExecutor), mỗi lô là một transaction riêng.
+Dòng lỗi không làm hỏng cả lô: được ghi vào báo cáo lỗi theo số dòng.
+
+Cột CSV:
+  ref, title, abstract, keywords, track_id, topic_ids, authors,
+  corresponding_email, submitter_id, status, submitted_at, is_blind_mode, file
+- keywords, topic_ids: phân tách bằng ';'
+- authors: "Họ tên <email> | Tổ chức; Họ tên <email>; ..."
+  (không có corresponding_email -> tác giả đầu tiên là tác giả liên hệ)
+Manifest JSON/JSONL dùng cùng tên trường; authors/keywords/topic_ids có thể là mảng.
+"""
+import codecs
+import csv
+import json
+import os
+import re
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert
+
+from .. import models, schemas
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.file_handler import PAPERS_DIR
+
+IMPORT_BATCH_SIZE = 200
+IMPORT_FILE_WORKERS = 8
+
+_AUTHOR_RE = re.compile(r"^\s*(?P<name>[^<|]+?)\s*<(?P<email>[^>]+)>\s*(?:\|\s*(?P<org>.+?))?\s*$")
+
+
+class ImportRowError(Exception):
+    pass
+
+
+# ----------------------------------------------------
+# Đọc manifest theo luồng
+# ----------------------------------------------------
+def iter_manifest(fileobj: BinaryIO, filename: str) -> Iterator[Tuple[int, dict]]:
+    """Trả về (số dòng, record) - số dòng tính từ 1, không tính header CSV."""
+    name = (filename or "").lower()
+    text = codecs.getreader("utf-8-sig")(fileobj)
+
+    if name.endswith(".csv"):
+        for i, row in enumerate(csv.DictReader(text), start=1):
+            yield i, row
+    elif name.endswith(".jsonl") or name.endswith(".ndjson"):
+        for i, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield i, json.loads(line)
+            except ValueError:
+                yield i, None
+    elif name.endswith(".json"):
+        # Mảng JSON phải đọc trọn; manifest lớn nên dùng CSV/JSONL để đọc theo luồng
+        for i, row in enumerate(json.load(text), start=1):
+            yield i, row
+    else:
+        raise ImportRowError("Manifest must be .csv, .json or .jsonl")
+
+
+def _split(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(";") if v.strip()]
+
+
+def _parse_authors(value, corresponding_email: Optional[str]) -> List[dict]:
+    if isinstance(value, list) and all(isinstance(a, dict) for a in value):
+        authors = [dict(a) for a in value]
+    else:
+        authors = []
+        for chunk in _split(value):
+            m = _AUTHOR_RE.match(chunk)
+            if not m:
+                raise ImportRowError(f"Cannot parse author '{chunk}' (expected 'Name <email> | Organization')")
+            authors.append({
+                "full_name": m.group("name"),
+                "email": m.group("email").strip(),
+                "organization": m.group("org"),
+            })
+    if not authors:
+        raise ImportRowError("At least one author is required")
+
+    if not any(a.get("is_corresponding") for a in authors):
+        target = (corresponding_email or "").strip().lower()
+        match = next((a for a in authors if target and (a.get("email") or "").lower() == target), authors[0])
+        match["is_corresponding"] = True
+    return authors
+
+
+def _ref(value) -> Optional[str]:
+    return None if value in (None, "") else str(value)
+
+
+def _parse_bool(value, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def parse_row(record: dict, conference_id: int, default_submitter_id: int) -> dict:
+    try:
+        paper = schemas.PaperCreate(
+            title=(record.get("title") or "").strip(),
+            abstract=(record.get("abstract") or "").strip(),
+            keywords=_split(record.get("keywords")),
+            conference_id=conference_id,
+            track_id=record.get("track_id"),
+            is_blind_mode=_parse_bool(record.get("is_blind_mode"), True),
+            authors=_parse_authors(record.get("authors"), record.get("corresponding_email")),
+            topics=[{"topic_id": t} for t in _split(record.get("topic_ids"))],
+        )
+    except ValidationError as e:
+        raise ImportRowError("; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+        ))
+    if not paper.title:
+        raise ImportRowError("Title is required")
+
+    status = (record.get("status") or models.PaperStatus.SUBMITTED.value).strip().upper()
+    try:
+        status = models.PaperStatus(status)
+    except ValueError:
+        raise ImportRowError(f"Unknown status '{status}'")
+
+    submitted_at = record.get("submitted_at")
+    try:
+        submitted_at = datetime.fromisoformat(str(submitted_at).replace("Z", "")) if submitted_at else datetime.utcnow()
+    except ValueError:
+        raise ImportRowError(f"Invalid submitted_at '{submitted_at}'")
+
+    file_name = (record.get("file") or "").strip()
+    if not file_name:
+        raise ImportRowError("Column 'file' is required")
+
+    submitter_id = record.get("submitter_id")
+    try:
+        submitter_id = int(submitter_id) if submitter_id not in (None, "") else default_submitter_id
+    except ValueError:
+        raise ImportRowError(f"Invalid submitter_id '{submitter_id}'")
+
+    return {
+        "ref": _ref(record.get("ref")),
+        "paper": paper,
+        "status": status,
+        "submitted_at": submitted_at,
+        "submitter_id": submitter_id,
+        "file": file_name,
+    }
+
+
+# ----------------------------------------------------
+# Ghi file
+# ----------------------------------------------------
+def _archive_index(archive: zipfile.ZipFile) -> Dict[str, zipfile.ZipInfo]:
+    """Tra file theo đường dẫn đầy đủ lẫn tên file (zip thường có thư mục gốc)."""
+    index: Dict[str, zipfile.ZipInfo] = {}
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        index.setdefault(info.filename, info)
+        index.setdefault(os.path.basename(info.filename), info)
+    return index
+
+
+def _write_pdf(archive: zipfile.ZipFile, info: zipfile.ZipInfo, paper_id: int) -> str:
+    version_dir = os.path.join(PAPERS_DIR, str(paper_id), "v1")
+    os.makedirs(version_dir, exist_ok=True)
+    with archive.open(info) as src, open(os.path.join(version_dir, "paper.pdf"), "wb") as dst:
+        if src.read(5) != b"%PDF-":
+            raise ImportRowError(f"'{info.filename}' is not a PDF file")
+        dst.write(b"%PDF-")
+        shutil.copyfileobj(src, dst)
+    return f"papers/{paper_id}/v1/paper.pdf"
+
+
+def _cleanup_files(paper_ids: List[int]) -> None:
+    for pid in paper_ids:
+        shutil.rmtree(os.path.join(PAPERS_DIR, str(pid)), ignore_errors=True)
+
+
+# ----------------------------------------------------
+# Job chính
+# ----------------------------------------------------
+def _existing_titles(db, conference_id: int, titles: List[str]) -> set:
+    rows = (
+        db.query(models.Paper.submitter_id, models.Paper.title)
+        .filter(
+            models.Paper.conference_id == conference_id,
+            models.Paper.title.in_(titles),
+            models.Paper.status.notin_([models.PaperStatus.WITHDRAWN, models.PaperStatus.REJECTED]),
+        )
+        .all()
+    )
+    return {(sid, title) for sid, title in rows}
+
+
+def _import_batch(
+    db,
+    archive: zipfile.ZipFile,
+    files: Dict[str, zipfile.ZipInfo],
+    conference_id: int,
+    batch: List[Tuple[int, dict]],
+    seen: set,
+    report: dict,
+) -> None:
+    limit_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    existing = _existing_titles(db, conference_id, [r["paper"].title for _, r in batch])
+
+    valid: List[Tuple[int, dict, zipfile.ZipInfo]] = []
+    for line, row in batch:
+        key = (row["submitter_id"], row["paper"].title)
+        info = files.get(row["file"])
+        if key in existing or key in seen:
+            _add_error(report, line, row["ref"], f"Duplicate submission '{row['paper'].title}' for submitter {key[0]}")
+        elif info is None:
+            _add_error(report, line, row["ref"], f"File '{row['file']}' not found in archive")
+        elif info.file_size > limit_bytes:
+            _add_error(report, line, row["ref"], f"File '{row['file']}' exceeds {settings.MAX_FILE_SIZE_MB}MB")
+        else:
+            seen.add(key)
+            valid.append((line, row, info))
+    if not valid:
+        return
+
+    papers = []
+    for _, row, _ in valid:
+        p = row["paper"]
+        papers.append(models.Paper(
+            title=p.title,
+            abstract=p.abstract,
+            keywords=p.keywords,
+            conference_id=conference_id,
+            track_id=p.track_id,
+            submitter_id=row["submitter_id"],
+            is_blind_mode=p.is_blind_mode,
+            status=row["status"],
+            submitted_at=row["submitted_at"],
+        ))
+    try:
+        db.add_all(papers)
+        db.flush()
+
+        authors, topics = [], []
+        for paper, (_, row, _) in zip(papers, valid):
+            authors.extend({"paper_id": paper.id, **a.model_dump()} for a in row["paper"].authors)
+            topics.extend({"paper_id": paper.id, "topic_id": t.topic_id} for t in row["paper"].topics)
+        if authors:
+            db.execute(insert(models.PaperAuthor), authors)
+        if topics:
+            db.execute(insert(models.PaperTopic), topics)
+
+        # Ghi PDF song song; dòng nào lỗi file thì bỏ riêng dòng đó
+        with ThreadPoolExecutor(max_workers=IMPORT_FILE_WORKERS) as pool:
+            futures = [pool.submit(_write_pdf, archive, info, paper.id) for paper, (_, _, info) in zip(papers, valid)]
+            results = []
+            for fut in futures:
+                try:
+                    results.append((fut.result(), None))
+                except Exception as e:
+                    results.append((None, str(e)))
+
+        versions, dropped, imported, file_errors = [], [], [], []
+        for paper, (line, row, _), (file_url, err) in zip(papers, valid, results):
+            if err:
+                file_errors.append((line, row["ref"], err))
+                dropped.append(paper.id)
+                seen.discard((row["submitter_id"], row["paper"].title))
+                continue
+            versions.append({
+                "paper_id": paper.id,
+                "version_number": 1,
+                "file_url": file_url,
+                "is_camera_ready": False,
+                "is_anonymous": paper.is_blind_mode,
+            })
+            imported.append({"row": line, "ref": row["ref"], "paper_id": paper.id})
+
+        if versions:
+            db.execute(insert(models.PaperVersion), versions)
+        if dropped:
+            db.execute(delete(models.PaperAuthor).where(models.PaperAuthor.paper_id.in_(dropped)))
+            db.execute(delete(models.PaperTopic).where(models.PaperTopic.paper_id.in_(dropped)))
+            db.execute(delete(models.Paper).where(models.Paper.id.in_(dropped)))
+            _cleanup_files(dropped)
+
+        db.commit()
+        report["imported"].extend(imported)
+        for line, ref, err in file_errors:
+            _add_error(report, line, ref, err)
+    except Exception as e:
+        db.rollback()
+        _cleanup_files([p.id for p in papers if p.id is not None])
+        for line, row, _ in valid:
+            seen.discard((row["submitter_id"], row["paper"].title))
+            _add_error(report, line, row["ref"], f"Batch failed: {e}")
+    finally:
+        db.expunge_all()
+
+
+def _add_error(report: dict, line: int, ref, message: str) -> None:
+    report["errors"].append({"row": line, "ref": _ref(ref), "error": message})
+
+
+def run_import(
+    conference_id: int,
+    default_submitter_id: int,
+    manifest: BinaryIO,
+    manifest_name: str,
+    archive_file: BinaryIO,
+) -> dict:
+    report = {"conference_id": conference_id, "total_rows": 0, "imported": [], "errors": []}
+
+    with zipfile.ZipFile(archive_file) as archive:
+        files = _archive_index(archive)
+        seen: set = set()
+        db = SessionLocal()
+        try:
+            batch: List[Tuple[int, dict]] = []
+            for line, record in iter_manifest(manifest, manifest_name):
+                report["total_rows"] += 1
+                if not isinstance(record, dict):
+                    _add_error(report, line, None, "Invalid record: expected an object")
+                    continue
+                try:
+                    batch.append((line, parse_row(record, conference_id, default_submitter_id)))
+                except ImportRowError as e:
+                    _add_error(report, line, record.get("ref"), str(e))
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    _import_batch(db, archive, files, conference_id, batch, seen, report)
+                    batch = []
+            if batch:
+                _import_batch(db, archive, files, conference_id, batch, seen, report)
+        finally:
+            db.close()
+
+    report["errors"].sort(key=lambda e: e["row"])
+    report["imported_count"] = len(report["imported"])
+    report["error_count"] = len(report["errors"])
+    return report
@@ -0,0 +1,291 @@
+# backend/submission-service/src/services/duplicate_index.py
+"""
+Phát hiện bài nộp gần trùng (near-duplicate) theo từng hội nghị.
+
+- Chuẩn hoá title + abstract -> tập shingle (3 từ liên tiếp).
+- Ký hiệu MinHash theo kiểu one-permutation hashing: băm mỗi shingle một lần,
+  chia vào NUM_BINS ngăn, giữ giá trị nhỏ nhất mỗi ngăn (O(n) thay vì O(n*k)).
+- LSH banding: BANDS dải x ROWS hàng, hai bài rơi chung bucket ở ít nhất
+  một dải thì là ứng viên; độ tương đồng Jaccard ước lượng bằng tỉ lệ ngăn trùng.
+
+Index nằm trong bộ nhớ tiến trình, được nạp lười từ DB theo conference.
+Trước mỗi lần dùng, các bài có updated_at >= mốc đã đồng bộ (trừ SYNC_OVERLAP để bù lệch
+đồng hồ giữa worker và transaction commit muộn) được nạp lại: bài sửa ở worker khác được băm
+lại, bài đã rút bị gỡ khỏi index (xem crud._sync_duplicate_index).
+"""
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .. import models
+
+SHINGLE_SIZE = 3
+NUM_BINS = 64
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+SYNC_OVERLAP = timedelta(seconds=30)
+
+_HASH_SPACE = 1 << 64
+_BIN_WIDTH = _HASH_SPACE // NUM_BINS
+_EMPTY = -1
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> List[str]:
+    """Bỏ dấu tiếng Việt, lowercase, tách thành danh sách từ."""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.replace("đ", "d").replace("Đ", "D"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _WORD_RE.findall(text.lower())
+
+
+def shingles(title: str, abstract: str) -> Set[str]:
+    words = normalize_text(f"{title or ''} {abstract or ''}")
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash_signature(items: Iterable[str]) -> Tuple[int, ...]:
+    """One-permutation MinHash + densification (lấp ngăn rỗng từ ngăn kế bên phải)."""
+    bins = [_EMPTY] * NUM_BINS
+    for item in items:
+        h = _hash64(item)
+        idx, val = divmod(h, _BIN_WIDTH)
+        if bins[idx] == _EMPTY or val < bins[idx]:
+            bins[idx] = val
+
+    if all(b == _EMPTY for b in bins):
+        return tuple(bins)
+
+    filled = list(bins)
+    for i in range(NUM_BINS):
+        if bins[i] != _EMPTY:
+            continue
+        # Lấy ngăn không rỗng gần nhất (vòng tròn) + offset để tránh va chạm giả
+        step = 1
+        while bins[(i + step) % NUM_BINS] == _EMPTY:
+            step += 1
+        filled[i] = bins[(i + step) % NUM_BINS] + step * _BIN_WIDTH
+    return tuple(filled)
+
+
+def estimate_jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    if not a or not b or a[0] == _EMPTY or b[0] == _EMPTY:
+        return 0.0
+    same = sum(1 for x, y in zip(a, b) if x == y)
+    return same / NUM_BINS
+
+
+def _band_keys(sig: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [(band, sig[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class _ConferenceIndex:
+    def __init__(self):
+        self.signatures: Dict[int, Tuple[int, ...]] = {}
+        self.meta: Dict[int, Tuple[str, int]] = {}  # paper_id -> (title, submitter_id)
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], Set[int]] = defaultdict(set)
+        self.synced_until: Optional[datetime] = None  # updated_at lớn nhất đã nạp
+
+    def add(self, paper_id: int, title: str, submitter_id: int, sig: Tuple[int, ...]) -> None:
+        self.remove(paper_id)
+        self.signatures[paper_id] = sig
+        self.meta[paper_id] = (title, submitter_id)
+        for key in _band_keys(sig):
+            self.buckets[key].add(paper_id)
+
+    def remove(self, paper_id: int) -> None:
+        sig = self.signatures.pop(paper_id, None)
+        self.meta.pop(paper_id, None)
+        if sig is None:
+            return
+        for key in _band_keys(sig):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(paper_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def query(
+        self, sig: Tuple[int, ...], threshold: float, exclude_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        candidates: Set[int] = set()
+        for key in _band_keys(sig):
+            candidates |= self.buckets.get(key, set())
+        candidates.discard(exclude_id)
+
+        hits = []
+        for pid in candidates:
+            sim = estimate_jaccard(sig, self.signatures[pid])
+            if sim >= threshold:
+                hits.append((pid, sim))
+        hits.sort(key=lambda x: x[1], reverse=True)
+        return hits
+
+
+class DuplicateIndex:
+    """
+    Quản lý các _ConferenceIndex. Mọi thao tác ở đây chỉ chạm bộ nhớ
+    (không I/O) nên giữ lock rất ngắn; phần đọc DB do crud đảm nhiệm
+    (lấy các bài có updated_at >= sync_since() rồi gọi sync()).
+    """
+
+    def __init__(self):
+        self._indexes: Dict[int, _ConferenceIndex] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, conference_id: int) -> _ConferenceIndex:
+        index = self._indexes.get(conference_id)
+        if index is None:
+            index = _ConferenceIndex()
+            self._indexes[conference_id] = index
+        return index
+
+    def sync_since(self, conference_id: int) -> Optional[datetime]:
+        """None = conference chưa nạp lần nào (đọc toàn bộ bài chưa rút)."""
+        with self._lock:
+            synced_until = self._get(conference_id).synced_until
+        return synced_until - SYNC_OVERLAP if synced_until is not None else None
+
+    def sync(
+        self,
+        conference_id: int,
+        rows: Iterable[Tuple[int, str, str, int, bool, Optional[datetime]]],
+    ) -> None:
+        """rows: (paper_id, title, abstract, submitter_id, withdrawn, updated_at) đã đổi từ sync_since()."""
+        rows = list(rows)
+        prepared = [
+            (pid, title, submitter_id, None if withdrawn else minhash_signature(shingles(title, abstract)))
+            for pid, title, abstract, submitter_id, withdrawn, _ in rows
+        ]
+        with self._lock:
+            index = self._get(conference_id)
+            for pid, title, submitter_id, sig in prepared:
+                if sig is None:
+                    index.remove(pid)
+                else:
+                    index.add(pid, title, submitter_id, sig)
+            stamps = [updated_at for *_, updated_at in rows if updated_at is not None]
+            if stamps:
+                newest = max(stamps)
+                if index.synced_until is None or newest > index.synced_until:
+                    index.synced_until = newest
+            elif index.synced_until is None:
+                # Conference chưa có bài nào: lần sau vẫn chỉ đọc phần mới
+                index.synced_until = datetime.utcnow() - SYNC_OVERLAP
+
+    def ingest(self, conference_id: int, rows: Iterable[Tuple[int, str, str, int]]) -> None:
+        """rows: (paper_id, title, abstract, submitter_id) cần (băm lại và) đưa vào index."""
+        prepared = [
+            (pid, title, submitter_id, minhash_signature(shingles(title, abstract)))
+            for pid, title, abstract, submitter_id in rows
+        ]
+        with self._lock:
+            index = self._get(conference_id)
+            for pid, title, submitter_id, sig in prepared:
+                index.add(pid, title, submitter_id, sig)
+
+    def find_candidates(
+        self,
+        conference_id: int,
+        title: str,
+        abstract: str,
+        threshold: float,
+        exclude_paper_id: Optional[int] = None,
+    ) -> List[dict]:
+        sig = minhash_signature(shingles(title, abstract))
+        with self._lock:
+            index = self._get(conference_id)
+            hits = index.query(sig, threshold, exclude_id=exclude_paper_id)
+            return [
+                {
+                    "paper_id": pid,
+                    "title": index.meta[pid][0],
+                    "submitter_id": index.meta[pid][1],
+                    "similarity": round(sim, 3),
+                }
+                for pid, sim in hits
+            ]
+
+    def upsert(self, paper: models.Paper) -> None:
+        if paper.status == models.PaperStatus.WITHDRAWN:
+            with self._lock:
+                self._get(paper.conference_id).remove(paper.id)
+            return
+        self.ingest(
+            paper.conference_id,
+            [(paper.id, paper.title, paper.abstract, paper.submitter_id)],
+        )
+
+    def clusters(self, conference_id: int, threshold: float) -> List[dict]:
+        """
+        Gom cụm trùng lặp cho cả hội nghị trong một lượt qua các bucket LSH
+        (union-find), không so sánh từng cặp bài.
+        """
+        with self._lock:
+            index = self._get(conference_id)
+
+            parent: Dict[int, int] = {}
+
+            def find(x: int) -> int:
+                while parent.setdefault(x, x) != x:
+                    parent[x] = parent[parent[x]]
+                    x = parent[x]
+                return x
+
+            best: Dict[int, float] = {}
+            seen_pairs: Set[Tuple[int, int]] = set()
+            for bucket in index.buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = sorted(bucket)
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        if (a, b) in seen_pairs:
+                            continue
+                        seen_pairs.add((a, b))
+                        sim = estimate_jaccard(index.signatures[a], index.signatures[b])
+                        if sim < threshold:
+                            continue
+                        ra, rb = find(a), find(b)
+                        if ra != rb:
+                            parent[rb] = ra
+                        best[a] = max(best.get(a, 0.0), sim)
+                        best[b] = max(best.get(b, 0.0), sim)
+
+            groups: Dict[int, List[int]] = defaultdict(list)
+            for pid in best:
+                groups[find(pid)].append(pid)
+
+            result = []
+            for members in groups.values():
+                members.sort()
+                result.append({
+                    "paper_ids": members,
+                    "papers": [
+                        {
+                            "paper_id": pid,
+                            "title": index.meta[pid][0],
+                            "submitter_id": index.meta[pid][1],
+                            "similarity": round(best[pid], 3),
+                        }
+                        for pid in members
+                    ],
+                    "max_similarity": round(max(best[pid] for pid in members), 3),
+                })
+            result.sort(key=lambda c: c["max_similarity"], reverse=True)
+            return result
+
+
+duplicate_index = DuplicateIndex()
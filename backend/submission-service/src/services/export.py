@@ -0,0 +1,244 @@
+# backend/submission-service/src/services/export.py
+"""
+Xuất toàn bộ bài nộp của một hội nghị dưới dạng luồng (CSV / JSONL / Parquet).
+
+- Đọc DB bằng server-side cursor (yield_per): mỗi lượt chỉ giữ EXPORT_BATCH_SIZE
+  bài trong bộ nhớ; authors/topics/versions được selectinload theo từng lô.
+- Mỗi bài được làm phẳng thành một dòng (authors, topics, version mới nhất).
+- CSV/JSONL được nén gzip ngay khi sinh ra; Parquet tự nén theo cột (zstd)
+  và ghi mỗi lô thành một row group.
+Bộ nhớ vì vậy không phụ thuộc số lượng bài của hội nghị.
+"""
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from .. import models
+from ..database import AsyncSessionLocal
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+
+COLUMNS = [
+    "paper_id",
+    "title",
+    "abstract",
+    "keywords",
+    "conference_id",
+    "track_id",
+    "submitter_id",
+    "status",
+    "is_blind_mode",
+    "decision_note",
+    "submitted_at",
+    "created_at",
+    "author_names",
+    "author_emails",
+    "author_organizations",
+    "corresponding_author_email",
+    "topic_ids",
+    "latest_version",
+    "latest_file_url",
+    "has_camera_ready",
+]
+
+# CSV nối các danh sách bằng dấu này; JSONL/Parquet giữ nguyên dạng mảng
+_LIST_SEP = "; "
+
+
+def media_type(fmt: str, compress: bool) -> str:
+    if fmt == "parquet":
+        return "application/vnd.apache.parquet"
+    if compress:
+        return "application/gzip"
+    return "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+
+def filename(conference_id: int, fmt: str, compress: bool) -> str:
+    name = f"conference_{conference_id}_submissions.{fmt}"
+    return f"{name}.gz" if compress and fmt != "parquet" else name
+
+
+def flatten_paper(paper: models.Paper) -> Dict:
+    authors = list(paper.authors or [])
+    versions = list(paper.versions or [])
+    latest = max(versions, key=lambda v: v.version_number) if versions else None
+    corresponding = next((a for a in authors if a.is_corresponding), None)
+
+    return {
+        "paper_id": paper.id,
+        "title": paper.title,
+        "abstract": paper.abstract,
+        "keywords": paper.keywords,
+        "conference_id": paper.conference_id,
+        "track_id": paper.track_id,
+        "submitter_id": paper.submitter_id,
+        "status": paper.status.value if paper.status else None,
+        "is_blind_mode": paper.is_blind_mode,
+        "decision_note": paper.decision_note,
+        "submitted_at": paper.submitted_at.isoformat() if paper.submitted_at else None,
+        "created_at": paper.created_at.isoformat() if paper.created_at else None,
+        "author_names": [a.full_name for a in authors],
+        "author_emails": [a.email for a in authors],
+        "author_organizations": [a.organization or "" for a in authors],
+        "corresponding_author_email": corresponding.email if corresponding else None,
+        "topic_ids": sorted(t.topic_id for t in (paper.topics or [])),
+        "latest_version": latest.version_number if latest else None,
+        "latest_file_url": latest.file_url if latest else None,
+        "has_camera_ready": any(v.is_camera_ready for v in versions),
+    }
+
+
+def _join(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return _LIST_SEP.join(str(v) for v in value)
+    return value
+
+
+async def iter_paper_batches(conference_id: int) -> AsyncIterator[List[Dict]]:
+    """
+    Session riêng cho luồng export: dependency get_async_db đóng session
+    trước khi StreamingResponse gửi xong dữ liệu.
+    """
+    stmt = (
+        select(models.Paper)
+        .options(
+            selectinload(models.Paper.authors),
+            selectinload(models.Paper.topics),
+            selectinload(models.Paper.versions),
+        )
+        .where(models.Paper.conference_id == conference_id)
+        .order_by(models.Paper.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield [flatten_paper(p) for p in partition]
+            # Bỏ các object đã xuất khỏi identity map để bộ nhớ không tăng dần
+            db.expunge_all()
+
+
+def _csv_chunks(batch: Iterable[Dict], header: bool) -> str:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=COLUMNS)
+    if header:
+        writer.writeheader()
+    for row in batch:
+        writer.writerow({k: _join(row[k]) for k in COLUMNS})
+    return buf.getvalue()
+
+
+def _jsonl_chunks(batch: Iterable[Dict]) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in batch)
+
+
+async def _stream_text(conference_id: int, fmt: str, compress: bool) -> AsyncIterator[bytes]:
+    # wbits=31 -> định dạng gzip (header + crc32), nén dần theo từng lô
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    first = True
+    async for batch in iter_paper_batches(conference_id):
+        if fmt == "csv":
+            text = _csv_chunks(batch, header=first)
+        else:
+            text = _jsonl_chunks(batch)
+        first = False
+
+        data = text.encode("utf-8")
+        if gz is not None:
+            data = gz.compress(data)
+        if data:
+            yield data
+
+    if fmt == "csv" and first:
+        # Hội nghị chưa có bài: vẫn trả header
+        data = _csv_chunks([], header=True).encode("utf-8")
+        yield gz.compress(data) if gz is not None else data
+    if gz is not None:
+        yield gz.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    File chỉ-ghi cho ParquetWriter: gom byte để trả dần cho client nhưng tell()
+    vẫn là tổng số byte đã ghi (footer Parquet lưu offset tuyệt đối).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _stream_parquet(conference_id: int) -> AsyncIterator[bytes]:
+    # pyarrow nặng, chỉ import khi thực sự xuất Parquet
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("paper_id", pa.int64()),
+        ("title", pa.string()),
+        ("abstract", pa.string()),
+        ("keywords", pa.string()),
+        ("conference_id", pa.int64()),
+        ("track_id", pa.int64()),
+        ("submitter_id", pa.int64()),
+        ("status", pa.string()),
+        ("is_blind_mode", pa.bool_()),
+        ("decision_note", pa.string()),
+        ("submitted_at", pa.string()),
+        ("created_at", pa.string()),
+        ("author_names", pa.list_(pa.string())),
+        ("author_emails", pa.list_(pa.string())),
+        ("author_organizations", pa.list_(pa.string())),
+        ("corresponding_author_email", pa.string()),
+        ("topic_ids", pa.list_(pa.int64())),
+        ("latest_version", pa.int64()),
+        ("latest_file_url", pa.string()),
+        ("has_camera_ready", pa.bool_()),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+
+    async for batch in iter_paper_batches(conference_id):
+        for row in batch:
+            if isinstance(row["keywords"], list):
+                row["keywords"] = _join(row["keywords"])
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        data = sink.drain()
+        if data:
+            yield data
+
+    writer.close()
+    yield sink.drain()
+
+
+def stream_export(conference_id: int, fmt: str, compress: bool = True) -> AsyncIterator[bytes]:
+    if fmt == "parquet":
+        return _stream_parquet(conference_id)
+    return _stream_text(conference_id, fmt, compress)
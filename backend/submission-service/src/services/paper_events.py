@@ -0,0 +1,67 @@
+# backend/submission-service/src/services/paper_events.py
+"""
+Phát sự kiện vòng đời bài báo (created / updated / version_added / status_changed / withdrawn)
+lên Redis Stream settings.PAPER_EVENTS_STREAM để service khác (review-service) giữ bản sao
+cục bộ thay vì gọi GET /submissions/{id} cho mỗi lần kiểm tra quyền / metadata.
+
+- Mỗi event mang ẢNH CHỤP đầy đủ của bài (đọc lại SAU commit, xem crud.get_paper_snapshots)
+  nên consumer chỉ cần upsert, không phụ thuộc thứ tự/độ đủ của các event trước.
+- Stream được cắt gần đúng theo PAPER_EVENTS_MAXLEN (XADD MAXLEN ~).
+- Phát lỗi (Redis chết...) chỉ ghi log, không làm hỏng request: consumer vẫn có đường
+  đọc trực tiếp từ submission-service khi thiếu bản sao.
+"""
+import json
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import crud
+from ..config import settings
+
+CREATED = "created"
+UPDATED = "updated"
+VERSION_ADDED = "version_added"
+STATUS_CHANGED = "status_changed"
+WITHDRAWN = "withdrawn"
+
+_client = None
+
+
+def _get_client():
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        import redis.asyncio as aioredis
+        _client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    return _client
+
+
+async def publish(db: AsyncSession, event_type: str, paper_ids: Iterable[int]) -> int:
+    """Gọi SAU commit. Trả về số event đã ghi vào stream."""
+    paper_ids = list(dict.fromkeys(paper_ids))
+    if not paper_ids:
+        return 0
+    try:
+        client = _get_client()
+        if client is None:
+            return 0
+        snapshots = await crud.get_paper_snapshots(db, paper_ids)
+        if not snapshots:
+            return 0
+
+        at = datetime.utcnow().isoformat()
+        async with client.pipeline(transaction=False) as pipe:
+            for snap in snapshots:
+                pipe.xadd(
+                    settings.PAPER_EVENTS_STREAM,
+                    {"type": event_type, "paper_id": snap["id"], "at": at, "data": json.dumps(snap)},
+                    maxlen=settings.PAPER_EVENTS_MAXLEN,
+                    approximate=True,
+                )
+            await pipe.execute()
+        return len(snapshots)
+    except Exception as e:
+        print(f" Failed to publish paper events ({event_type} {paper_ids[:10]}): {e}")
+        return 0
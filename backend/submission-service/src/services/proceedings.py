@@ -0,0 +1,328 @@
+# backend/submission-service/src/services/proceedings.py
+"""
+Dựng kỷ yếu (proceedings volume) từ bản camera-ready của các bài ACCEPTED.
+
+Quy trình:
+1. Lấy bài ACCEPTED của conference (sắp theo track, id) và version
+   camera-ready mới nhất của từng bài.
+2. Đếm số trang từng PDF; kết quả được cache theo (version_id, size, mtime)
+   nên lần build sau chỉ mở lại file của bài có camera-ready thay đổi.
+3. Tính offset trang, sinh trang mục lục (TOC) + toc.json.
+4. Ghép TOC và các bài thành volume.pdf kèm bookmark (theo track -> bài).
+   Nếu toàn bộ danh sách mục lục (thứ tự, version, title, tác giả, track, trang) không đổi
+   so với lần trước thì bỏ qua bước ghép.
+
+Trạng thái lưu tại {UPLOAD_DIR}/proceedings/conf_{id}/:
+  pages.json, toc.json, volume.pdf, status.json
+"""
+import hashlib
+import json
+import os
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.job_state import RunningJobs, read_json, resolve_local_path, update_status, write_json
+
+TOC_ENTRIES_PER_PAGE = 18
+TOC_TITLE_CHARS = 80
+_PAGE_WIDTH, _PAGE_HEIGHT = 612, 792  # Letter, đơn vị point
+
+_jobs = RunningJobs()
+
+
+def _state_dir(conference_id: int) -> str:
+    return os.path.join(settings.UPLOAD_DIR, "proceedings", f"conf_{conference_id}")
+
+
+def _set_status(conference_id: int, **fields) -> None:
+    update_status(_state_dir(conference_id), **fields)
+
+
+def get_status(conference_id: int) -> dict:
+    status = read_json(os.path.join(_state_dir(conference_id), "status.json"), {"state": "never_run"})
+    status["conference_id"] = conference_id
+    return status
+
+
+def get_toc(conference_id: int) -> List[dict]:
+    return read_json(os.path.join(_state_dir(conference_id), "toc.json"), {}).get("entries", [])
+
+
+def volume_path(conference_id: int) -> Optional[str]:
+    path = os.path.join(_state_dir(conference_id), "volume.pdf")
+    return path if os.path.exists(path) else None
+
+
+def try_start(conference_id: int) -> bool:
+    return _jobs.try_start(conference_id)
+
+
+# ----------------------------------------------------
+# Trang mục lục: PDF tối giản tự sinh (font Helvetica chuẩn, không cần thư viện ngoài)
+# ----------------------------------------------------
+def _pdf_text(text: str) -> str:
+    # Font chuẩn Type1 chỉ có Latin-1: bỏ dấu tiếng Việt rồi escape ký tự đặc biệt
+    text = unicodedata.normalize("NFKD", (text or "").replace("đ", "d").replace("Đ", "D"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def toc_page_count(entries: int) -> int:
+    return max(1, -(-entries // TOC_ENTRIES_PER_PAGE))
+
+
+def render_toc_pdf(conference_id: int, entries: List[dict]) -> bytes:
+    pages: List[bytes] = []
+    for start in range(0, max(len(entries), 1), TOC_ENTRIES_PER_PAGE):
+        ops = []
+        y = _PAGE_HEIGHT - 72
+        if start == 0:
+            ops.append(f"BT /F2 16 Tf 72 {y} Td (Table of Contents - Conference {conference_id}) Tj ET")
+            y -= 32
+        for e in entries[start:start + TOC_ENTRIES_PER_PAGE]:
+            ops.append(f"BT /F2 11 Tf 72 {y} Td ({_pdf_text(_truncate(e['title'], TOC_TITLE_CHARS))}) Tj ET")
+            ops.append(f"BT /F1 11 Tf {_PAGE_WIDTH - 100} {y} Td ({e['start_page']}) Tj ET")
+            y -= 14
+            ops.append(f"BT /F1 9 Tf 84 {y} Td ({_pdf_text(_truncate(e['authors'], TOC_TITLE_CHARS + 20))}) Tj ET")
+            y -= 20
+        pages.append("\n".join(ops).encode("latin-1"))
+
+    # 1: Catalog, 2: Pages, 3-4: Font, sau đó mỗi trang = (Page, Contents)
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages: điền sau khi biết id các trang
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for content in pages:
+        page_id = len(objects) + 1
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_WIDTH} {_PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {page_id + 1} 0 R >>"
+            ).encode("ascii")
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("ascii")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+# ----------------------------------------------------
+# Job chính
+# ----------------------------------------------------
+def _accepted_papers(db, conference_id: int) -> List[Tuple[models.Paper, Optional[Tuple[int, str]]]]:
+    latest_cr = (
+        db.query(
+            models.PaperVersion.paper_id,
+            func.max(models.PaperVersion.version_number).label("vnum"),
+        )
+        .filter(models.PaperVersion.is_camera_ready.is_(True))
+        .group_by(models.PaperVersion.paper_id)
+        .subquery()
+    )
+    version_rows = (
+        db.query(models.PaperVersion.paper_id, models.PaperVersion.id, models.PaperVersion.file_url)
+        .join(
+            latest_cr,
+            (models.PaperVersion.paper_id == latest_cr.c.paper_id)
+            & (models.PaperVersion.version_number == latest_cr.c.vnum),
+        )
+        .join(models.Paper, models.Paper.id == models.PaperVersion.paper_id)
+        .filter(models.Paper.conference_id == conference_id)
+        .all()
+    )
+    versions = {pid: (vid, url) for pid, vid, url in version_rows}
+    papers = (
+        db.query(models.Paper)
+        .options(selectinload(models.Paper.authors))
+        .filter(
+            models.Paper.conference_id == conference_id,
+            models.Paper.status == models.PaperStatus.ACCEPTED,
+        )
+        .order_by(models.Paper.track_id, models.Paper.id)
+        .all()
+    )
+    return [(p, versions.get(p.id)) for p in papers]
+
+
+def _count_pages(path: str) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(path).pages)
+
+
+def run_build(conference_id: int) -> None:
+    """Chạy trong BackgroundTasks; phải gọi try_start() trước."""
+    state_dir = _state_dir(conference_id)
+
+    try:
+        os.makedirs(state_dir, exist_ok=True)
+        db = SessionLocal()
+        try:
+            rows = [
+                (
+                    p.id,
+                    p.title,
+                    p.track_id,
+                    ", ".join(a.full_name for a in p.authors),
+                    version,
+                )
+                for p, version in _accepted_papers(db, conference_id)
+            ]
+        finally:
+            db.close()
+
+        _set_status(
+            conference_id,
+            state="running",
+            started_at=datetime.utcnow().isoformat(),
+            finished_at=None,
+            error=None,
+            total=len(rows),
+            processed=0,
+            reused=0,
+            merged=0,
+            missing=[],
+            failed=[],
+        )
+
+        # 1) Số trang từng bài: dùng lại cache nếu file camera-ready không đổi
+        cached: Dict[str, dict] = read_json(os.path.join(state_dir, "pages.json"), {})
+        page_info: Dict[str, dict] = {}
+        missing, failed = [], []
+        included = []
+        reused = 0
+        for idx, (pid, title, track_id, authors, version) in enumerate(rows, start=1):
+            if version is None:
+                missing.append(pid)
+                continue
+            vid, url = version
+            path = resolve_local_path(url)
+            try:
+                st = os.stat(path)
+                key = {"version_id": vid, "size": st.st_size, "mtime": int(st.st_mtime)}
+                old = cached.get(str(pid))
+                if old and all(old.get(k) == v for k, v in key.items()):
+                    pages = old["pages"]
+                    reused += 1
+                else:
+                    pages = _count_pages(path)
+                page_info[str(pid)] = {**key, "pages": pages}
+                included.append((pid, title, track_id, authors, vid, path, pages))
+            except Exception as e:
+                print(f"[Proceedings] Paper {pid}: cannot read camera-ready ({e})")
+                failed.append(pid)
+
+            if idx % 20 == 0:
+                _set_status(conference_id, processed=idx, reused=reused)
+
+        write_json(os.path.join(state_dir, "pages.json"), page_info)
+
+        # 2) Offset trang: trang 1.. là mục lục, bài đầu tiên bắt đầu ngay sau đó
+        front = toc_page_count(len(included))
+        entries = []
+        next_page = front + 1
+        for pid, title, track_id, authors, vid, path, pages in included:
+            entries.append({
+                "paper_id": pid,
+                "version_id": vid,
+                "title": title,
+                "authors": authors,
+                "track_id": track_id,
+                "start_page": next_page,
+                "end_page": next_page + pages - 1,
+                "page_count": pages,
+            })
+            next_page += pages
+        total_pages = next_page - 1
+
+        # 3) Ghép volume: bỏ qua nếu mục lục (bài, version, title, tác giả, track, trang) giống lần
+        #    build trước -- sửa metadata mà không nộp camera-ready mới vẫn phải dựng lại TOC/bookmark
+        signature = hashlib.sha256(json.dumps(entries, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        old_toc = read_json(os.path.join(state_dir, "toc.json"), {})
+        up_to_date = old_toc.get("signature") == signature and volume_path(conference_id) is not None
+
+        _set_status(conference_id, processed=len(rows), reused=reused, missing=missing, failed=failed)
+
+        if not up_to_date:
+            _merge_volume(conference_id, entries, [item[5] for item in included])
+            write_json(
+                os.path.join(state_dir, "toc.json"),
+                {
+                    "conference_id": conference_id,
+                    "generated_at": datetime.utcnow().isoformat(),
+                    "front_matter_pages": front,
+                    "total_pages": total_pages,
+                    "signature": signature,
+                    "entries": entries,
+                },
+            )
+
+        _set_status(
+            conference_id,
+            state="done",
+            included=len(entries),
+            page_count=total_pages,
+            up_to_date=up_to_date,
+            finished_at=datetime.utcnow().isoformat(),
+        )
+    except Exception as e:
+        print(f"[Proceedings] Conference {conference_id} failed: {e}")
+        _set_status(conference_id, state="failed", error=str(e))
+    finally:
+        _jobs.finish(conference_id)
+
+
+def _merge_volume(conference_id: int, entries: List[dict], paths: List[str]) -> None:
+    import io
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    writer.append(PdfReader(io.BytesIO(render_toc_pdf(conference_id, entries))), import_outline=False)
+    writer.add_outline_item("Table of Contents", 0)
+
+    track_items = {}
+    for i, (entry, path) in enumerate(zip(entries, paths), start=1):
+        writer.append(path, import_outline=False)
+
+        track_id = entry["track_id"]
+        if track_id not in track_items:
+            label = f"Track {track_id}" if track_id is not None else "Other papers"
+            track_items[track_id] = writer.add_outline_item(label, entry["start_page"] - 1)
+        writer.add_outline_item(entry["title"], entry["start_page"] - 1, parent=track_items[track_id])
+
+        if i % 20 == 0:
+            _set_status(conference_id, merged=i)
+
+    out_path = os.path.join(_state_dir(conference_id), "volume.pdf")
+    tmp = f"{out_path}.tmp"
+    with open(tmp, "wb") as f:
+        writer.write(f)
+    writer.close()
+    os.replace(tmp, out_path)
+    _set_status(conference_id, merged=len(entries))
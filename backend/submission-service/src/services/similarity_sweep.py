@@ -0,0 +1,313 @@
+# backend/submission-service/src/services/similarity_sweep.py
+"""
+Quét trùng lặp toàn văn (plagiarism sweep) cho cả hội nghị.
+
+Quy trình:
+1. Lấy version mới nhất của mọi bài (trừ WITHDRAWN) trong conference.
+2. Bài nào có version khác lần chạy trước -> trích text PDF + tính fingerprint
+   winnowing trong ProcessPoolExecutor. Mỗi bài xong được ghi ngay ra đĩa,
+   nên job bị dừng giữa chừng chạy lại sẽ tiếp tục từ chỗ dở.
+3. Dựng inverted index fingerprint -> paper_ids, chỉ tính lại các cặp
+   có dính tới bài thay đổi; các cặp còn lại giữ từ ma trận cũ nếu tập fingerprint
+   phổ biến bị loại (common) y hệt lần trước (so bằng hash của tập).
+4. Ghi ma trận thưa (các cặp chia sẻ >= MIN_SHARED fingerprint) và báo cáo từng bài.
+
+Trạng thái lưu tại {UPLOAD_DIR}/similarity/conf_{id}/:
+  fingerprints/{paper_id}.json, matrix.json, report.json, status.json
+"""
+import hashlib
+import os
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+
+from .. import models
+from ..config import settings
+from ..database import SessionLocal
+from ..utils.job_state import RunningJobs, read_json, resolve_local_path, update_status, write_json
+
+KGRAM_SIZE = 40      # số ký tự mỗi k-gram (sau chuẩn hoá, bỏ khoảng trắng)
+WINDOW_SIZE = 30     # cửa sổ winnowing: đảm bảo bắt được đoạn trùng >= k + w - 1 ký tự
+MIN_SHARED = 5       # số fingerprint chung tối thiểu để ghi vào ma trận
+MAX_DOC_FREQ = 0.2   # bỏ fingerprint xuất hiện ở > 20% số bài (template, boilerplate)
+TOP_MATCHES = 10
+
+_jobs = RunningJobs()
+
+
+# ----------------------------------------------------
+# Fingerprinting (chạy trong process con)
+# ----------------------------------------------------
+def normalize_fulltext(text: str) -> str:
+    text = unicodedata.normalize("NFKD", (text or "").replace("đ", "d").replace("Đ", "D"))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def winnow(text: str, k: int = KGRAM_SIZE, w: int = WINDOW_SIZE) -> List[int]:
+    """
+    Winnowing (Schleimer et al.): trong mỗi cửa sổ w hash k-gram liên tiếp
+    chọn hash nhỏ nhất (lấy vị trí phải nhất khi bằng nhau).
+    """
+    norm = normalize_fulltext(text)
+    if len(norm) < k:
+        return []
+    hashes = [zlib.crc32(norm[i:i + k].encode("ascii")) for i in range(len(norm) - k + 1)]
+    if len(hashes) <= w:
+        return [min(hashes)]
+
+    selected: Set[int] = set()
+    min_pos = -1
+    for start in range(len(hashes) - w + 1):
+        end = start + w
+        if min_pos < start:
+            # min cũ trượt khỏi cửa sổ -> tìm lại
+            min_pos = start
+            for j in range(start, end):
+                if hashes[j] <= hashes[min_pos]:
+                    min_pos = j
+            selected.add(hashes[min_pos])
+        elif hashes[end - 1] <= hashes[min_pos]:
+            min_pos = end - 1
+            selected.add(hashes[min_pos])
+    return sorted(selected)
+
+
+def extract_pdf_text(path: str) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    return "\n".join((page.extract_text() or "") for page in reader.pages)
+
+
+def fingerprint_paper(paper_id: int, version_id: int, path: str) -> Tuple[int, int, List[int], Optional[str]]:
+    try:
+        return paper_id, version_id, winnow(extract_pdf_text(path)), None
+    except Exception as e:
+        return paper_id, version_id, [], str(e)
+
+
+def common_set_hash(common: Set[int]) -> str:
+    return hashlib.sha256(",".join(map(str, sorted(common))).encode("ascii")).hexdigest()
+
+
+# ----------------------------------------------------
+# Lưu trữ trạng thái
+# ----------------------------------------------------
+def _state_dir(conference_id: int) -> str:
+    return os.path.join(settings.UPLOAD_DIR, "similarity", f"conf_{conference_id}")
+
+
+def _set_status(conference_id: int, **fields) -> None:
+    update_status(_state_dir(conference_id), **fields)
+
+
+def get_status(conference_id: int) -> dict:
+    status = read_json(os.path.join(_state_dir(conference_id), "status.json"), {"state": "never_run"})
+    status["conference_id"] = conference_id
+    return status
+
+
+def get_report(conference_id: int, paper_id: Optional[int] = None):
+    report = read_json(os.path.join(_state_dir(conference_id), "report.json"), {})
+    if paper_id is None:
+        return report
+    return report.get(str(paper_id))
+
+
+# ----------------------------------------------------
+# Job chính
+# ----------------------------------------------------
+def _latest_versions(db, conference_id: int) -> Dict[int, Tuple[int, str]]:
+    latest = (
+        db.query(
+            models.PaperVersion.paper_id,
+            func.max(models.PaperVersion.version_number).label("vnum"),
+        )
+        .group_by(models.PaperVersion.paper_id)
+        .subquery()
+    )
+    rows = (
+        db.query(models.PaperVersion.paper_id, models.PaperVersion.id, models.PaperVersion.file_url)
+        .join(
+            latest,
+            (models.PaperVersion.paper_id == latest.c.paper_id)
+            & (models.PaperVersion.version_number == latest.c.vnum),
+        )
+        .join(models.Paper, models.Paper.id == models.PaperVersion.paper_id)
+        .filter(
+            models.Paper.conference_id == conference_id,
+            models.Paper.status != models.PaperStatus.WITHDRAWN,
+        )
+        .all()
+    )
+    return {pid: (vid, url) for pid, vid, url in rows}
+
+
+def try_start(conference_id: int) -> bool:
+    return _jobs.try_start(conference_id)
+
+
+def run_sweep(conference_id: int, max_workers: Optional[int] = None) -> None:
+    """Chạy trong BackgroundTasks; phải gọi try_start() trước."""
+    state_dir = _state_dir(conference_id)
+    fp_dir = os.path.join(state_dir, "fingerprints")
+
+    try:
+        os.makedirs(fp_dir, exist_ok=True)
+        db = SessionLocal()
+        try:
+            latest = _latest_versions(db, conference_id)
+        finally:
+            db.close()
+
+        # 1) Xác định bài cần tính lại (version đổi hoặc chưa có fingerprint)
+        fingerprints: Dict[int, List[int]] = {}
+        changed: Set[int] = set()
+        for pid, (vid, _) in latest.items():
+            saved = read_json(os.path.join(fp_dir, f"{pid}.json"), None)
+            if saved and saved.get("version_id") == vid and not saved.get("error"):
+                fingerprints[pid] = saved["fingerprints"]
+            else:
+                changed.add(pid)
+
+        # Bài đã rút / không còn -> xoá state cũ
+        removed = set()
+        for name in os.listdir(fp_dir):
+            if name.endswith(".json") and int(name[:-5]) not in latest:
+                removed.add(int(name[:-5]))
+                os.remove(os.path.join(fp_dir, name))
+
+        _set_status(
+            conference_id,
+            state="running",
+            started_at=datetime.utcnow().isoformat(),
+            total=len(latest),
+            to_process=len(changed),
+            processed=0,
+            errors=0,
+        )
+
+        # 2) Fingerprint song song, ghi từng bài ngay khi xong (resumable)
+        processed = errors = 0
+        if changed:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(fingerprint_paper, pid, latest[pid][0], resolve_local_path(latest[pid][1]))
+                    for pid in sorted(changed)
+                ]
+                for fut in as_completed(futures):
+                    pid, vid, fps, err = fut.result()
+                    write_json(
+                        os.path.join(fp_dir, f"{pid}.json"),
+                        {"paper_id": pid, "version_id": vid, "fingerprints": fps, "error": err},
+                    )
+                    fingerprints[pid] = fps
+                    processed += 1
+                    if err:
+                        errors += 1
+                    if processed % 20 == 0 or processed == len(changed):
+                        _set_status(conference_id, processed=processed, errors=errors)
+
+        # 3) Inverted index dùng chung, bỏ fingerprint quá phổ biến
+        index: Dict[int, List[int]] = defaultdict(list)
+        for pid, fps in fingerprints.items():
+            for h in fps:
+                index[h].append(pid)
+        max_df = max(2, int(MAX_DOC_FREQ * len(fingerprints)))
+        common = {h for h, pids in index.items() if len(pids) > max_df}
+        common_hash = common_set_hash(common)
+
+        effective_size = {
+            pid: sum(1 for h in fps if h not in common) for pid, fps in fingerprints.items()
+        }
+
+        # 4) Ma trận thưa: giữ cặp cũ không dính bài thay đổi, tính lại phần còn lại
+        dirty = changed | removed
+        old = read_json(os.path.join(state_dir, "matrix.json"), {})
+        pairs: Dict[Tuple[int, int], int] = {}
+        if old.get("common_hash") != common_hash or old.get("min_shared") != MIN_SHARED:
+            # Tập fingerprint bị loại đổi (bài mới đẩy hash qua ngưỡng, ngưỡng đổi theo số bài...)
+            # thì số fingerprint chung của cả các cặp không đổi cũng khác -> tính lại toàn bộ
+            dirty = set(fingerprints)
+        else:
+            old_matrix = old.get("pairs", [])
+            for entry in old_matrix:
+                a, b = entry["a"], entry["b"]
+                if a in dirty or b in dirty or a not in fingerprints or b not in fingerprints:
+                    continue
+                pairs[(a, b)] = entry["shared"]
+
+        for pid in dirty:
+            fps = fingerprints.get(pid)
+            if not fps:
+                continue
+            counts: Dict[int, int] = defaultdict(int)
+            for h in fps:
+                if h in common:
+                    continue
+                for other in index[h]:
+                    if other != pid:
+                        counts[other] += 1
+            for other, shared in counts.items():
+                if shared >= MIN_SHARED:
+                    pairs[(min(pid, other), max(pid, other))] = shared
+
+        matrix = []
+        for (a, b), shared in sorted(pairs.items()):
+            matrix.append({
+                "a": a,
+                "b": b,
+                "shared": shared,
+                "overlap_a": round(shared / max(effective_size.get(a, 0), 1), 4),
+                "overlap_b": round(shared / max(effective_size.get(b, 0), 1), 4),
+            })
+        write_json(
+            os.path.join(state_dir, "matrix.json"),
+            {
+                "conference_id": conference_id,
+                "generated_at": datetime.utcnow().isoformat(),
+                "max_df": max_df,
+                "common_hash": common_hash,
+                "min_shared": MIN_SHARED,
+                "pairs": matrix,
+            },
+        )
+
+        # 5) Báo cáo từng bài
+        per_paper: Dict[int, list] = defaultdict(list)
+        for e in matrix:
+            per_paper[e["a"]].append({"paper_id": e["b"], "shared": e["shared"], "overlap": e["overlap_a"]})
+            per_paper[e["b"]].append({"paper_id": e["a"], "shared": e["shared"], "overlap": e["overlap_b"]})
+
+        report = {}
+        for pid in latest:
+            matches = sorted(per_paper.get(pid, []), key=lambda m: m["overlap"], reverse=True)
+            report[str(pid)] = {
+                "paper_id": pid,
+                "version_id": latest[pid][0],
+                "fingerprint_count": effective_size.get(pid, 0),
+                "max_overlap": matches[0]["overlap"] if matches else 0.0,
+                "matches": matches[:TOP_MATCHES],
+            }
+        write_json(os.path.join(state_dir, "report.json"), report)
+
+        _set_status(
+            conference_id,
+            state="done",
+            processed=processed,
+            errors=errors,
+            pairs=len(matrix),
+            finished_at=datetime.utcnow().isoformat(),
+        )
+    except Exception as e:
+        print(f"[Similarity Sweep] Conference {conference_id} failed: {e}")
+        _set_status(conference_id, state="failed", error=str(e))
+    finally:
+        _jobs.finish(conference_id)
@@ -0,0 +1,225 @@
+# backend/submission-service/src/utils/idempotency.py
+"""
+Middleware Idempotency-Key cho các API tạo dữ liệu (client retry khi tải cao không tạo bản ghi trùng).
+
+Cùng một file ở submission-service, review-service và notification-service (backend/shared
+không được đóng gói vào image của từng service); sửa ở đâu thì chép sang các service còn lại.
+
+- Chỉ áp dụng cho các (method, path) được khai báo và request có header Idempotency-Key.
+- Khoá Redis theo (service, method, path, người gọi, key). Người gọi = user_id trong JWT (không
+  phải chuỗi token: retry sau khi refresh token vẫn trùng khoá); token không giải mã được /
+  X-Internal-Key -> hash của chính header đó (không bao giờ được phát lại response của người khác).
+  Giá trị: fingerprint (sha256 của method + path + query + body), trạng thái và response.
+- Lần đầu: SET NX trạng thái "processing" (TTL ngắn = khoá chống chạy song song, được gia hạn
+  mỗi LOCK_TTL/3 khi handler còn chạy, vd. upload lâu) -> gọi handler -> lưu status/headers/body
+  với TTL dài. Response 5xx hoặc lỗi thì xoá khoá để client retry. Process chết giữa chừng ->
+  khoá hết hạn sau LOCK_TTL.
+- Lần sau cùng key: đang xử lý -> 409 (Retry-After); fingerprint khác -> 422; đã xong -> trả lại
+  response đã lưu (header Idempotent-Replayed: true), KHÔNG gọi handler.
+- Redis lỗi/không cấu hình -> bỏ qua (request xử lý bình thường như trước).
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from typing import Callable, Iterable, Optional, Tuple
+
+HEADER = "idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+LOCK_TTL_MS = int(os.getenv("IDEMPOTENCY_LOCK_TTL_MS", "30000"))
+MAX_STORED_BODY = int(os.getenv("IDEMPOTENCY_MAX_BODY", str(1024 * 1024)))
+
+# Gia hạn khoá "processing" chỉ khi vẫn là bản ghi của chính request này
+_EXTEND_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+class IdempotencyMiddleware:
+    def __init__(
+        self,
+        app,
+        redis_url: str,
+        routes: Iterable[Tuple[str, str]],
+        namespace: str,
+        decode_token: Optional[Callable[[str], dict]] = None,
+    ):
+        self.app = app
+        self.redis_url = redis_url
+        self.routes = {(m.upper(), p.rstrip("/")) for m, p in routes}
+        self.namespace = namespace
+        self.decode_token = decode_token
+        self._client = None
+
+    def _get_client(self):
+        if not self.redis_url:
+            return None
+        if self._client is None:
+            import redis.asyncio as aioredis
+            self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+        return self._client
+
+    def _caller(self, headers: dict) -> str:
+        auth = headers.get("authorization") or ""
+        if auth:
+            scheme, _, token = auth.partition(" ")
+            if self.decode_token is not None and scheme.lower() == "bearer" and token:
+                try:
+                    payload = self.decode_token(token.strip())
+                    subject = payload.get("user_id") or payload.get("sub")
+                    if subject is not None:
+                        return f"user:{subject}"
+                except Exception:
+                    pass
+            return "auth:" + _digest(auth)
+        internal = headers.get("x-internal-key")
+        return "internal:" + _digest(internal) if internal else ""
+
+    def _route_path(self, scope) -> str:
+        path = scope["path"]
+        root = scope.get("root_path") or ""
+        if root and (path == root or path.startswith(root + "/")):
+            path = path[len(root):]
+        return path.rstrip("/")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        path = self._route_path(scope)
+        if (scope["method"], path) not in self.routes:
+            return await self.app(scope, receive, send)
+
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+        key = headers.get(HEADER)
+        if not key:
+            return await self.app(scope, receive, send)
+        if len(key) > MAX_KEY_LENGTH:
+            return await _send_json(send, 400, {"detail": f"Idempotency-Key too long (max {MAX_KEY_LENGTH})"})
+
+        # Đọc hết body để tính fingerprint rồi phát lại cho handler
+        chunks = []
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        fingerprint = hashlib.sha256(
+            b"\n".join([scope["method"].encode(), path.encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+        caller = self._caller(headers)
+        redis_key = "idem:{}:{}".format(self.namespace, _digest(f"{scope['method']}|{path}|{caller}|{key}"))
+        lock_value = json.dumps({"state": "processing", "fp": fingerprint})
+
+        replay_sent = False
+
+        async def replay_receive():
+            nonlocal replay_sent
+            if replay_sent:
+                return await receive()
+            replay_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        try:
+            client = self._get_client()
+            acquired = client is not None and await client.set(redis_key, lock_value, nx=True, px=LOCK_TTL_MS)
+            existing = None if acquired or client is None else await client.get(redis_key)
+        except Exception as e:
+            print(f"[Idempotency] Redis unavailable, processing without de-duplication: {e}")
+            return await self.app(scope, replay_receive, send)
+
+        if client is None:
+            return await self.app(scope, replay_receive, send)
+
+        if not acquired:
+            if existing is None:
+                # Khoá vừa hết hạn/bị xoá giữa SET và GET: coi như đang xử lý, client thử lại
+                return await _send_json(send, 409, {"detail": "A request with this Idempotency-Key is in progress"}, retry_after=True)
+            record = json.loads(existing)
+            if record.get("fp") != fingerprint:
+                return await _send_json(send, 422, {"detail": "Idempotency-Key was already used with a different request"})
+            if record.get("state") != "done":
+                return await _send_json(send, 409, {"detail": "A request with this Idempotency-Key is in progress"}, retry_after=True)
+            return await _replay(send, record)
+
+        status = None
+        resp_headers = []
+        resp_body = []
+
+        async def capture_send(message):
+            nonlocal status, resp_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                resp_headers = [(k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                resp_body.append(message.get("body", b""))
+            await send(message)
+
+        keeper = asyncio.ensure_future(self._keep_locked(client, redis_key, lock_value))
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await self._forget(client, redis_key)
+            raise
+        finally:
+            keeper.cancel()
+
+        data = b"".join(resp_body)
+        if status is None or status >= 500 or len(data) > MAX_STORED_BODY:
+            await self._forget(client, redis_key)
+            return
+        record = {
+            "state": "done",
+            "fp": fingerprint,
+            "status": status,
+            "headers": resp_headers,
+            "body": base64.b64encode(data).decode("ascii"),
+        }
+        try:
+            await client.set(redis_key, json.dumps(record), ex=TTL_SECONDS)
+        except Exception as e:
+            print(f"[Idempotency] Cannot store response for replay: {e}")
+
+    async def _keep_locked(self, client, redis_key: str, lock_value: str) -> None:
+        while True:
+            await asyncio.sleep(LOCK_TTL_MS / 3000)
+            try:
+                if not await client.eval(_EXTEND_LUA, 1, redis_key, lock_value, LOCK_TTL_MS):
+                    return
+            except Exception as e:
+                print(f"[Idempotency] Cannot extend lock {redis_key}: {e}")
+
+    async def _forget(self, client, redis_key: str) -> None:
+        try:
+            await client.delete(redis_key)
+        except Exception as e:
+            print(f"[Idempotency] Cannot release key {redis_key}: {e}")
+
+
+async def _replay(send, record: dict) -> None:
+    headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+    headers.append((REPLAYED_HEADER.encode(), b"true"))
+    await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+    await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+
+
+async def _send_json(send, status: int, payload: dict, retry_after: bool = False) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if retry_after:
+        headers.append((b"retry-after", b"1"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,65 @@
+# backend/submission-service/src/utils/job_state.py
+"""
+Tiện ích dùng chung cho các job nền theo hội nghị (similarity sweep, proceedings...):
+trạng thái lưu dạng JSON trên đĩa và chặn chạy trùng trong cùng tiến trình.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Set
+
+from ..config import settings
+
+
+def read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path: str, data) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)  # ghi nguyên tử, job chết giữa chừng không làm hỏng file cũ
+
+
+def update_status(state_dir: str, **fields) -> None:
+    path = os.path.join(state_dir, "status.json")
+    status = read_json(path, {})
+    status.update(fields, updated_at=datetime.utcnow().isoformat())
+    write_json(path, status)
+
+
+def resolve_local_path(file_url: str) -> str:
+    """file_url trong DB có thể là 'papers/..' hoặc 'uploads/papers/..' -> đường dẫn trên đĩa."""
+    p = (file_url or "").replace("\\", "/")
+    upload_prefix = settings.UPLOAD_DIR.rstrip("/") + "/"
+    if p.startswith(upload_prefix) or os.path.isabs(p):
+        return p
+    return os.path.join(settings.UPLOAD_DIR, p)
+
+
+class RunningJobs:
+    """Mỗi conference chỉ có một job cùng loại chạy tại một thời điểm."""
+
+    def __init__(self):
+        self._running: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def try_start(self, conference_id: int) -> bool:
+        with self._lock:
+            if conference_id in self._running:
+                return False
+            self._running.add(conference_id)
+            return True
+
+    def finish(self, conference_id: int) -> None:
+        with self._lock:
+            self._running.discard(conference_id)
@@ -0,0 +1,45 @@
+# backend/submission-service/src/utils/pagination.py
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from .. import exceptions
+
+# Header trả về cursor của trang kế tiếp (giữ response body là List như cũ)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Giới hạn kích thước trang
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def page_limit(cursor: Optional[str], limit: Optional[int]) -> Optional[int]:
+    """
+    Không cursor, không limit: trả toàn bộ (client cũ không phân trang).
+    Có cursor mà thiếu limit: trang DEFAULT_PAGE_SIZE (vẫn trả cursor trang sau).
+    """
+    if limit is None and cursor:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+
+def encode_cursor(submitted_at: Optional[datetime], paper_id: int) -> str:
+    """
+    Mã hoá vị trí (submitted_at, id) của bản ghi cuối trang thành chuỗi opaque.
+    """
+    ts = submitted_at.isoformat() if submitted_at else ""
+    raw = f"{ts}|{paper_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """
+    Giải mã cursor -> (submitted_at, id). Cursor sai định dạng -> BusinessRuleError.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        ts, paper_id = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(ts) if ts else None), int(paper_id)
+    except Exception:
+        raise exceptions.BusinessRuleError("Invalid cursor")
@@ -0,0 +1,98 @@
+from datetime import datetime
+
+import pytest
+
+from src import models
+from src.services.bulk_import import ImportRowError, parse_row
+
+
+def _row(**overrides):
+    row = {
+        "ref": "A-1",
+        "title": "  Sparse Assignment at Scale ",
+        "abstract": "Abstract",
+        "keywords": "matching; ; linear programming",
+        "track_id": "3",
+        "topic_ids": "1;2",
+        "authors": "Nguyen Van A <a@example.com> | HUST; Tran Thi B <b@example.com>",
+        "corresponding_email": "",
+        "submitter_id": "",
+        "status": "",
+        "submitted_at": "",
+        "is_blind_mode": "",
+        "file": "paper1.pdf",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_csv_row_defaults():
+    out = parse_row(_row(), conference_id=9, default_submitter_id=42)
+    paper = out["paper"]
+
+    assert out["ref"] == "A-1"
+    assert paper.title == "Sparse Assignment at Scale"
+    assert paper.conference_id == 9 and paper.track_id == 3
+    assert paper.keywords == ["matching", "linear programming"]
+    assert [t.topic_id for t in paper.topics] == [1, 2]
+    assert paper.is_blind_mode is True
+    assert out["status"] == models.PaperStatus.SUBMITTED
+    assert out["submitter_id"] == 42
+    assert out["file"] == "paper1.pdf"
+    assert isinstance(out["submitted_at"], datetime)
+
+
+def test_authors_first_is_corresponding_by_default():
+    authors = parse_row(_row(), 9, 42)["paper"].authors
+
+    assert [(a.full_name, a.email, a.organization) for a in authors] == [
+        ("Nguyen Van A", "a@example.com", "HUST"),
+        ("Tran Thi B", "b@example.com", None),
+    ]
+    assert [a.is_corresponding for a in authors] == [True, False]
+
+
+def test_corresponding_email_is_case_insensitive():
+    authors = parse_row(_row(corresponding_email=" B@Example.com "), 9, 42)["paper"].authors
+    assert [a.is_corresponding for a in authors] == [False, True]
+
+
+def test_json_record_with_lists():
+    record = {
+        "title": "T",
+        "abstract": "",
+        "keywords": ["a", " b "],
+        "track_id": 1,
+        "topic_ids": [5],
+        "authors": [{"full_name": "C", "email": "c@example.com", "is_corresponding": True}],
+        "status": "accepted",
+        "submitted_at": "2026-03-01T10:00:00Z",
+        "submitter_id": 7,
+        "is_blind_mode": False,
+        "file": "x.pdf",
+    }
+    out = parse_row(record, 9, 42)
+
+    assert out["ref"] is None
+    assert out["paper"].keywords == ["a", "b"]
+    assert out["paper"].is_blind_mode is False
+    assert out["status"] == models.PaperStatus.ACCEPTED
+    assert out["submitted_at"] == datetime(2026, 3, 1, 10, 0)
+    assert out["submitter_id"] == 7
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"title": "   "}, "Title is required"),
+    ({"authors": ""}, "At least one author is required"),
+    ({"authors": "No Email Here"}, "Cannot parse author"),
+    ({"authors": "A <not-an-email>"}, "email"),
+    ({"track_id": ""}, "track_id"),
+    ({"topic_ids": "x"}, "topic_id"),
+    ({"status": "maybe"}, "Unknown status 'MAYBE'"),
+    ({"submitted_at": "yesterday"}, "Invalid submitted_at"),
+    ({"file": " "}, "Column 'file' is required"),
+    ({"submitter_id": "abc"}, "Invalid submitter_id"),
+])
+def test_invalid_rows(overrides, message):
+    with pytest.raises(ImportRowError, match=message):
+        parse_row(_row(**overrides), 9, 42)